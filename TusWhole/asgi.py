@@ -2,6 +2,8 @@
 ASGI config for TusWhole project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve the project through it (e.g. ``uvicorn TusWhole.asgi:application``) to
+enable the Server-Sent Events stream at ``/api/finance/stream/``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -0,0 +1,70 @@
+"""
+Định tuyến truy vấn đọc sang database replica.
+
+View chỉ đọc bật replica cho phạm vi request bằng `use_replica()`; mọi thao
+tác ghi luôn đi vào `default`. Sau khi người dùng ghi dữ liệu, `pin_to_primary()`
+giữ các lần đọc tiếp theo của họ trên primary trong một khoảng ngắn để đọc được
+chính dữ liệu vừa ghi.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_DB_ALIAS = "replica"
+PIN_CACHE_KEY = "db:pin-primary:{user_id}"
+
+_replica_enabled = ContextVar("replica_enabled", default=False)
+
+
+def replica_configured() -> bool:
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def enable_replica():
+    return _replica_enabled.set(True)
+
+
+def reset_replica(token) -> None:
+    _replica_enabled.reset(token)
+
+
+@contextmanager
+def use_replica():
+    token = enable_replica()
+    try:
+        yield
+    finally:
+        reset_replica(token)
+
+
+def pin_to_primary(user_id) -> None:
+    if replica_configured():
+        cache.set(
+            PIN_CACHE_KEY.format(user_id=user_id),
+            True,
+            settings.FINANCE_REPLICA_STICKY_SECONDS,
+        )
+
+
+def is_pinned_to_primary(user_id) -> bool:
+    return bool(cache.get(PIN_CACHE_KEY.format(user_id=user_id)))
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _replica_enabled.get() and replica_configured():
+            return REPLICA_DB_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
@@ -10,9 +10,10 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import importlib.util
 import os
 from pathlib import Path
-from urllib.parse import urlparse
+from urllib.parse import parse_qsl, urlparse
 
 from dotenv import load_dotenv
 
@@ -84,7 +85,23 @@ WSGI_APPLICATION = 'TusWhole.wsgi.application'
 
 
 # Database
+def parse_bool(value) -> bool:
+    return str(value).lower() in {"1", "true", "yes", "on"}
+
+
 def parse_database_url(database_url: str | None):
+    """
+    Dựng cấu hình DB từ `DATABASE_URL`. Chế độ kết nối lấy từ query string của
+    URL, nếu không có thì từ biến môi trường tương ứng:
+
+    - `pool` / `DB_POOL`: connection pool trong tiến trình (mặc định bật, cần
+      `psycopg[pool]`), kích thước qua `pool_min_size`, `pool_max_size`, `pool_timeout`.
+    - `conn_max_age` / `DB_CONN_MAX_AGE`: giữ kết nối (giây) khi tắt pool; mặc định
+      `0` vì dưới ASGI mỗi ngữ cảnh async giữ một kết nối riêng nên kết nối bền bị rò.
+    - `conn_health_checks` / `DB_CONN_HEALTH_CHECKS`: kiểm tra kết nối trước khi tái sử dụng.
+
+    Các tham số còn lại (ví dụ `sslmode`) được chuyển thẳng vào `OPTIONS`.
+    """
     if not database_url:
         return {
             'ENGINE': 'django.db.backends.sqlite3',
@@ -95,6 +112,26 @@ def parse_database_url(database_url: str | None):
     if parsed.scheme not in {'postgres', 'postgresql'}:
         raise ValueError("Only PostgreSQL URLs are supported for DATABASE_URL.")
 
+    params = dict(parse_qsl(parsed.query))
+    conn_max_age = int(params.pop('conn_max_age', os.getenv("DB_CONN_MAX_AGE", "0")))
+    health_checks = parse_bool(
+        params.pop('conn_health_checks', os.getenv("DB_CONN_HEALTH_CHECKS", "true"))
+    )
+    use_pool = parse_bool(params.pop('pool', os.getenv("DB_POOL", "true")))
+    pool_options = {
+        'min_size': int(params.pop('pool_min_size', os.getenv("DB_POOL_MIN_SIZE", "2"))),
+        'max_size': int(params.pop('pool_max_size', os.getenv("DB_POOL_MAX_SIZE", "10"))),
+        'timeout': float(params.pop('pool_timeout', os.getenv("DB_POOL_TIMEOUT", "10"))),
+    }
+
+    options = dict(params)
+    if use_pool:
+        if importlib.util.find_spec('psycopg_pool') is None:
+            raise ValueError("DB_POOL requires the 'psycopg[pool]' package.")
+        options['pool'] = pool_options
+        # Django yêu cầu CONN_MAX_AGE = 0 khi dùng pool.
+        conn_max_age = 0
+
     return {
         'ENGINE': 'django.db.backends.postgresql',
         'NAME': parsed.path.lstrip('/'),
@@ -102,7 +139,9 @@ def parse_database_url(database_url: str | None):
         'PASSWORD': parsed.password or '',
         'HOST': parsed.hostname or '',
         'PORT': str(parsed.port) if parsed.port else '5432',
-        'OPTIONS': {},
+        'CONN_MAX_AGE': conn_max_age,
+        'CONN_HEALTH_CHECKS': health_checks,
+        'OPTIONS': options,
     }
 
 
@@ -110,6 +149,25 @@ DATABASES = {
     'default': parse_database_url(os.getenv("DATABASE_URL")),
 }
 
+# Replica chỉ đọc cho danh sách/báo cáo; test dùng chung database với default.
+if os.getenv("DATABASE_REPLICA_URL"):
+    DATABASES['replica'] = parse_database_url(os.getenv("DATABASE_REPLICA_URL"))
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['TusWhole.db_router.ReplicaRouter']
+
+
+# Cache
+# Mặc định dùng bộ nhớ tiến trình; triển khai nhiều worker nên trỏ tới cache dùng chung.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            "DJANGO_CACHE_BACKEND", 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv("DJANGO_CACHE_LOCATION", ''),
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -147,6 +205,10 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# File do hệ thống tạo ra (ví dụ kết quả xuất giao dịch của job nền)
+MEDIA_URL = 'media/'
+MEDIA_ROOT = Path(os.getenv('DJANGO_MEDIA_ROOT', BASE_DIR / 'media'))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -154,7 +216,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'app.api.authentication.StatelessJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -167,6 +229,78 @@ REST_FRAMEWORK = {
     ),
 }
 
+# Finance
+# Thời gian (giây) lưu response của một Idempotency-Key trước khi bị dọn dẹp.
+FINANCE_IDEMPOTENCY_TTL = int(os.getenv("FINANCE_IDEMPOTENCY_TTL", "86400"))
+# Đồng bộ bản chụp category trên giao dịch bằng job nền (False = chạy ngay sau commit).
+FINANCE_CATEGORY_SNAPSHOT_ASYNC = parse_bool(os.getenv("FINANCE_CATEGORY_SNAPSHOT_ASYNC", "true"))
+# Dò giao dịch trùng khi import: chênh lệch thời gian tối đa (giờ) và độ giống
+# tối thiểu của ghi chú (0-1).
+FINANCE_IMPORT_DUPLICATE_WINDOW_HOURS = int(
+    os.getenv("FINANCE_IMPORT_DUPLICATE_WINDOW_HOURS", "24")
+)
+FINANCE_IMPORT_NOTE_SIMILARITY = float(os.getenv("FINANCE_IMPORT_NOTE_SIMILARITY", "0.8"))
+# Giao dịch cũ hơn số ngày này được `archive_transactions` chuyển sang bảng lưu trữ.
+FINANCE_ARCHIVE_AFTER_DAYS = int(os.getenv("FINANCE_ARCHIVE_AFTER_DAYS", "730"))
+# Giao dịch/category đã xoá mềm được giữ trong thùng rác (khôi phục được) số
+# ngày này trước khi `purge_deleted` xoá hẳn.
+FINANCE_TRASH_RETENTION_DAYS = int(os.getenv("FINANCE_TRASH_RETENTION_DAYS", "30"))
+# Thống kê giao dịch: khoảng ngày tối đa mỗi lần tính và thời gian (giây) cache
+# kết quả (cache còn tự hết hiệu lực khi ví có giao dịch mới).
+FINANCE_STATS_MAX_DAYS = int(os.getenv("FINANCE_STATS_MAX_DAYS", "730"))
+FINANCE_STATS_CACHE_TTL = int(os.getenv("FINANCE_STATS_CACHE_TTL", "3600"))
+# Thời gian (giây) cache cây category của ví / master categories; cache còn bị
+# xoá ngay khi category thay đổi.
+FINANCE_CATEGORY_TREE_CACHE_TTL = int(os.getenv("FINANCE_CATEGORY_TREE_CACHE_TTL", "3600"))
+# Dự báo dòng tiền: số ngày lịch sử dùng để dò giao dịch định kỳ, số ngày dự
+# báo mặc định và tối đa.
+FINANCE_RECURRING_LOOKBACK_DAYS = int(os.getenv("FINANCE_RECURRING_LOOKBACK_DAYS", "730"))
+FINANCE_FORECAST_DEFAULT_DAYS = int(os.getenv("FINANCE_FORECAST_DEFAULT_DAYS", "30"))
+FINANCE_FORECAST_MAX_DAYS = int(os.getenv("FINANCE_FORECAST_MAX_DAYS", "365"))
+# Outbox sự kiện thay đổi: chu kỳ (giây) kiểm tra sự kiện mới khi long-poll,
+# thời gian chờ tối đa (giây), số sự kiện tối đa mỗi lần đọc và số ngày giữ lại.
+FINANCE_OUTBOX_POLL_INTERVAL = float(os.getenv("FINANCE_OUTBOX_POLL_INTERVAL", "0.5"))
+FINANCE_OUTBOX_MAX_WAIT = float(os.getenv("FINANCE_OUTBOX_MAX_WAIT", "25"))
+FINANCE_OUTBOX_MAX_BATCH = int(os.getenv("FINANCE_OUTBOX_MAX_BATCH", "1000"))
+FINANCE_OUTBOX_RETENTION_DAYS = int(os.getenv("FINANCE_OUTBOX_RETENTION_DAYS", "30"))
+# Đẩy số dư/giao dịch mới qua SSE: backend pub/sub (mặc định trong tiến trình,
+# `app.finance.realtime.RedisBroker` khi chạy nhiều tiến trình), địa chỉ Redis,
+# chu kỳ (giây) gửi heartbeat và số sự kiện tối đa chờ gửi cho mỗi kết nối.
+FINANCE_REALTIME_BACKEND = os.getenv(
+    "FINANCE_REALTIME_BACKEND", "app.finance.realtime.InProcessBroker"
+)
+FINANCE_REALTIME_REDIS_URL = os.getenv("FINANCE_REALTIME_REDIS_URL", "redis://localhost:6379/0")
+FINANCE_REALTIME_HEARTBEAT = float(os.getenv("FINANCE_REALTIME_HEARTBEAT", "15"))
+FINANCE_REALTIME_QUEUE_SIZE = int(os.getenv("FINANCE_REALTIME_QUEUE_SIZE", "100"))
+# Xoá ví: ví có nhiều giao dịch hơn ngưỡng được xoá bằng job nền; dữ liệu con
+# được xoá theo lô với số dòng này mỗi transaction.
+FINANCE_WALLET_DELETE_SYNC_MAX_ROWS = int(os.getenv("FINANCE_WALLET_DELETE_SYNC_MAX_ROWS", "1000"))
+FINANCE_WALLET_DELETE_BATCH_SIZE = int(os.getenv("FINANCE_WALLET_DELETE_BATCH_SIZE", "5000"))
+# Chuyển bảng giao dịch sang partition: số dòng chép mỗi transaction.
+FINANCE_PARTITION_COPY_BATCH_SIZE = int(os.getenv("FINANCE_PARTITION_COPY_BATCH_SIZE", "10000"))
+# Hàng đợi job nền: lease (giây) trước khi job của worker không còn báo tiến độ
+# được chạy lại, số lần thử tối đa và độ trễ (giây) cơ sở giữa các lần thử.
+FINANCE_JOB_LEASE_SECONDS = int(os.getenv("FINANCE_JOB_LEASE_SECONDS", "300"))
+FINANCE_JOB_MAX_ATTEMPTS = int(os.getenv("FINANCE_JOB_MAX_ATTEMPTS", "3"))
+FINANCE_JOB_RETRY_DELAY = int(os.getenv("FINANCE_JOB_RETRY_DELAY", "30"))
+# Ngưỡng chuyển sang job nền: import nhiều dòng hơn / bộ master categories lớn hơn.
+FINANCE_IMPORT_SYNC_MAX_ROWS = int(os.getenv("FINANCE_IMPORT_SYNC_MAX_ROWS", "500"))
+FINANCE_BOOTSTRAP_SYNC_MAX_TEMPLATES = int(
+    os.getenv("FINANCE_BOOTSTRAP_SYNC_MAX_TEMPLATES", "200")
+)
+# Thời gian (giây) cache danh sách ví mà mỗi người dùng được truy cập.
+FINANCE_WALLET_ACCESS_CACHE_TTL = int(os.getenv("FINANCE_WALLET_ACCESS_CACHE_TTL", "300"))
+# Số giây người dùng được giữ đọc trên primary sau mỗi lần ghi (read-your-writes).
+FINANCE_REPLICA_STICKY_SECONDS = int(os.getenv("FINANCE_REPLICA_STICKY_SECONDS", "5"))
+# Token bucket cho từng scope: `capacity` là số request tối đa dồn liền,
+# `refill_rate` là số token được nạp lại mỗi giây.
+FINANCE_THROTTLE_CACHE = os.getenv("FINANCE_THROTTLE_CACHE", "default")
+FINANCE_THROTTLE_BUCKETS = {
+    'finance_read': {'capacity': 120, 'refill_rate': 2.0},
+    'finance_write': {'capacity': 30, 'refill_rate': 0.5},
+    'finance_bulk': {'capacity': 5, 'refill_rate': 0.05},
+}
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'TusWhole API',
     'DESCRIPTION': 'Tài liệu API tự động cho dự án Django DRF.',
@@ -0,0 +1,90 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+
+class LazyTokenUser(TokenUser):
+    """
+    Người dùng dựng từ claim của access token, không truy vấn DB khi xác thực.
+    Bản ghi `User` đầy đủ chỉ được tải khi view truy cập thuộc tính không có
+    trong token (hoặc `instance`).
+
+    `id`/`pk` được chuyển sang kiểu khoá chính của `User` (claim trong JWT là
+    chuỗi), để so sánh và truy vấn ORM phía sau nhận đúng kiểu.
+    """
+
+    @cached_property
+    def id(self):
+        return get_user_model()._meta.pk.to_python(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def pk(self):
+        return self.id
+
+    @cached_property
+    def instance(self):
+        return get_user_model().objects.get(pk=self.id)
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.instance, attr)
+
+
+class TokenDenylist:
+    """
+    Danh sách token bị thu hồi lưu trong cache: theo `jti` cho từng token và
+    theo mốc thời gian cho toàn bộ token của một người dùng.
+    """
+
+    JTI_KEY = "auth:denylist:jti:{jti}"
+    USER_KEY = "auth:denylist:user:{user_id}"
+
+    @staticmethod
+    def revoke(token) -> None:
+        ttl = max(int(token["exp"] - time.time()), 1)
+        cache.set(TokenDenylist.JTI_KEY.format(jti=token[api_settings.JTI_CLAIM]), True, ttl)
+
+    @staticmethod
+    def revoke_user(user_id) -> None:
+        ttl = int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+        cache.set(TokenDenylist.USER_KEY.format(user_id=user_id), int(time.time()), ttl)
+
+    @staticmethod
+    def is_revoked(token) -> bool:
+        jti_key = TokenDenylist.JTI_KEY.format(jti=token.get(api_settings.JTI_CLAIM))
+        user_key = TokenDenylist.USER_KEY.format(
+            user_id=token.get(api_settings.USER_ID_CLAIM)
+        )
+        values = cache.get_many([jti_key, user_key])
+        if values.get(jti_key):
+            return True
+        revoked_before = values.get(user_key)
+        issued_at = token.get("iat")
+        return revoked_before is not None and (issued_at is None or issued_at <= revoked_before)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Xác thực JWT không tải `User` từ DB; token bị thu hồi được kiểm tra qua
+    `TokenDenylist` trong cache.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if TokenDenylist.is_revoked(validated_token):
+            raise InvalidToken("Token đã bị thu hồi.")
+        return validated_token
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("Token không chứa thông tin người dùng.")
+        return LazyTokenUser(validated_token)
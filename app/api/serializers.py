@@ -2,9 +2,16 @@ from datetime import datetime, timezone
 
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from app.api.authentication import TokenDenylist
+
 User = get_user_model()
 
 
@@ -26,10 +33,18 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     refresh_expires = serializers.DateTimeField(read_only=True)
     user = UserInfoSerializer(read_only=True)
 
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["username"] = user.get_username()
+        token["is_staff"] = user.is_staff
+        token["is_superuser"] = user.is_superuser
+        return token
+
     def validate(self, attrs):
         data = super().validate(attrs)
 
-        refresh = RefreshToken.for_user(self.user)
+        refresh = self.get_token(self.user)
         access_token = refresh.access_token
 
         data.update(
@@ -48,3 +63,32 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     def _format_exp(timestamp: int) -> datetime:
         return datetime.fromtimestamp(timestamp, tz=timezone.utc)
 
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Từ chối làm mới từ refresh token đã bị thu hồi.
+    """
+
+    def validate(self, attrs):
+        try:
+            refresh = RefreshToken(attrs["refresh"])
+        except TokenError as exc:
+            raise InvalidToken(str(exc))
+        if TokenDenylist.is_revoked(refresh):
+            raise InvalidToken("Token đã bị thu hồi.")
+        return super().validate(attrs)
+
+
+class TokenRevokeSerializer(serializers.Serializer):
+    refresh = serializers.CharField(required=False)
+
+    def validate_refresh(self, value):
+        try:
+            refresh = RefreshToken(value)
+        except TokenError as exc:
+            raise serializers.ValidationError(str(exc))
+        owner_id = User._meta.pk.to_python(refresh.get(api_settings.USER_ID_CLAIM))
+        if owner_id != self.context["request"].user.id:
+            raise serializers.ValidationError("Refresh token không thuộc người dùng hiện tại.")
+        return refresh
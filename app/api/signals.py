@@ -0,0 +1,11 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from app.api.authentication import TokenDenylist
+
+
+@receiver(post_save, sender=get_user_model())
+def revoke_tokens_of_inactive_user(sender, instance, **kwargs):
+    if not instance.is_active:
+        TokenDenylist.revoke_user(instance.pk)
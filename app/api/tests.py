@@ -1,3 +1,23 @@
+from django.contrib.auth.models import User
 from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
 
-# Create your tests here.
+from app.api.authentication import LazyTokenUser
+
+
+class LazyTokenUserTests(TestCase):
+    def test_id_and_pk_use_the_user_primary_key_type(self):
+        user = User.objects.create_user("owner", password="secret")
+        token_user = LazyTokenUser(RefreshToken.for_user(user).access_token)
+        self.assertEqual(token_user.id, user.id)
+        self.assertIsInstance(token_user.id, int)
+        self.assertEqual(token_user.pk, user.pk)
+
+    def test_revoke_accepts_own_refresh_token(self):
+        user = User.objects.create_user("owner", password="secret")
+        refresh = RefreshToken.for_user(user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        response = client.post("/api/token/revoke/", {"refresh": str(refresh)}, format="json")
+        self.assertEqual(response.status_code, 204, response.content)
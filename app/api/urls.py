@@ -4,5 +4,6 @@ from app.api import views
 
 urlpatterns = [
     path("health/", views.health_check, name="health-check"),
+    path("health/db/", views.database_health, name="database-health"),
 ]
 
@@ -1,9 +1,19 @@
+import time
+
+from django.db import connections
+from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from app.api.serializers import CustomTokenObtainPairSerializer
+from app.api.authentication import TokenDenylist
+from app.api.serializers import (
+    CustomTokenObtainPairSerializer,
+    CustomTokenRefreshSerializer,
+    TokenRevokeSerializer,
+)
 
 
 @api_view(["GET"])
@@ -12,5 +22,63 @@ def health_check(request):
     return Response({"status": "ok"})
 
 
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def database_health(request):
+    """
+    Trạng thái kết nối của từng database: độ trễ `SELECT 1`, cấu hình giữ kết
+    nối và thống kê connection pool (nếu bật).
+    """
+    databases = {}
+    for alias in connections:
+        connection = connections[alias]
+        info = {
+            "vendor": connection.vendor,
+            "conn_max_age": connection.settings_dict.get("CONN_MAX_AGE"),
+            "conn_health_checks": connection.settings_dict.get("CONN_HEALTH_CHECKS"),
+        }
+        started = time.perf_counter()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            info["status"] = "ok"
+        except Exception as exc:
+            info["status"] = "error"
+            info["error"] = str(exc)
+        info["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+        pool = getattr(connection, "pool", None)
+        info["pool"] = pool.get_stats() if pool is not None else None
+        databases[alias] = info
+
+    healthy = all(info["status"] == "ok" for info in databases.values())
+    return Response(
+        {"status": "ok" if healthy else "error", "databases": databases},
+        status=status.HTTP_200_OK if healthy else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+
+
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+
+
+class CustomTokenRefreshView(TokenRefreshView):
+    serializer_class = CustomTokenRefreshSerializer
+
+
+class TokenRevokeView(GenericAPIView):
+    """
+    Thu hồi access token hiện tại và (tuỳ chọn) refresh token đi kèm.
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = TokenRevokeSerializer
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        TokenDenylist.revoke(request.auth)
+        if "refresh" in serializer.validated_data:
+            TokenDenylist.revoke(serializer.validated_data["refresh"])
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -10,6 +10,13 @@ class WalletAdmin(admin.ModelAdmin):
     list_filter = ("currency",)
 
 
+@admin.register(models.WalletMember)
+class WalletMemberAdmin(admin.ModelAdmin):
+    list_display = ("wallet", "user", "role", "created_at")
+    list_filter = ("role",)
+    search_fields = ("wallet__name", "user__username")
+
+
 @admin.register(models.CategoryTemplate)
 class CategoryTemplateAdmin(admin.ModelAdmin):
     list_display = ("name", "transaction_type", "parent", "position")
@@ -31,3 +38,50 @@ class TransactionAdmin(admin.ModelAdmin):
     list_filter = ("transaction_type", "wallet")
     search_fields = ("wallet__name", "category__name", "note")
     date_hierarchy = "occurred_at"
+
+
+@admin.register(models.TransactionArchive)
+class TransactionArchiveAdmin(admin.ModelAdmin):
+    list_display = ("wallet", "category", "transaction_type", "amount", "occurred_at", "archived_at")
+    list_filter = ("transaction_type", "wallet")
+    search_fields = ("wallet__name", "category__name", "note")
+
+
+@admin.register(models.CategorizationRule)
+class CategorizationRuleAdmin(admin.ModelAdmin):
+    list_display = ("pattern", "wallet", "category", "match_type", "match_field", "priority")
+    list_filter = ("match_type", "match_field", "is_active")
+    search_fields = ("pattern", "wallet__name", "category__name")
+
+
+@admin.register(models.RecurringPattern)
+class RecurringPatternAdmin(admin.ModelAdmin):
+    list_display = ("note", "wallet", "category", "period", "amount", "next_expected_on")
+    list_filter = ("period", "transaction_type")
+    search_fields = ("note", "wallet__name", "category__name")
+
+
+@admin.register(models.Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "user", "wallet", "attempts", "created_at", "finished_at")
+    list_filter = ("kind", "status")
+    search_fields = ("user__username", "wallet__name", "locked_by")
+
+
+@admin.register(models.OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ("position", "event_type", "aggregate_id", "wallet_id", "created_at")
+    list_filter = ("aggregate_type", "event_type")
+    search_fields = ("aggregate_id", "wallet_id")
+
+
+@admin.register(models.OutboxConsumer)
+class OutboxConsumerAdmin(admin.ModelAdmin):
+    list_display = ("name", "user", "position", "updated_at")
+    search_fields = ("name", "user__username")
+
+
+@admin.register(models.IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ("key", "user", "response_status", "created_at", "expires_at")
+    search_fields = ("key", "user__username")
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FinanceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app.finance'
+
+    def ready(self):
+        from app.finance import signals  # noqa: F401
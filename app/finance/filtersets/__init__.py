@@ -1,4 +1,3 @@
-from .transaction_filterset import TransactionFilterSet
-
-__all__ = ["TransactionFilterSet"]
+from .transaction_filterset import TransactionArchiveFilterSet, TransactionFilterSet
 
+__all__ = ["TransactionFilterSet", "TransactionArchiveFilterSet"]
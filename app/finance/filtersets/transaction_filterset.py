@@ -1,10 +1,36 @@
+import json
+import re
+from datetime import datetime, time, timedelta
+
 import django_filters
+from django.db import connections
+from django.db.models import BooleanField, F, JSONField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.fields.json import KeyTransform
+from django.utils import timezone
 from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
+
+from app.finance.models import Transaction, TransactionArchive
+
 
-from app.finance.models import Transaction
+METADATA_PREFIX = "metadata__"
+METADATA_KEY_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
 
 
 class TransactionFilterSet(filters.FilterSet):
+    """
+    Ngoài các trường trong Meta, hỗ trợ lọc theo metadata:
+    `metadata__<key>[__<key con>]=<giá trị>` và `tags=a,b` (chứa mọi tag).
+    Trên PostgreSQL dùng toán tử chứa `@>` (có GIN index), trên SQLite dùng
+    các hàm JSON1.
+    """
+
+    tags = django_filters.CharFilter(method="filter_tags")
+    # Lọc theo ngày bằng khoảng [00:00, 00:00 ngày sau) thay cho `occurred_at__date`
+    # để PostgreSQL vẫn loại bỏ được các partition không liên quan.
+    occurred_on = django_filters.DateFilter(method="filter_occurred_on")
+
     class Meta:
         model = Transaction
         fields = {
@@ -17,3 +43,91 @@ class TransactionFilterSet(filters.FilterSet):
         }
         exclude = ["metadata", "created_at", "updated_at"]
 
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if hasattr(self.data, "lists"):
+            params = self.data.lists()
+        else:
+            params = ((key, [value]) for key, value in self.data.items())
+        for param, values in params:
+            if not param.startswith(METADATA_PREFIX):
+                continue
+            path = param[len(METADATA_PREFIX):].split("__")
+            if not all(METADATA_KEY_PATTERN.match(key) for key in path):
+                raise ValidationError({param: "Khoá metadata không hợp lệ."})
+            for value in values:
+                queryset = queryset.filter(self.metadata_condition(queryset, path, value))
+        return queryset
+
+    @staticmethod
+    def metadata_condition(queryset, path: list[str], value: str) -> Q:
+        # Giá trị trên query string luôn là chuỗi; thử thêm dạng số/bool của nó
+        # để khớp cả id được lưu dưới dạng số.
+        candidates = [value]
+        try:
+            parsed = json.loads(value)
+        except ValueError:
+            parsed = value
+        if isinstance(parsed, (int, float, bool)) or parsed is None:
+            candidates.append(parsed)
+
+        condition = Q()
+        for candidate in candidates:
+            if connections[queryset.db].vendor == "postgresql":
+                for key in reversed(path):
+                    candidate = {key: candidate}
+                condition |= Q(metadata__contains=candidate)
+            else:
+                expression = F("metadata")
+                for key in path:
+                    expression = KeyTransform(key, expression)
+                condition |= Q(
+                    expression.get_lookup("exact")(
+                        expression, Value(candidate, output_field=JSONField())
+                    )
+                )
+        return condition
+
+    def filter_tags(self, queryset, name, value):
+        connection = connections[queryset.db]
+        column = (
+            f"{connection.ops.quote_name(queryset.model._meta.db_table)}."
+            f"{connection.ops.quote_name('metadata')}"
+        )
+        for tag in (tag.strip() for tag in value.split(",")):
+            if not tag:
+                continue
+            if connection.vendor == "postgresql":
+                queryset = queryset.filter(metadata__contains={"tags": [tag]})
+            else:
+                queryset = queryset.filter(
+                    RawSQL(
+                        f"EXISTS (SELECT 1 FROM json_each({column}, '$.tags') "
+                        f"WHERE json_each.value = %s)",
+                        [tag],
+                        output_field=BooleanField(),
+                    )
+                )
+        return queryset
+
+    def filter_occurred_on(self, queryset, name, value):
+        start = timezone.make_aware(datetime.combine(value, time.min))
+        return queryset.filter(occurred_at__gte=start, occurred_at__lt=start + timedelta(days=1))
+
+    def occurred_lower_bound(self) -> datetime | None:
+        """Mốc thời gian sớm nhất mà bộ lọc (đã validate) cho phép."""
+        data = self.form.cleaned_data
+        bounds = [
+            data.get(name)
+            for name in ("occurred_at", "occurred_at__gte", "occurred_at__gt")
+            if data.get(name)
+        ]
+        if data.get("occurred_on"):
+            bounds.append(timezone.make_aware(datetime.combine(data["occurred_on"], time.min)))
+        return min(bounds) if bounds else None
+
+
+class TransactionArchiveFilterSet(TransactionFilterSet):
+    class Meta(TransactionFilterSet.Meta):
+        model = TransactionArchive
+        exclude = ["metadata", "created_at", "updated_at", "archived_at"]
@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from app.finance.services import TransactionArchiveService
+
+
+class Command(BaseCommand):
+    help = "Chuyển giao dịch cũ sang bảng lưu trữ"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=None,
+            help="Mặc định lấy theo FINANCE_ARCHIVE_AFTER_DAYS",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options["older_than_days"] is not None:
+            cutoff = timezone.now() - timedelta(days=options["older_than_days"])
+        else:
+            cutoff = TransactionArchiveService.cutoff()
+        archived = TransactionArchiveService.archive_before(
+            cutoff, batch_size=options["batch_size"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Da luu tru {archived} giao dich truoc {cutoff:%Y-%m-%d}.")
+        )
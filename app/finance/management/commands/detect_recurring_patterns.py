@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from app.finance.models import Wallet
+from app.finance.services import RecurringPatternService
+
+
+class Command(BaseCommand):
+    help = "Dò giao dịch định kỳ của các ví (chỉ ví có thay đổi, trừ khi dùng --full)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--wallet",
+            type=int,
+            action="append",
+            dest="wallets",
+            help="Chỉ quét ví này (có thể lặp lại)",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Phân tích lại toàn bộ lịch sử thay vì chỉ category có giao dịch mới/sửa",
+        )
+
+    def handle(self, *args, **options):
+        wallets = Wallet.objects.order_by("pk")
+        if options["wallets"]:
+            wallets = wallets.filter(pk__in=options["wallets"])
+        scanned = patterns = 0
+        for wallet in wallets.iterator():
+            if not options["full"] and not RecurringPatternService.is_stale(wallet):
+                continue
+            patterns += RecurringPatternService.detect(wallet, full=options["full"])
+            scanned += 1
+        self.stdout.write(
+            self.style.SUCCESS(f"Da quet {scanned} vi, phan tich {patterns} mau dinh ky.")
+        )
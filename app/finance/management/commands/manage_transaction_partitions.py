@@ -0,0 +1,85 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.finance.services import TransactionPartitionService
+
+
+class Command(BaseCommand):
+    help = "Quản lý partition theo thời gian của bảng giao dịch (chỉ PostgreSQL)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Chuyển bảng giao dịch hiện tại thành bảng partition theo occurred_at",
+        )
+        parser.add_argument(
+            "--interval",
+            choices=TransactionPartitionService.INTERVALS,
+            default=None,
+            help="Độ dài mỗi partition (mặc định: theo partition hiện có, hoặc month)",
+        )
+        parser.add_argument(
+            "--ahead", type=int, default=3, help="Số kỳ tương lai cần tạo sẵn partition"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Số dòng chép mỗi transaction khi --convert (mặc định: FINANCE_PARTITION_COPY_BATCH_SIZE)",
+        )
+        parser.add_argument(
+            "--detach-before",
+            type=date.fromisoformat,
+            default=None,
+            help="Tách các partition kết thúc trước ngày này (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--archive-schema",
+            default=None,
+            help="Schema chứa các partition đã tách",
+        )
+        parser.add_argument(
+            "--drop-detached",
+            action="store_true",
+            help="Xoá hẳn các partition đã tách thay vì giữ lại",
+        )
+
+    def handle(self, *args, **options):
+        if not TransactionPartitionService.is_supported():
+            self.stdout.write(
+                self.style.WARNING("Partition chỉ hỗ trợ PostgreSQL, bỏ qua.")
+            )
+            return
+
+        interval = options["interval"]
+        if options["convert"]:
+            if TransactionPartitionService.is_partitioned():
+                raise CommandError("Bảng giao dịch đã được partition.")
+            names = TransactionPartitionService.convert(
+                interval or TransactionPartitionService.MONTH,
+                options["ahead"],
+                batch_size=options["batch_size"],
+            )
+            self.stdout.write(
+                self.style.SUCCESS(f"Đã chuyển bảng giao dịch sang {len(names)} partition.")
+            )
+            return
+
+        if not TransactionPartitionService.is_partitioned():
+            raise CommandError("Bảng giao dịch chưa được partition, hãy chạy với --convert.")
+
+        interval = interval or TransactionPartitionService.detect_interval(
+            TransactionPartitionService.MONTH
+        )
+        names = TransactionPartitionService.ensure_partitions(interval, options["ahead"])
+        self.stdout.write(self.style.SUCCESS(f"Đã đảm bảo {len(names)} partition."))
+
+        if options["detach_before"]:
+            detached = TransactionPartitionService.detach_before(
+                options["detach_before"],
+                archive_schema=options["archive_schema"],
+                drop=options["drop_detached"],
+            )
+            self.stdout.write(self.style.SUCCESS(f"Đã tách {len(detached)} partition."))
@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from app.finance.services import TrashService
+
+
+class Command(BaseCommand):
+    help = "Xoá hẳn giao dịch và category đã nằm trong thùng rác quá lâu"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=None,
+            help="Mặc định lấy theo FINANCE_TRASH_RETENTION_DAYS",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options["older_than_days"] is not None:
+            cutoff = timezone.now() - timedelta(days=options["older_than_days"])
+        else:
+            cutoff = TrashService.cutoff()
+        purged = TrashService.purge(cutoff, batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Da xoa {purged['transactions']} giao dich va {purged['categories']} "
+                f"category trong thung rac truoc {cutoff:%Y-%m-%d}."
+            )
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from app.finance.services import IdempotencyService
+
+
+class Command(BaseCommand):
+    help = "Xoá các Idempotency-Key đã hết hạn"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        deleted = IdempotencyService.purge_expired(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Da xoa {deleted} idempotency key het han."))
@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from app.finance.services import OutboxService
+
+
+class Command(BaseCommand):
+    help = "Xoá sự kiện outbox cũ mà mọi consumer đã xử lý"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=settings.FINANCE_OUTBOX_RETENTION_DAYS,
+            help="Chỉ xoá sự kiện cũ hơn số ngày này",
+        )
+
+    def handle(self, *args, **options):
+        OutboxService.sequence()
+        deleted = OutboxService.purge(
+            timezone.now() - timedelta(days=options["older_than_days"])
+        )
+        self.stdout.write(self.style.SUCCESS(f"Da xoa {deleted} su kien outbox."))
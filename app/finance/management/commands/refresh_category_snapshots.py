@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from app.finance.services import CategorySnapshotService
+
+
+class Command(BaseCommand):
+    help = "Đồng bộ lại tên/đường dẫn category được lưu trên giao dịch"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--wallet",
+            type=int,
+            action="append",
+            dest="wallets",
+            help="Chỉ đồng bộ ví này (có thể lặp lại)",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        updated = CategorySnapshotService.refresh_wallets(
+            options["wallets"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Da cap nhat {updated} giao dich."))
@@ -0,0 +1,77 @@
+import multiprocessing
+import os
+import socket
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from app.finance import worker
+from app.finance.services import JobWorker, OutboxService
+
+
+class Command(BaseCommand):
+    help = "Chạy worker xử lý hàng đợi job tài chính (có thể nhiều tiến trình)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=1, help="Số tiến trình worker")
+        parser.add_argument(
+            "--poll-interval", type=float, default=1.0, help="Số giây chờ khi hàng đợi trống"
+        )
+        parser.add_argument(
+            "--max-jobs", type=int, default=None, help="Mỗi tiến trình dừng sau số job này"
+        )
+        parser.add_argument(
+            "--burst", action="store_true", help="Dừng khi hàng đợi trống"
+        )
+
+    def handle(self, *args, **options):
+        # Sự kiện outbox được gán offset ngay khi commit; luồng này chỉ gán nốt
+        # sự kiện bị bỏ sót (tiến trình ghi chết ngay sau commit).
+        stop = threading.Event()
+        sequencer = threading.Thread(
+            target=OutboxService.sequence_until,
+            args=(stop, settings.FINANCE_OUTBOX_POLL_INTERVAL),
+            name="finance-outbox-sequencer",
+            daemon=True,
+        )
+        sequencer.start()
+        try:
+            self.run_workers(options)
+        finally:
+            stop.set()
+            sequencer.join()
+
+    def run_workers(self, options):
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        arguments = (options["poll_interval"], options["max_jobs"], options["burst"])
+
+        if options["processes"] <= 1:
+            processed = JobWorker.work(
+                prefix,
+                poll_interval=options["poll_interval"],
+                max_jobs=options["max_jobs"],
+                burst=options["burst"],
+            )
+            self.stdout.write(self.style.SUCCESS(f"Da xu ly {processed} job."))
+            return
+
+        # Tiến trình con mở kết nối DB riêng; không để kết nối của cha bị chia sẻ.
+        connections.close_all()
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=worker.run, args=(f"{prefix}-{index}", *arguments))
+            for index in range(options["processes"])
+        ]
+        for process in processes:
+            process.start()
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
+        self.stdout.write(self.style.SUCCESS(f"Da dung {len(processes)} tien trinh worker."))
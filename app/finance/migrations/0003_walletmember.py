@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-19 17:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_owner_memberships(apps, schema_editor):
+    Wallet = apps.get_model("finance", "Wallet")
+    WalletMember = apps.get_model("finance", "WalletMember")
+    members = [
+        WalletMember(wallet_id=wallet_id, user_id=owner_id, role="OWNER")
+        for wallet_id, owner_id in Wallet.objects.values_list("id", "owner_id").iterator()
+    ]
+    WalletMember.objects.bulk_create(members, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0002_idempotencykey'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WalletMember',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('OWNER', 'Chủ ví'), ('EDITOR', 'Được chỉnh sửa'), ('VIEWER', 'Chỉ xem')], default='EDITOR', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='wallet_memberships', to=settings.AUTH_USER_MODEL)),
+                ('wallet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='members', to='finance.wallet')),
+            ],
+            options={
+                'ordering': ['wallet', 'created_at'],
+                'indexes': [models.Index(fields=['user', 'wallet', 'role'], name='finance_walletmember_user_idx')],
+                'unique_together': {('wallet', 'user')},
+            },
+        ),
+        migrations.RunPython(backfill_owner_memberships, migrations.RunPython.noop),
+    ]
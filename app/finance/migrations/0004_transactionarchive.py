@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-19 17:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0003_walletmember'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransactionArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('transaction_type', models.CharField(choices=[('INCOME', 'Thu'), ('EXPENSE', 'Chi'), ('LEND', 'Cho vay'), ('BORROW', 'Đi vay')], max_length=20)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('note', models.TextField(blank=True)),
+                ('occurred_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('metadata', models.JSONField(blank=True, default=dict)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_transactions', to='finance.category')),
+                ('wallet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_transactions', to='finance.wallet')),
+            ],
+            options={
+                'ordering': ['-occurred_at', '-created_at'],
+                'indexes': [models.Index(fields=['wallet', 'occurred_at'], name='finance_txarchive_wallet_idx')],
+            },
+        ),
+    ]
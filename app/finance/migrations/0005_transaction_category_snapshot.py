@@ -0,0 +1,73 @@
+# Generated by Django 5.2.8 on 2026-10-19 17:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_category_snapshots(apps, schema_editor):
+    Category = apps.get_model("finance", "Category")
+    Transaction = apps.get_model("finance", "Transaction")
+    TransactionArchive = apps.get_model("finance", "TransactionArchive")
+    categories = {
+        category_id: (name, parent_id)
+        for category_id, name, parent_id in Category.objects.values_list(
+            "id", "name", "parent_id"
+        ).iterator()
+    }
+    for category_id, (name, parent_id) in categories.items():
+        lineage = [name]
+        root_id = category_id
+        seen = {category_id}
+        while parent_id in categories and parent_id not in seen:
+            seen.add(parent_id)
+            root_id = parent_id
+            parent_name, parent_id = categories[parent_id]
+            lineage.insert(0, parent_name)
+        snapshot = {
+            "category_name": name,
+            "category_path": " / ".join(lineage)[:255],
+            "category_root_id": root_id,
+        }
+        for model in (Transaction, TransactionArchive):
+            model.objects.filter(category_id=category_id).update(**snapshot)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0004_transactionarchive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='category_name',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='category_path',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='category_root',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='finance.category'),
+        ),
+        migrations.AddField(
+            model_name='transactionarchive',
+            name='category_name',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='transactionarchive',
+            name='category_path',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='transactionarchive',
+            name='category_root',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='finance.category'),
+        ),
+        migrations.RunPython(backfill_category_snapshots, migrations.RunPython.noop),
+    ]
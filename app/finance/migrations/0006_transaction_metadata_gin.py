@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+INDEX_NAME = "finance_transaction_metadata_gin"
+
+
+def create_metadata_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} "
+        f"ON finance_transaction USING gin (metadata jsonb_path_ops)"
+    )
+
+
+def drop_metadata_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0005_transaction_category_snapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_metadata_index, drop_metadata_index),
+    ]
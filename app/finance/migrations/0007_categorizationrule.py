@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-19 17:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0006_transaction_metadata_gin'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategorizationRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pattern', models.CharField(max_length=255)),
+                ('match_type', models.CharField(choices=[('CONTAINS', 'Chứa chuỗi'), ('REGEX', 'Biểu thức chính quy')], default='CONTAINS', max_length=20)),
+                ('match_field', models.CharField(choices=[('NOTE', 'Ghi chú'), ('MERCHANT', 'Merchant trong metadata')], default='NOTE', max_length=20)),
+                ('priority', models.PositiveIntegerField(default=100)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='categorization_rules', to='finance.category')),
+                ('wallet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='categorization_rules', to='finance.wallet')),
+            ],
+            options={
+                'ordering': ['wallet', 'priority', 'id'],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:03
+
+import hashlib
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def backfill_fingerprints(apps, schema_editor):
+    Transaction = apps.get_model("finance", "Transaction")
+    batch = []
+    for tx in Transaction.objects.only("id", "wallet_id", "amount", "occurred_at").iterator():
+        bucket = tx.occurred_at.astimezone(dt_timezone.utc).date().isoformat()
+        amount = Decimal(tx.amount).quantize(Decimal("0.01"))
+        tx.fingerprint = hashlib.sha256(f"{tx.wallet_id}:{amount}:{bucket}".encode()).hexdigest()
+        batch.append(tx)
+        if len(batch) >= 1000:
+            Transaction.objects.bulk_update(batch, ["fingerprint"])
+            batch = []
+    if batch:
+        Transaction.objects.bulk_update(batch, ["fingerprint"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0007_categorizationrule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='transactionarchive',
+            name='fingerprint',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+    ]
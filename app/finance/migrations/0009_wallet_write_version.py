@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0008_transaction_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wallet',
+            name='write_version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0009_wallet_write_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wallet',
+            name='recurring_scanned_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wallet',
+            name='recurring_scanned_version',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='RecurringPattern',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('transaction_type', models.CharField(choices=[('INCOME', 'Thu'), ('EXPENSE', 'Chi'), ('LEND', 'Cho vay'), ('BORROW', 'Đi vay')], max_length=20)),
+                ('key', models.CharField(blank=True, max_length=255)),
+                ('note', models.TextField(blank=True)),
+                ('period', models.CharField(choices=[('WEEKLY', 'Hằng tuần'), ('BIWEEKLY', 'Hai tuần một lần'), ('MONTHLY', 'Hằng tháng'), ('QUARTERLY', 'Hằng quý'), ('YEARLY', 'Hằng năm')], max_length=20)),
+                ('day_of_month', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('occurrences', models.PositiveIntegerField()),
+                ('confidence', models.FloatField()),
+                ('last_occurred_on', models.DateField()),
+                ('next_expected_on', models.DateField()),
+                ('detected_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recurring_patterns', to='finance.category')),
+                ('wallet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recurring_patterns', to='finance.wallet')),
+            ],
+            options={
+                'ordering': ['next_expected_on', 'id'],
+                'constraints': [models.UniqueConstraint(fields=('wallet', 'category', 'key'), name='finance_recurring_pattern_unique')],
+            },
+        ),
+    ]
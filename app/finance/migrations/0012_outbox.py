@@ -0,0 +1,47 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0011_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveBigIntegerField(blank=True, null=True, unique=True)),
+                ('wallet_id', models.BigIntegerField(blank=True, null=True)),
+                ('aggregate_type', models.CharField(max_length=20)),
+                ('aggregate_id', models.BigIntegerField()),
+                ('event_type', models.CharField(max_length=50)),
+                ('payload', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['position'],
+                'indexes': [models.Index(fields=['wallet_id', 'position'], name='finance_outbox_wallet_idx'), models.Index(condition=models.Q(('position__isnull', True)), fields=['id'], name='finance_outbox_pending_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='OutboxConsumer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('position', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outbox_consumers', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['user', 'name'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'name'), name='finance_outbox_consumer_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0013_soft_delete'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='wallet',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='wallet',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='kind',
+            field=models.CharField(choices=[('export_transactions', 'Xuất giao dịch ra CSV'), ('import_transactions', 'Import sao kê'), ('reconcile_wallet', 'Đối soát số dư ví'), ('rebuild_rollups', 'Dựng lại dữ liệu tổng hợp của ví'), ('bootstrap_wallet', 'Sao chép master categories vào ví'), ('delete_wallet', 'Xoá ví và dữ liệu của ví')], max_length=40),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='wallet',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='finance.wallet'),
+        ),
+        migrations.AddConstraint(
+            model_name='wallet',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('owner', 'name'), name='finance_wallet_live_name_uniq'),
+        ),
+    ]
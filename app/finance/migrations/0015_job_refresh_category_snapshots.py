@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0014_wallet_deletion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='kind',
+            field=models.CharField(choices=[('export_transactions', 'Xuất giao dịch ra CSV'), ('import_transactions', 'Import sao kê'), ('reconcile_wallet', 'Đối soát số dư ví'), ('rebuild_rollups', 'Dựng lại dữ liệu tổng hợp của ví'), ('bootstrap_wallet', 'Sao chép master categories vào ví'), ('delete_wallet', 'Xoá ví và dữ liệu của ví'), ('refresh_category_snapshots', 'Đồng bộ bản chụp category trên giao dịch')], max_length=40),
+        ),
+    ]
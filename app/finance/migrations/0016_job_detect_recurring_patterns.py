@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0015_job_refresh_category_snapshots'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='kind',
+            field=models.CharField(choices=[('export_transactions', 'Xuất giao dịch ra CSV'), ('import_transactions', 'Import sao kê'), ('reconcile_wallet', 'Đối soát số dư ví'), ('rebuild_rollups', 'Dựng lại dữ liệu tổng hợp của ví'), ('bootstrap_wallet', 'Sao chép master categories vào ví'), ('delete_wallet', 'Xoá ví và dữ liệu của ví'), ('refresh_category_snapshots', 'Đồng bộ bản chụp category trên giao dịch'), ('detect_recurring_patterns', 'Dò giao dịch định kỳ của ví')], max_length=40),
+        ),
+    ]
@@ -1,14 +1,49 @@
-from .choices import TransactionType
+from .choices import (
+    BatchOperation,
+    DuplicatePolicy,
+    JobKind,
+    JobStatus,
+    RecurrencePeriod,
+    RuleMatchField,
+    RuleMatchType,
+    TotalsPeriod,
+    TransactionType,
+    WalletRole,
+)
 from .wallet import Wallet
+from .wallet_member import WalletMember
 from .category_template import CategoryTemplate
 from .category import Category
 from .transaction import Transaction
+from .transaction_archive import TransactionArchive
+from .idempotency_key import IdempotencyKey
+from .categorization_rule import CategorizationRule
+from .recurring_pattern import RecurringPattern
+from .job import Job
+from .outbox_event import OutboxEvent
+from .outbox_consumer import OutboxConsumer
 
 __all__ = [
+    "BatchOperation",
+    "DuplicatePolicy",
+    "JobKind",
+    "JobStatus",
+    "RecurrencePeriod",
+    "RuleMatchField",
+    "RuleMatchType",
     "TransactionType",
+    "TotalsPeriod",
+    "WalletRole",
     "Wallet",
+    "WalletMember",
     "CategoryTemplate",
     "Category",
     "Transaction",
+    "TransactionArchive",
+    "IdempotencyKey",
+    "CategorizationRule",
+    "RecurringPattern",
+    "Job",
+    "OutboxEvent",
+    "OutboxConsumer",
 ]
-
@@ -0,0 +1,105 @@
+import re
+
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from app.finance.models.category import Category
+from app.finance.models.choices import RuleMatchField, RuleMatchType
+from app.finance.models.wallet import Wallet
+
+
+def _has_numbered_reference(pattern: str) -> bool:
+    """Biểu thức có tham chiếu nhóm theo số (`\\1`, `(?(1)...)`) ngoài lớp ký tự."""
+    in_class = False
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            following = pattern[index + 1:index + 2]
+            if not in_class and following.isdigit() and following != "0":
+                return True
+            index += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # `]` đứng ngay sau `[` hoặc `[^` là ký tự thường.
+            index += 1
+            if pattern[index:index + 1] == "^":
+                index += 1
+            if pattern[index:index + 1] == "]":
+                index += 1
+            continue
+        elif pattern.startswith("(?(", index) and pattern[index + 3:index + 4].isdigit():
+            return True
+        index += 1
+    return False
+
+
+class CategorizationRule(models.Model):
+    # Quy tắc regex của một ví được gộp thành một regex, mỗi quy tắc là một
+    # nhánh có tên `r<thứ tự>` (xem `CategorizationMatcher`).
+    REGEX_BRANCH = "(?P<r{index}>{pattern})"
+    REGEX_TEMPLATE = "(?=(?:{branches}))"
+
+    wallet = models.ForeignKey(
+        Wallet, on_delete=models.CASCADE, related_name="categorization_rules"
+    )
+    category = models.ForeignKey(
+        Category, on_delete=models.CASCADE, related_name="categorization_rules"
+    )
+    pattern = models.CharField(max_length=255)
+    match_type = models.CharField(
+        max_length=20, choices=RuleMatchType.choices, default=RuleMatchType.CONTAINS
+    )
+    match_field = models.CharField(
+        max_length=20, choices=RuleMatchField.choices, default=RuleMatchField.NOTE
+    )
+    priority = models.PositiveIntegerField(default=100)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["wallet", "priority", "id"]
+
+    def __str__(self) -> str:
+        return f"{self.pattern} -> {self.category_id}"
+
+    @classmethod
+    def compile_branches(cls, branches) -> re.Pattern:
+        return re.compile(cls.REGEX_TEMPLATE.format(branches="|".join(branches)), re.IGNORECASE)
+
+    @classmethod
+    def check_regex(cls, pattern: str) -> None:
+        """
+        Kiểm tra biểu thức dùng được cả khi đứng riêng lẫn khi là một nhánh của
+        regex gộp: không nhóm có tên, không tham chiếu nhóm theo số (số thứ tự
+        nhóm bị lệch khi gộp), không cờ toàn cục như `(?i)`.
+        """
+        if "(?P" in pattern:
+            raise ValidationError(_("Biểu thức không được dùng nhóm có tên."))
+        if _has_numbered_reference(pattern):
+            raise ValidationError(_("Biểu thức không được tham chiếu nhóm theo số."))
+        try:
+            re.compile(pattern)
+        except re.error as exc:
+            raise ValidationError(_("Biểu thức chính quy không hợp lệ: %s") % exc)
+        try:
+            cls.compile_branches([cls.REGEX_BRANCH.format(index=0, pattern=pattern)])
+        except re.error as exc:
+            raise ValidationError(
+                _("Biểu thức không dùng được khi gộp với quy tắc khác: %s") % exc
+            )
+
+    def clean(self):
+        if self.category.wallet_id != self.wallet_id:
+            raise ValidationError(_("Category của quy tắc phải thuộc cùng ví."))
+        if self.match_type == RuleMatchType.REGEX:
+            self.check_regex(self.pattern)
+
+    def save(self, *args, **kwargs):
+        self.full_clean()
+        super().save(*args, **kwargs)
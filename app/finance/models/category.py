@@ -4,6 +4,7 @@ from django.utils.translation import gettext_lazy as _
 
 from app.finance.models.category_template import CategoryTemplate
 from app.finance.models.choices import TransactionType
+from app.finance.models.soft_delete import DELETED, LIVE, LiveManager
 from app.finance.models.wallet import Wallet
 
 
@@ -34,14 +35,38 @@ class Category(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Xoá mềm cùng cây con; các category xoá chung một lần có cùng `deleted_at`.
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = LiveManager()
+    all_objects = models.Manager()
 
     class Meta:
-        unique_together = ("wallet", "name", "transaction_type")
+        constraints = [
+            # Tên chỉ cần duy nhất giữa các category chưa xoá.
+            models.UniqueConstraint(
+                fields=["wallet", "name", "transaction_type"],
+                condition=LIVE,
+                name="finance_category_live_name_uniq",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["deleted_at"], condition=DELETED, name="finance_category_trash_idx"),
+        ]
         ordering = ["wallet", "transaction_type", "name"]
 
     def __str__(self) -> str:
         return self.name
 
+    def lineage(self) -> list["Category"]:
+        """Chuỗi category từ gốc tới category hiện tại."""
+        lineage = [self]
+        seen = {self.pk}
+        while lineage[0].parent_id and lineage[0].parent_id not in seen:
+            seen.add(lineage[0].parent_id)
+            lineage.insert(0, lineage[0].parent)
+        return lineage
+
     def clean(self):
         if self.parent and self.parent.wallet_id != self.wallet_id:
             raise ValidationError(_("Parent category phải thuộc cùng một ví."))
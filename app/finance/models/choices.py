@@ -8,3 +8,66 @@ class TransactionType(models.TextChoices):
     LEND = "LEND", _("Cho vay")
     BORROW = "BORROW", _("Đi vay")
 
+
+
+class WalletRole(models.TextChoices):
+    OWNER = "OWNER", _("Chủ ví")
+    EDITOR = "EDITOR", _("Được chỉnh sửa")
+    VIEWER = "VIEWER", _("Chỉ xem")
+
+
+class BatchOperation(models.TextChoices):
+    CREATE = "create", _("Tạo")
+    UPDATE = "update", _("Cập nhật")
+    DELETE = "delete", _("Xoá")
+
+
+class DuplicatePolicy(models.TextChoices):
+    SKIP = "skip", _("Bỏ qua dòng trùng")
+    FLAG = "flag", _("Vẫn ghi và đánh dấu trùng")
+
+
+class RuleMatchType(models.TextChoices):
+    CONTAINS = "CONTAINS", _("Chứa chuỗi")
+    REGEX = "REGEX", _("Biểu thức chính quy")
+
+
+class RuleMatchField(models.TextChoices):
+    NOTE = "NOTE", _("Ghi chú")
+    MERCHANT = "MERCHANT", _("Merchant trong metadata")
+
+
+class RecurrencePeriod(models.TextChoices):
+    WEEKLY = "WEEKLY", _("Hằng tuần")
+    BIWEEKLY = "BIWEEKLY", _("Hai tuần một lần")
+    MONTHLY = "MONTHLY", _("Hằng tháng")
+    QUARTERLY = "QUARTERLY", _("Hằng quý")
+    YEARLY = "YEARLY", _("Hằng năm")
+
+
+class TotalsPeriod(models.TextChoices):
+    MONTH = "month", _("Tháng")
+    QUARTER = "quarter", _("Quý")
+    YEAR = "year", _("Năm")
+    ALL = "all", _("Toàn bộ")
+
+
+class JobKind(models.TextChoices):
+    EXPORT_TRANSACTIONS = "export_transactions", _("Xuất giao dịch ra CSV")
+    IMPORT_TRANSACTIONS = "import_transactions", _("Import sao kê")
+    RECONCILE_WALLET = "reconcile_wallet", _("Đối soát số dư ví")
+    REBUILD_ROLLUPS = "rebuild_rollups", _("Dựng lại dữ liệu tổng hợp của ví")
+    BOOTSTRAP_WALLET = "bootstrap_wallet", _("Sao chép master categories vào ví")
+    DELETE_WALLET = "delete_wallet", _("Xoá ví và dữ liệu của ví")
+    REFRESH_CATEGORY_SNAPSHOTS = "refresh_category_snapshots", _(
+        "Đồng bộ bản chụp category trên giao dịch"
+    )
+    DETECT_RECURRING_PATTERNS = "detect_recurring_patterns", _("Dò giao dịch định kỳ của ví")
+
+
+class JobStatus(models.TextChoices):
+    PENDING = "pending", _("Đang chờ")
+    RUNNING = "running", _("Đang chạy")
+    SUCCEEDED = "succeeded", _("Hoàn tất")
+    FAILED = "failed", _("Thất bại")
+    CANCELLED = "cancelled", _("Đã huỷ")
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.db import models
+
+
+class OutboxConsumer(models.Model):
+    """Offset đã xử lý xong của một consumer (theo người dùng + tên)."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="outbox_consumers"
+    )
+    name = models.CharField(max_length=100)
+    position = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["user", "name"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "name"], name="finance_outbox_consumer_unique"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} @ {self.position}"
@@ -0,0 +1,38 @@
+from django.db import models
+from django.db.models import Q
+
+
+class OutboxEvent(models.Model):
+    """
+    Nhật ký thay đổi (outbox) của ví, category và giao dịch, được ghi trong cùng
+    transaction DB với thay đổi đó.
+
+    `position` là offset mà consumer dùng để đọc tiếp; nó được gán sau khi
+    transaction ghi sự kiện đã commit (theo thứ tự `id`), nên một sự kiện có
+    `id` nhỏ nhưng commit muộn vẫn nhận offset lớn hơn mọi offset đã phát ra
+    và consumer không bao giờ bỏ sót.
+    """
+
+    position = models.PositiveBigIntegerField(null=True, blank=True, unique=True)
+    # Không dùng FK để sự kiện vẫn còn sau khi ví bị xoá.
+    wallet_id = models.BigIntegerField(null=True, blank=True)
+    aggregate_type = models.CharField(max_length=20)
+    aggregate_id = models.BigIntegerField()
+    event_type = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["position"]
+        indexes = [
+            models.Index(fields=["wallet_id", "position"], name="finance_outbox_wallet_idx"),
+            models.Index(
+                fields=["id"],
+                name="finance_outbox_pending_idx",
+                condition=Q(position__isnull=True),
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.position or '-'} {self.event_type} #{self.aggregate_id}"
+
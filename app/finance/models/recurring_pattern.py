@@ -0,0 +1,72 @@
+import calendar
+from datetime import date, timedelta
+
+from django.db import models
+
+from app.finance.models.category import Category
+from app.finance.models.choices import RecurrencePeriod, TransactionType
+from app.finance.models.wallet import Wallet
+
+
+class RecurringPattern(models.Model):
+    """
+    Giao dịch định kỳ (lương, tiền nhà, thuê bao...) được phát hiện từ lịch sử
+    của ví, nhóm theo category và ghi chú đã chuẩn hoá (`key`).
+    """
+
+    MONTH_STEPS = {
+        RecurrencePeriod.MONTHLY: 1,
+        RecurrencePeriod.QUARTERLY: 3,
+        RecurrencePeriod.YEARLY: 12,
+    }
+    DAY_STEPS = {
+        RecurrencePeriod.WEEKLY: 7,
+        RecurrencePeriod.BIWEEKLY: 14,
+    }
+
+    wallet = models.ForeignKey(
+        Wallet, on_delete=models.CASCADE, related_name="recurring_patterns"
+    )
+    category = models.ForeignKey(
+        Category, on_delete=models.CASCADE, related_name="recurring_patterns"
+    )
+    transaction_type = models.CharField(max_length=20, choices=TransactionType.choices)
+    key = models.CharField(max_length=255, blank=True)
+    note = models.TextField(blank=True)
+    period = models.CharField(max_length=20, choices=RecurrencePeriod.choices)
+    # Ngày trong tháng thường phát sinh, dùng cho chu kỳ theo tháng/quý/năm.
+    day_of_month = models.PositiveSmallIntegerField(null=True, blank=True)
+    amount = models.DecimalField(max_digits=14, decimal_places=2)
+    occurrences = models.PositiveIntegerField()
+    # Tỉ lệ khoảng cách giữa các lần phát sinh khớp với chu kỳ (0-1).
+    confidence = models.FloatField()
+    last_occurred_on = models.DateField()
+    next_expected_on = models.DateField()
+    detected_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["next_expected_on", "id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["wallet", "category", "key"],
+                name="finance_recurring_pattern_unique",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.note or self.category_id} ({self.period})"
+
+    @property
+    def interval_days(self) -> int:
+        if self.period in self.DAY_STEPS:
+            return self.DAY_STEPS[self.period]
+        return round(self.MONTH_STEPS[self.period] * 30.44)
+
+    def advance(self, value: date) -> date:
+        """Lần phát sinh kế tiếp sau `value` theo chu kỳ."""
+        if self.period in self.DAY_STEPS:
+            return value + timedelta(days=self.DAY_STEPS[self.period])
+        months = value.year * 12 + value.month - 1 + self.MONTH_STEPS[self.period]
+        year, month = divmod(months, 12)
+        day = min(self.day_of_month or value.day, calendar.monthrange(year, month + 1)[1])
+        return date(year, month + 1, day)
@@ -0,0 +1,13 @@
+from django.db import models
+
+# Điều kiện của các partial index: truy vấn mặc định chỉ chạm bản ghi chưa xoá,
+# thùng rác và lệnh dọn chỉ chạm bản ghi đã xoá.
+LIVE = models.Q(deleted_at__isnull=True)
+DELETED = models.Q(deleted_at__isnull=False)
+
+
+class LiveManager(models.Manager):
+    """Manager mặc định của model xoá mềm: bỏ qua bản ghi đã có `deleted_at`."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(LIVE)
@@ -1,3 +1,7 @@
+import hashlib
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
@@ -5,6 +9,7 @@ from django.utils.translation import gettext_lazy as _
 
 from app.finance.models.category import Category
 from app.finance.models.choices import TransactionType
+from app.finance.models.soft_delete import DELETED, LIVE, LiveManager
 from app.finance.models.wallet import Wallet
 
 
@@ -26,9 +31,37 @@ class Transaction(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     metadata = models.JSONField(blank=True, default=dict)
+    # Bản chụp category (tên, đường dẫn từ gốc, category gốc) để danh sách và
+    # tìm kiếm không phải join; được đồng bộ lại khi category đổi tên/di chuyển.
+    category_name = models.CharField(max_length=100, blank=True)
+    category_path = models.CharField(max_length=255, blank=True)
+    category_root = models.ForeignKey(
+        Category,
+        null=True,
+        blank=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    # Băm (ví, số tiền, ngày UTC) dùng để dò giao dịch trùng khi import.
+    fingerprint = models.CharField(max_length=64, blank=True)
+    # Xoá mềm: giao dịch nằm trong thùng rác tới khi `purge_deleted` xoá hẳn.
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = LiveManager()
+    all_objects = models.Manager()
 
     class Meta:
         ordering = ["-occurred_at", "-created_at"]
+        indexes = [
+            models.Index(
+                fields=["wallet", "-occurred_at"],
+                condition=LIVE,
+                name="finance_tx_live_wallet_idx",
+            ),
+            models.Index(fields=["fingerprint"], condition=LIVE, name="finance_tx_live_fp_idx"),
+            models.Index(fields=["deleted_at"], condition=DELETED, name="finance_tx_trash_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.wallet.name} - {self.amount} ({self.transaction_type})"
@@ -39,9 +72,36 @@ class Transaction(models.Model):
         if self.category.transaction_type != self.transaction_type:
             raise ValidationError(_("Loại giao dịch không khớp với category."))
 
-    def save(self, *args, **kwargs):
+    @staticmethod
+    def build_fingerprint(wallet_id: int, amount, occurred_at) -> str:
+        bucket = occurred_at.astimezone(dt_timezone.utc).date().isoformat()
+        normalized_amount = Decimal(amount).quantize(Decimal("0.01"))
+        return hashlib.sha256(f"{wallet_id}:{normalized_amount}:{bucket}".encode()).hexdigest()
+
+    def apply_category_snapshot(self, lineage=None) -> None:
+        lineage = lineage or self.category.lineage()
+        self.category_name = self.category.name
+        self.category_path = " / ".join(category.name for category in lineage)[:255]
+        self.category_root_id = lineage[0].pk
+
+    def save(self, *args, validate: bool = True, **kwargs):
+        """
+        `validate=False` dành cho caller đã validate field (serializer) và đã tải
+        sẵn wallet/category: bỏ `full_clean` (mỗi khoá ngoại một query kiểm tra
+        tồn tại) nhưng vẫn giữ ràng buộc ví/loại giao dịch của `clean`.
+        """
         if not self.transaction_type:
             self.transaction_type = self.category.transaction_type
-        self.full_clean()
+        if self._state.adding or not self.category_name:
+            self.apply_category_snapshot()
+        self.fingerprint = self.build_fingerprint(self.wallet_id, self.amount, self.occurred_at)
+        if validate:
+            self.full_clean(exclude=["category_root"])
+        else:
+            try:
+                self.clean()
+            except ValidationError as exc:
+                # Cùng dạng lỗi với `full_clean` (`{"__all__": [...]}`).
+                raise ValidationError(exc.update_error_dict({}))
         super().save(*args, **kwargs)
 
@@ -0,0 +1,54 @@
+from django.db import models
+
+from app.finance.models.category import Category
+from app.finance.models.choices import TransactionType
+from app.finance.models.wallet import Wallet
+
+
+class TransactionArchive(models.Model):
+    """
+    Giao dịch cũ được chuyển khỏi bảng `Transaction`. Giữ nguyên id và các cột
+    của giao dịch gốc (cùng thứ tự) để có thể đọc gộp với bảng chính.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    wallet = models.ForeignKey(
+        Wallet, on_delete=models.CASCADE, related_name="archived_transactions"
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.PROTECT,
+        related_name="archived_transactions",
+    )
+    transaction_type = models.CharField(
+        max_length=20, choices=TransactionType.choices
+    )
+    amount = models.DecimalField(max_digits=14, decimal_places=2)
+    note = models.TextField(blank=True)
+    occurred_at = models.DateTimeField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    metadata = models.JSONField(blank=True, default=dict)
+    category_name = models.CharField(max_length=100, blank=True)
+    category_path = models.CharField(max_length=255, blank=True)
+    category_root = models.ForeignKey(
+        Category,
+        null=True,
+        blank=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    fingerprint = models.CharField(max_length=64, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-occurred_at", "-created_at"]
+        indexes = [
+            models.Index(
+                fields=["wallet", "occurred_at"], name="finance_txarchive_wallet_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.wallet_id} - {self.amount} ({self.transaction_type})"
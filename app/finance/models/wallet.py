@@ -3,6 +3,8 @@ from decimal import Decimal
 from django.conf import settings
 from django.db import models
 
+from app.finance.models.soft_delete import LIVE, LiveManager
+
 
 class Wallet(models.Model):
     owner = models.ForeignKey(
@@ -15,11 +17,26 @@ class Wallet(models.Model):
     currency = models.CharField(max_length=5, default="VND")
     initial_balance = models.DecimalField(max_digits=14, decimal_places=2, default=0)
     current_balance = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    # Tăng sau mỗi lần ghi giao dịch của ví; dùng làm khoá cache cho số liệu tính từ giao dịch.
+    write_version = models.PositiveBigIntegerField(default=0)
+    # Mốc quét giao dịch định kỳ gần nhất: thời điểm bắt đầu quét và
+    # write_version lúc đó; lần quét sau chỉ xét giao dịch sửa từ mốc này.
+    recurring_scanned_at = models.DateTimeField(null=True, blank=True)
+    recurring_scanned_version = models.PositiveBigIntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Ví đang được xoá: bị ẩn ngay, dữ liệu con được xoá dần theo lô rồi mới xoá dòng ví.
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = LiveManager()
+    all_objects = models.Manager()
 
     class Meta:
-        unique_together = ("owner", "name")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["owner", "name"], condition=LIVE, name="finance_wallet_live_name_uniq"
+            ),
+        ]
         ordering = ["name"]
 
     def __str__(self) -> str:
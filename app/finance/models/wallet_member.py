@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.db import models
+
+from app.finance.models.choices import WalletRole
+from app.finance.models.wallet import Wallet
+
+
+class WalletMember(models.Model):
+    wallet = models.ForeignKey(
+        Wallet, on_delete=models.CASCADE, related_name="members"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="wallet_memberships",
+    )
+    role = models.CharField(
+        max_length=20, choices=WalletRole.choices, default=WalletRole.EDITOR
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("wallet", "user")
+        ordering = ["wallet", "created_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "wallet", "role"], name="finance_walletmember_user_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id} @ {self.wallet_id} ({self.role})"
@@ -0,0 +1,154 @@
+"""
+Pub/sub trong tiến trình cho luồng Server-Sent Events. Bên ghi (view đồng bộ,
+worker) gọi `publish` từ bất kỳ luồng nào; bên nghe là các coroutine SSE chạy
+trên event loop ASGI. Backend được chọn qua `FINANCE_REALTIME_BACKEND`; khi
+chạy nhiều tiến trình/máy cần backend dùng chung như `RedisBroker`.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+# Thông điệp báo người nghe đã lỡ sự kiện (hàng đợi đầy) và cần gửi lại snapshot.
+RESYNC = None
+
+
+class BaseBroker(ABC):
+    def active(self) -> bool:
+        """Có người nghe hay không; `False` cho phép bên ghi bỏ qua việc dựng sự kiện."""
+        return True
+
+    @abstractmethod
+    def publish(self, user_id: int, message: dict) -> None:
+        """Gửi `message` tới mọi subscription của `user_id`."""
+
+    @abstractmethod
+    async def subscribe(self, user_id: int):
+        """Trả về subscription có `await get(timeout)` và `await close()`."""
+
+
+class _QueueSubscription:
+    def __init__(self, broker, user_id: int, loop, size: int):
+        self.broker = broker
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=size)
+
+    def push(self, message: dict) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # Event loop đã đóng, subscription sẽ được gỡ khi stream kết thúc.
+            pass
+
+    def _put(self, message: dict) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self, timeout: float):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    async def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker(BaseBroker):
+    """
+    Mỗi subscription là một `asyncio.Queue` có giới hạn
+    (`FINANCE_REALTIME_QUEUE_SIZE`); người nghe chậm bị tràn hàng đợi sẽ nhận
+    `RESYNC` thay vì làm chậm bên ghi.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def active(self) -> bool:
+        return bool(self._subscriptions)
+
+    def publish(self, user_id: int, message: dict) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+        for subscription in subscriptions:
+            subscription.push(message)
+
+    async def subscribe(self, user_id: int) -> _QueueSubscription:
+        subscription = _QueueSubscription(
+            self, user_id, asyncio.get_running_loop(), settings.FINANCE_REALTIME_QUEUE_SIZE
+        )
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: _QueueSubscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.user_id]
+
+
+class _RedisSubscription:
+    def __init__(self, client, pubsub):
+        self.client = client
+        self.pubsub = pubsub
+
+    async def get(self, timeout: float):
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            message = await self.pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=remaining
+            )
+            if message is not None:
+                return json.loads(message["data"])
+        raise asyncio.TimeoutError
+
+    async def close(self) -> None:
+        await self.pubsub.aclose()
+        await self.client.aclose()
+
+
+class RedisBroker(BaseBroker):
+    """Phát qua Redis pub/sub (`FINANCE_REALTIME_REDIS_URL`), cần gói `redis`."""
+
+    CHANNEL = "finance:realtime:user:{user_id}"
+
+    def __init__(self):
+        try:
+            import redis
+        except ImportError as exc:
+            raise ImproperlyConfigured("RedisBroker requires the 'redis' package.") from exc
+        self._client = redis.Redis.from_url(settings.FINANCE_REALTIME_REDIS_URL)
+
+    def publish(self, user_id: int, message: dict) -> None:
+        self._client.publish(
+            self.CHANNEL.format(user_id=user_id), json.dumps(message, cls=DjangoJSONEncoder)
+        )
+
+    async def subscribe(self, user_id: int) -> _RedisSubscription:
+        from redis import asyncio as aioredis
+
+        client = aioredis.Redis.from_url(settings.FINANCE_REALTIME_REDIS_URL)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self.CHANNEL.format(user_id=user_id))
+        return _RedisSubscription(client, pubsub)
+
+
+@lru_cache(maxsize=None)
+def get_broker() -> BaseBroker:
+    return import_string(settings.FINANCE_REALTIME_BACKEND)()
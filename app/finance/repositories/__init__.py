@@ -1,12 +1,25 @@
 from .wallet_repository import WalletRepository
+from .wallet_member_repository import WalletMemberRepository
 from .category_repository import CategoryRepository
 from .transaction_repository import TransactionRepository
+from .transaction_archive_repository import TransactionArchiveRepository
 from .category_template_repository import CategoryTemplateRepository
+from .idempotency_key_repository import IdempotencyKeyRepository
+from .categorization_rule_repository import CategorizationRuleRepository
+from .recurring_pattern_repository import RecurringPatternRepository
+from .job_repository import JobRepository
+from .outbox_repository import OutboxRepository
 
 __all__ = [
     "WalletRepository",
+    "WalletMemberRepository",
     "CategoryRepository",
     "TransactionRepository",
+    "TransactionArchiveRepository",
     "CategoryTemplateRepository",
+    "IdempotencyKeyRepository",
+    "CategorizationRuleRepository",
+    "RecurringPatternRepository",
+    "JobRepository",
+    "OutboxRepository",
 ]
-
@@ -0,0 +1,39 @@
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from app.finance.models import CategorizationRule
+
+
+class CategorizationRuleRepository:
+    @staticmethod
+    def for_wallets(wallet_ids) -> QuerySet[CategorizationRule]:
+        return CategorizationRule.objects.filter(wallet_id__in=wallet_ids)
+
+    @staticmethod
+    def active_for_wallet(wallet_id: int) -> QuerySet[CategorizationRule]:
+        return CategorizationRule.objects.filter(
+            wallet_id=wallet_id, is_active=True, category__deleted_at__isnull=True
+        ).order_by(
+            "priority", "id"
+        )
+
+    @staticmethod
+    def reassign_category(category_id: int, target_id: int) -> int:
+        return CategorizationRule.objects.filter(category_id=category_id).update(
+            category_id=target_id, updated_at=timezone.now()
+        )
+
+    @staticmethod
+    def create(**kwargs) -> CategorizationRule:
+        return CategorizationRule.objects.create(**kwargs)
+
+    @staticmethod
+    def update(rule: CategorizationRule, **kwargs) -> CategorizationRule:
+        for field, value in kwargs.items():
+            setattr(rule, field, value)
+        rule.save()
+        return rule
+
+    @staticmethod
+    def delete(rule: CategorizationRule) -> None:
+        rule.delete()
@@ -1,13 +1,19 @@
-from django.db.models import QuerySet
+from datetime import datetime
 
-from app.finance.models import Category, Wallet
+from django.db.models import Exists, OuterRef, QuerySet
+
+from app.finance.models import Category, Transaction, TransactionArchive, Wallet
 
 
 class CategoryRepository:
     @staticmethod
-    def for_wallet(wallet: Wallet) -> QuerySet[Category]:
+    def for_wallet(wallet: Wallet | int) -> QuerySet[Category]:
         return Category.objects.filter(wallet=wallet).select_related("parent", "template")
 
+    @staticmethod
+    def for_wallets(wallet_ids) -> QuerySet[Category]:
+        return Category.objects.filter(wallet_id__in=wallet_ids)
+
     @staticmethod
     def get_by_id(category_id: int) -> Category:
         return Category.objects.select_related("wallet", "parent", "template").get(pk=category_id)
@@ -23,6 +29,73 @@ class CategoryRepository:
         category.save()
         return category
 
+    @staticmethod
+    def all_for_wallet(wallet_id: int) -> QuerySet[Category]:
+        """Mọi category của ví, kể cả đã xoá mềm."""
+        return Category.all_objects.filter(wallet_id=wallet_id)
+
+    @staticmethod
+    def descendant_ids(category_ids) -> list[int]:
+        """Id mọi category con cháu (kể cả đã xoá mềm), đọc từng tầng chỉ lấy id."""
+        descendants = []
+        frontier = list(category_ids)
+        while frontier:
+            frontier = list(
+                Category.all_objects.filter(parent_id__in=frontier)
+                .exclude(pk__in=descendants)
+                .values_list("pk", flat=True)
+            )
+            descendants.extend(frontier)
+        return descendants
+
+    @staticmethod
+    def reparent_children(parent_id: int, new_parent_id: int, updated_at: datetime) -> int:
+        return Category.all_objects.filter(parent_id=parent_id).update(
+            parent_id=new_parent_id, updated_at=updated_at
+        )
+
+    @staticmethod
+    def deleted_for_wallets(wallet_ids) -> QuerySet[Category]:
+        return Category.all_objects.filter(
+            wallet_id__in=wallet_ids, deleted_at__isnull=False
+        ).order_by("-deleted_at", "id")
+
+    @staticmethod
+    def deleted_children(parent_ids, deleted_at: datetime) -> QuerySet[Category]:
+        """Category con bị xoá cùng lần với cha (cùng `deleted_at`)."""
+        return Category.all_objects.filter(parent_id__in=parent_ids, deleted_at=deleted_at)
+
+    @staticmethod
+    def soft_delete(category_ids, deleted_at: datetime) -> int:
+        return Category.objects.filter(pk__in=category_ids).update(
+            deleted_at=deleted_at, updated_at=deleted_at
+        )
+
+    @staticmethod
+    def restore(category_ids, restored_at: datetime) -> int:
+        return Category.all_objects.filter(pk__in=category_ids).update(
+            deleted_at=None, updated_at=restored_at
+        )
+
+    @staticmethod
+    def purgeable(deleted_before: datetime) -> QuerySet[Category]:
+        """
+        Category đã xoá trước mốc, không còn category con và không còn giao dịch
+        (kể cả đã lưu trữ) trỏ tới; cây được dọn dần từ lá lên gốc.
+        """
+        return Category.all_objects.filter(deleted_at__lt=deleted_before).filter(
+            ~Exists(Category.all_objects.filter(parent_id=OuterRef("pk"))),
+            ~Exists(Transaction.all_objects.filter(category_id=OuterRef("pk"))),
+            ~Exists(TransactionArchive.objects.filter(category_id=OuterRef("pk"))),
+        )
+
+    @staticmethod
+    def purge(category_ids) -> int:
+        deleted, _ = Category.all_objects.filter(
+            pk__in=category_ids, deleted_at__isnull=False
+        ).delete()
+        return deleted
+
     @staticmethod
     def active_for_wallet(wallet: Wallet) -> QuerySet[Category]:
         return CategoryRepository.for_wallet(wallet).filter(is_active=True)
@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from django.db.models import QuerySet
+
+from app.finance.models import IdempotencyKey
+
+
+class IdempotencyKeyRepository:
+    @staticmethod
+    def get_for_user(user_id: int, key: str) -> IdempotencyKey | None:
+        return IdempotencyKey.objects.filter(user_id=user_id, key=key).first()
+
+    @staticmethod
+    def create(**kwargs) -> IdempotencyKey:
+        return IdempotencyKey.objects.create(**kwargs)
+
+    @staticmethod
+    def save_response(record: IdempotencyKey, status_code: int, body) -> IdempotencyKey:
+        record.response_status = status_code
+        record.response_body = body
+        record.save(update_fields=["response_status", "response_body"])
+        return record
+
+    @staticmethod
+    def delete(record: IdempotencyKey) -> None:
+        record.delete()
+
+    @staticmethod
+    def expired(now: datetime) -> QuerySet[IdempotencyKey]:
+        return IdempotencyKey.objects.filter(expires_at__lte=now)
@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from django.db.models import Q, QuerySet
+
+from app.finance.models import Job, JobStatus
+
+
+class JobRepository:
+    @staticmethod
+    def for_user(user) -> QuerySet[Job]:
+        return Job.objects.filter(user_id=user.id)
+
+    @staticmethod
+    def create(**kwargs) -> Job:
+        return Job.objects.create(**kwargs)
+
+    @staticmethod
+    def claimable(now: datetime, lease_expired_before: datetime) -> QuerySet[Job]:
+        """Job đến hạn chạy, hoặc đang chạy nhưng worker không báo tiến độ quá hạn lease."""
+        return Job.objects.filter(
+            Q(status=JobStatus.PENDING, run_after__lte=now)
+            | Q(status=JobStatus.RUNNING, heartbeat_at__lt=lease_expired_before)
+        ).order_by("run_after", "id")
+
+    @staticmethod
+    def update_if(job_id: int, expected: dict, **changes) -> bool:
+        """Cập nhật job khi các cột vẫn giữ giá trị `expected` (compare-and-set)."""
+        return Job.objects.filter(pk=job_id, **expected).update(**changes) == 1
+
+    @staticmethod
+    def pending_for_wallet(wallet_id: int) -> QuerySet[Job]:
+        return Job.objects.filter(wallet_id=wallet_id, status=JobStatus.PENDING)
+
+    @staticmethod
+    def active_for_wallet(wallet_id: int, kind: str) -> QuerySet[Job]:
+        return Job.objects.filter(
+            wallet_id=wallet_id, kind=kind, status__in=[JobStatus.PENDING, JobStatus.RUNNING]
+        )
+
+    @staticmethod
+    def update(job_id: int, **changes) -> int:
+        return Job.objects.filter(pk=job_id).update(**changes)
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from django.db.models import Max, Min, QuerySet
+
+from app.finance.models import OutboxConsumer, OutboxEvent
+
+
+class OutboxRepository:
+    @staticmethod
+    def create_many(events: list[OutboxEvent]) -> list[OutboxEvent]:
+        return OutboxEvent.objects.bulk_create(events)
+
+    @staticmethod
+    def pending_ids(limit: int) -> list[int]:
+        return list(
+            OutboxEvent.objects.filter(position__isnull=True)
+            .order_by("id")
+            .values_list("id", flat=True)[:limit]
+        )
+
+    @staticmethod
+    def head() -> int:
+        return OutboxEvent.objects.aggregate(head=Max("position"))["head"] or 0
+
+    @staticmethod
+    def assign_positions(ids: list[int], start: int) -> None:
+        events = [
+            OutboxEvent(id=event_id, position=start + offset)
+            for offset, event_id in enumerate(ids, start=1)
+        ]
+        OutboxEvent.objects.bulk_update(events, ["position"])
+
+    @staticmethod
+    def after(position: int, wallet_ids=None) -> QuerySet[OutboxEvent]:
+        queryset = OutboxEvent.objects.filter(position__gt=position).order_by("position")
+        if wallet_ids is not None:
+            queryset = queryset.filter(wallet_id__in=wallet_ids)
+        return queryset
+
+    @staticmethod
+    def consumer(user, name: str) -> OutboxConsumer:
+        return OutboxConsumer.objects.get_or_create(user_id=user.id, name=name)[0]
+
+    @staticmethod
+    def advance_consumer(consumer: OutboxConsumer, position: int) -> int:
+        """Chỉ tiến offset về phía trước (ack cũ hoặc lặp lại không làm lùi)."""
+        return OutboxConsumer.objects.filter(pk=consumer.pk, position__lt=position).update(
+            position=position
+        )
+
+    @staticmethod
+    def lowest_consumer_position() -> int | None:
+        return OutboxConsumer.objects.aggregate(lowest=Min("position"))["lowest"]
+
+    @staticmethod
+    def delete_before(position: int, created_before: datetime) -> int:
+        return OutboxEvent.objects.filter(
+            position__lte=position, created_at__lt=created_before
+        ).delete()[0]
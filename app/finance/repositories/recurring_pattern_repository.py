@@ -0,0 +1,51 @@
+from django.db.models import QuerySet
+
+from app.finance.models import RecurringPattern
+
+
+class RecurringPatternRepository:
+    UPDATE_FIELDS = (
+        "transaction_type",
+        "note",
+        "period",
+        "day_of_month",
+        "amount",
+        "occurrences",
+        "confidence",
+        "last_occurred_on",
+        "next_expected_on",
+        "detected_at",
+    )
+
+    @staticmethod
+    def for_wallet(wallet_id: int) -> QuerySet[RecurringPattern]:
+        return RecurringPattern.objects.filter(wallet_id=wallet_id)
+
+    @staticmethod
+    def delete_for_categories(category_ids) -> int:
+        return RecurringPattern.objects.filter(category_id__in=category_ids).delete()[0]
+
+    @staticmethod
+    def upsert(patterns: list[RecurringPattern]) -> None:
+        RecurringPattern.objects.bulk_create(
+            patterns,
+            update_conflicts=True,
+            unique_fields=["wallet", "category", "key"],
+            update_fields=list(RecurringPatternRepository.UPDATE_FIELDS),
+        )
+
+    @staticmethod
+    def delete_missing(wallet_id: int, category_ids, keep: set[tuple[int, str]]) -> int:
+        """
+        Xoá mẫu của các category `category_ids` (None = mọi category) không còn
+        nằm trong `keep` (tập (category_id, key) vừa phát hiện).
+        """
+        queryset = RecurringPattern.objects.filter(wallet_id=wallet_id)
+        if category_ids is not None:
+            queryset = queryset.filter(category_id__in=category_ids)
+        stale = [
+            pk
+            for pk, category_id, key in queryset.values_list("pk", "category_id", "key")
+            if (category_id, key) not in keep
+        ]
+        return RecurringPattern.objects.filter(pk__in=stale).delete()[0] if stale else 0
@@ -0,0 +1,54 @@
+from datetime import datetime
+from decimal import Decimal
+
+from django.db.models import Count, Max, QuerySet, Sum
+
+from app.finance.models import TransactionArchive
+
+
+class TransactionArchiveRepository:
+    @staticmethod
+    def for_wallets(wallet_ids) -> QuerySet[TransactionArchive]:
+        return TransactionArchive.objects.filter(wallet_id__in=wallet_ids)
+
+    @staticmethod
+    def reassign_category(category_id: int, target_id: int, snapshot: dict) -> int:
+        return TransactionArchive.objects.filter(category_id=category_id).update(
+            category_id=target_id, **snapshot
+        )
+
+    @staticmethod
+    def latest_occurred_at(wallet_ids) -> datetime | None:
+        return TransactionArchive.objects.filter(wallet_id__in=wallet_ids).aggregate(
+            latest=Max("occurred_at")
+        )["latest"]
+
+    @staticmethod
+    def bulk_create(rows) -> list[TransactionArchive]:
+        return TransactionArchive.objects.bulk_create(
+            [TransactionArchive(**row) for row in rows]
+        )
+
+    @staticmethod
+    def totals_by_type(wallet_id: int) -> dict[str, Decimal]:
+        rows = (
+            TransactionArchive.objects.filter(wallet_id=wallet_id)
+            .order_by()
+            .values("transaction_type")
+            .annotate(total=Sum("amount"))
+        )
+        return {row["transaction_type"]: row["total"] for row in rows}
+
+    @staticmethod
+    def totals_by_category(wallet_ids, since: datetime | None, until: datetime | None):
+        queryset = TransactionArchive.objects.filter(wallet_id__in=wallet_ids)
+        if since is not None:
+            queryset = queryset.filter(occurred_at__gte=since)
+        if until is not None:
+            queryset = queryset.filter(occurred_at__lt=until)
+        return (
+            queryset.order_by()
+            .values("wallet_id", "category_id")
+            .annotate(total=Sum("amount"), count=Count("id"))
+            .values_list("wallet_id", "category_id", "total", "count")
+        )
@@ -1,4 +1,7 @@
-from django.db.models import QuerySet
+from datetime import datetime
+from decimal import Decimal
+
+from django.db.models import Count, QuerySet, Sum
 
 from app.finance.models import Transaction, Wallet
 
@@ -8,22 +11,132 @@ class TransactionRepository:
     def for_wallet(wallet: Wallet) -> QuerySet[Transaction]:
         return Transaction.objects.filter(wallet=wallet).select_related("wallet", "category")
 
+    @staticmethod
+    def for_wallets(wallet_ids) -> QuerySet[Transaction]:
+        return Transaction.objects.filter(wallet_id__in=wallet_ids)
+
+    @staticmethod
+    def by_fingerprints(wallet_id: int, fingerprints, chunk_size: int = 500):
+        """(id, fingerprint, occurred_at, note) của các giao dịch có fingerprint cho trước."""
+        fingerprints = list(fingerprints)
+        for start in range(0, len(fingerprints), chunk_size):
+            yield from (
+                Transaction.objects.filter(
+                    wallet_id=wallet_id,
+                    fingerprint__in=fingerprints[start:start + chunk_size],
+                )
+                .order_by()
+                .values_list("id", "fingerprint", "occurred_at", "note")
+            )
+
     @staticmethod
     def get_by_id(transaction_id: int) -> Transaction:
         return Transaction.objects.select_related("wallet", "category").get(pk=transaction_id)
 
     @staticmethod
-    def create(**kwargs) -> Transaction:
-        return Transaction.objects.create(**kwargs)
+    def create(*, validate: bool = True, **kwargs) -> Transaction:
+        transaction = Transaction(**kwargs)
+        transaction.save(force_insert=True, validate=validate)
+        return transaction
 
     @staticmethod
-    def update(transaction: Transaction, **kwargs) -> Transaction:
+    def update(transaction: Transaction, *, validate: bool = True, **kwargs) -> Transaction:
+        changed = [field for field, value in kwargs.items() if getattr(transaction, field) != value]
         for field, value in kwargs.items():
             setattr(transaction, field, value)
-        transaction.save()
+        if validate:
+            transaction.save()
+        else:
+            # Chỉ ghi các cột thực sự đổi; fingerprint được tính lại từ số tiền/ngày.
+            transaction.save(validate=False, update_fields=[*changed, "fingerprint", "updated_at"])
         return transaction
 
     @staticmethod
-    def delete(transaction: Transaction) -> None:
-        transaction.delete()
+    def all_for_wallet(wallet_id: int) -> QuerySet[Transaction]:
+        """Mọi giao dịch của ví, kể cả đã xoá mềm."""
+        return Transaction.all_objects.filter(wallet_id=wallet_id)
 
+    @staticmethod
+    def for_categories(category_ids) -> QuerySet[Transaction]:
+        return Transaction.objects.filter(category_id__in=category_ids)
+
+    @staticmethod
+    def reassign_category(
+        category_id: int, target_id: int, snapshot: dict, updated_at: datetime
+    ) -> int:
+        """Chuyển mọi giao dịch (kể cả đã xoá mềm) sang category khác bằng một câu UPDATE."""
+        return Transaction.all_objects.filter(category_id=category_id).update(
+            category_id=target_id, updated_at=updated_at, **snapshot
+        )
+
+    @staticmethod
+    def changed_categories(wallet_id: int, occurred_since: datetime, updated_since: datetime):
+        """Category có giao dịch (kể cả đã xoá mềm) được ghi từ `updated_since`."""
+        return (
+            Transaction.all_objects.filter(
+                wallet_id=wallet_id,
+                occurred_at__gte=occurred_since,
+                updated_at__gte=updated_since,
+            )
+            .order_by()
+            .values_list("category_id", flat=True)
+            .distinct()
+        )
+
+    @staticmethod
+    def deleted_for_wallets(wallet_ids) -> QuerySet[Transaction]:
+        return Transaction.all_objects.filter(
+            wallet_id__in=wallet_ids, deleted_at__isnull=False
+        ).order_by("-deleted_at", "-id")
+
+    @staticmethod
+    def soft_delete(transaction_ids, deleted_at: datetime) -> int:
+        return Transaction.objects.filter(pk__in=transaction_ids).update(
+            deleted_at=deleted_at, updated_at=deleted_at
+        )
+
+    @staticmethod
+    def restore(transaction: Transaction, restored_at: datetime) -> int:
+        transaction.deleted_at = None
+        transaction.updated_at = restored_at
+        transaction.apply_category_snapshot()
+        fields = ("deleted_at", "updated_at", "category_name", "category_path", "category_root_id")
+        return Transaction.all_objects.filter(pk=transaction.pk).update(
+            **{field: getattr(transaction, field) for field in fields}
+        )
+
+    @staticmethod
+    def deleted_before(deleted_before: datetime) -> QuerySet[Transaction]:
+        return Transaction.all_objects.filter(deleted_at__lt=deleted_before)
+
+    @staticmethod
+    def purge(transaction_ids) -> int:
+        deleted, _ = Transaction.all_objects.filter(
+            pk__in=transaction_ids, deleted_at__isnull=False
+        ).delete()
+        return deleted
+
+    @staticmethod
+    def totals_by_type(wallet_id: int) -> dict[str, Decimal]:
+        rows = (
+            Transaction.objects.filter(wallet_id=wallet_id)
+            .order_by()
+            .values("transaction_type")
+            .annotate(total=Sum("amount"))
+        )
+        return {row["transaction_type"]: row["total"] for row in rows}
+
+    @staticmethod
+    def totals_by_category(wallet_ids, since: datetime | None, until: datetime | None):
+        """(wallet_id, category_id, tổng tiền, số giao dịch) trong [since, until), một câu GROUP BY."""
+        queryset = Transaction.objects.filter(wallet_id__in=wallet_ids)
+        if since is not None:
+            queryset = queryset.filter(occurred_at__gte=since)
+        if until is not None:
+            queryset = queryset.filter(occurred_at__lt=until)
+        return (
+            queryset.order_by()
+            .values("wallet_id", "category_id")
+            .annotate(total=Sum("amount"), count=Count("id"))
+            .values_list("wallet_id", "category_id", "total", "count")
+        )
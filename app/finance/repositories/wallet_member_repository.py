@@ -0,0 +1,46 @@
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import QuerySet
+
+from app.finance.models import WalletMember
+
+
+class WalletMemberRepository:
+    @staticmethod
+    def roles_for_user(user_id: int) -> QuerySet:
+        # Quyền truy cập luôn đọc từ primary để không phụ thuộc độ trễ của replica.
+        return (
+            WalletMember.objects.using(DEFAULT_DB_ALIAS)
+            .filter(user_id=user_id)
+            .values_list("wallet_id", "role")
+        )
+
+    @staticmethod
+    def for_wallet(wallet_id: int) -> QuerySet[WalletMember]:
+        return WalletMember.objects.filter(wallet_id=wallet_id).select_related("user")
+
+    @staticmethod
+    def user_ids_for_wallet(wallet_id: int) -> QuerySet:
+        return WalletMember.objects.filter(wallet_id=wallet_id).values_list("user_id", flat=True)
+
+    @staticmethod
+    def user_ids_for_wallets(wallet_ids) -> QuerySet:
+        return WalletMember.objects.filter(wallet_id__in=wallet_ids).values_list(
+            "wallet_id", "user_id"
+        )
+
+    @staticmethod
+    def upsert(wallet_id: int, user_id: int, role: str) -> WalletMember:
+        member, _ = WalletMember.objects.update_or_create(
+            wallet_id=wallet_id, user_id=user_id, defaults={"role": role}
+        )
+        return member
+
+    @staticmethod
+    def delete_for_wallet(wallet_id: int) -> int:
+        deleted, _ = WalletMember.objects.filter(wallet_id=wallet_id).delete()
+        return deleted
+
+    @staticmethod
+    def delete(wallet_id: int, user_id: int) -> int:
+        deleted, _ = WalletMember.objects.filter(wallet_id=wallet_id, user_id=user_id).delete()
+        return deleted
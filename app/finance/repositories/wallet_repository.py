@@ -1,4 +1,7 @@
-from django.db.models import QuerySet
+from datetime import datetime
+from decimal import Decimal
+
+from django.db.models import F, QuerySet
 
 from app.finance.models import Wallet
 
@@ -8,6 +11,10 @@ class WalletRepository:
     def for_user(user) -> QuerySet[Wallet]:
         return Wallet.objects.filter(owner=user)
 
+    @staticmethod
+    def by_ids(wallet_ids) -> QuerySet[Wallet]:
+        return Wallet.objects.filter(pk__in=wallet_ids)
+
     @staticmethod
     def get_by_id(wallet_id: int) -> Wallet:
         return Wallet.objects.get(pk=wallet_id)
@@ -20,6 +27,44 @@ class WalletRepository:
     def update(wallet: Wallet, **kwargs) -> Wallet:
         for field, value in kwargs.items():
             setattr(wallet, field, value)
-        wallet.save()
+        # Chỉ ghi các cột được sửa để không đè số dư/write_version do giao dịch cập nhật.
+        wallet.save(update_fields=[*kwargs, "updated_at"] if kwargs else None)
         return wallet
 
+    @staticmethod
+    def apply_balance_delta(wallet_id: int, delta: Decimal) -> int:
+        if not delta:
+            # Số dư không đổi nhưng giao dịch thì có (ví dụ đổi ngày), nên thống
+            # kê cache theo write_version vẫn phải hết hạn.
+            return WalletRepository.touch([wallet_id])
+        return Wallet.objects.filter(pk=wallet_id).update(
+            current_balance=F("current_balance") + delta,
+            write_version=F("write_version") + 1,
+        )
+
+    @staticmethod
+    def touch(wallet_ids) -> int:
+        return Wallet.objects.filter(pk__in=wallet_ids).update(
+            write_version=F("write_version") + 1
+        )
+
+    @staticmethod
+    def mark_recurring_scanned(wallet_id: int, scanned_at: datetime, version: int) -> int:
+        return Wallet.objects.filter(pk=wallet_id).update(
+            recurring_scanned_at=scanned_at, recurring_scanned_version=version
+        )
+
+    @staticmethod
+    def mark_deleted(wallet_id: int, deleted_at: datetime) -> int:
+        return Wallet.objects.filter(pk=wallet_id).update(
+            deleted_at=deleted_at, updated_at=deleted_at
+        )
+
+    @staticmethod
+    def deleted_by_id(wallet_id: int) -> Wallet | None:
+        return Wallet.all_objects.filter(pk=wallet_id, deleted_at__isnull=False).first()
+
+    @staticmethod
+    def delete(wallet: Wallet) -> None:
+        wallet.delete()
+
@@ -1,12 +1,59 @@
 from .wallet_serializer import WalletSerializer
-from .category_serializer import CategorySerializer
-from .transaction_serializer import TransactionSerializer
+from .wallet_member_serializer import WalletMemberSerializer
+from .category_serializer import (
+    CategoryMergeSerializer,
+    CategoryMoveSerializer,
+    CategorySerializer,
+    CategoryWithTotalsSerializer,
+    DeletedCategorySerializer,
+)
+from .transaction_serializer import DeletedTransactionSerializer, TransactionSerializer
 from .category_template_serializer import CategoryTemplateSerializer
+from .categorization_rule_serializer import CategorizationRuleSerializer
+from .recurring_pattern_serializer import RecurringPatternSerializer
+from .outbox_serializer import (
+    OutboxAckSerializer,
+    OutboxConsumerSerializer,
+    OutboxEventSerializer,
+    OutboxPollSerializer,
+)
+from .job_serializer import (
+    JobSerializer,
+    TransactionExportSerializer,
+    WalletReconcileSerializer,
+)
+from .transaction_import_serializer import (
+    TransactionImportRowSerializer,
+    TransactionImportSerializer,
+)
+from .transaction_batch_serializer import (
+    TransactionBatchOperationSerializer,
+    TransactionBatchSerializer,
+)
 
 __all__ = [
     "WalletSerializer",
+    "WalletMemberSerializer",
     "CategorySerializer",
+    "DeletedCategorySerializer",
+    "CategoryWithTotalsSerializer",
+    "CategoryMergeSerializer",
+    "CategoryMoveSerializer",
     "TransactionSerializer",
+    "DeletedTransactionSerializer",
     "CategoryTemplateSerializer",
+    "TransactionBatchOperationSerializer",
+    "TransactionBatchSerializer",
+    "CategorizationRuleSerializer",
+    "RecurringPatternSerializer",
+    "OutboxAckSerializer",
+    "OutboxConsumerSerializer",
+    "OutboxEventSerializer",
+    "OutboxPollSerializer",
+    "JobSerializer",
+    "TransactionExportSerializer",
+    "WalletReconcileSerializer",
+    "TransactionImportRowSerializer",
+    "TransactionImportSerializer",
 ]
 
@@ -0,0 +1,36 @@
+import copy
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+
+from app.finance.models import CategorizationRule, Category
+
+
+class CategorizationRuleSerializer(serializers.ModelSerializer):
+    category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all())
+
+    class Meta:
+        model = CategorizationRule
+        fields = (
+            "id",
+            "wallet",
+            "category",
+            "pattern",
+            "match_type",
+            "match_field",
+            "priority",
+            "is_active",
+            "created_at",
+            "updated_at",
+        )
+        read_only_fields = ("id", "created_at", "updated_at")
+
+    def validate(self, attrs):
+        rule = copy.copy(self.instance) if self.instance else CategorizationRule()
+        for field, value in attrs.items():
+            setattr(rule, field, value)
+        try:
+            rule.clean()
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError(exc.messages)
+        return attrs
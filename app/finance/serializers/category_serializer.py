@@ -1,3 +1,4 @@
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
 from app.finance.models import Category, CategoryTemplate, TransactionType
@@ -33,3 +34,44 @@ class CategorySerializer(serializers.ModelSerializer):
             "updated_at",
         )
 
+
+class DeletedCategorySerializer(CategorySerializer):
+    """Category trong thùng rác, kèm thời điểm xoá."""
+
+    class Meta(CategorySerializer.Meta):
+        fields = (*CategorySerializer.Meta.fields, "deleted_at")
+        read_only_fields = fields
+
+
+class CategoryTotalsSerializer(serializers.Serializer):
+    amount = serializers.DecimalField(max_digits=16, decimal_places=2)
+    count = serializers.IntegerField()
+    subtree_amount = serializers.DecimalField(max_digits=16, decimal_places=2)
+    subtree_count = serializers.IntegerField()
+
+
+class CategoryWithTotalsSerializer(CategorySerializer):
+    """Category kèm tổng tiền/số giao dịch trong kỳ của riêng nó và của cả cây con."""
+
+    EMPTY_TOTALS = {"amount": 0, "count": 0, "subtree_amount": 0, "subtree_count": 0}
+
+    totals = serializers.SerializerMethodField()
+
+    class Meta(CategorySerializer.Meta):
+        fields = (*CategorySerializer.Meta.fields, "totals")
+
+    @extend_schema_field(CategoryTotalsSerializer)
+    def get_totals(self, obj) -> dict:
+        return CategoryTotalsSerializer(
+            self.context["totals"].get(obj.id, self.EMPTY_TOTALS)
+        ).data
+
+
+class CategoryMergeSerializer(serializers.Serializer):
+    target = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all())
+
+
+class CategoryMoveSerializer(serializers.Serializer):
+    parent = serializers.PrimaryKeyRelatedField(
+        queryset=Category.objects.all(), allow_null=True
+    )
@@ -0,0 +1,60 @@
+from django.urls import reverse
+from rest_framework import serializers
+
+from app.finance.models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    progress = serializers.IntegerField(read_only=True)
+    error = serializers.SerializerMethodField()
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = (
+            "id",
+            "kind",
+            "status",
+            "wallet",
+            "progress",
+            "progress_done",
+            "progress_total",
+            "message",
+            "result",
+            "error",
+            "download_url",
+            "attempts",
+            "created_at",
+            "started_at",
+            "finished_at",
+        )
+        read_only_fields = fields
+
+    def get_error(self, obj) -> str:
+        # Chỉ trả dòng cuối của traceback (loại lỗi và thông điệp).
+        lines = [line for line in obj.error.splitlines() if line.strip()]
+        return lines[-1] if lines else ""
+
+    def get_download_url(self, obj) -> str | None:
+        if not obj.result_file:
+            return None
+        url = reverse("job-download", args=[obj.pk])
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+
+class TransactionExportSerializer(serializers.Serializer):
+    start = serializers.DateField(required=False, allow_null=True)
+    end = serializers.DateField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        start, end = attrs.get("start"), attrs.get("end")
+        if start and end and start > end:
+            raise serializers.ValidationError(
+                {"end": "Ngày kết thúc phải sau hoặc bằng ngày bắt đầu."}
+            )
+        return attrs
+
+
+class WalletReconcileSerializer(serializers.Serializer):
+    fix = serializers.BooleanField(default=False)
@@ -0,0 +1,43 @@
+from django.conf import settings
+from rest_framework import serializers
+
+from app.finance.models import OutboxConsumer, OutboxEvent
+
+
+class OutboxEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = OutboxEvent
+        fields = (
+            "position",
+            "event_type",
+            "aggregate_type",
+            "aggregate_id",
+            "wallet_id",
+            "payload",
+            "created_at",
+        )
+        read_only_fields = fields
+
+
+class OutboxConsumerSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = OutboxConsumer
+        fields = ("name", "position", "updated_at")
+        read_only_fields = fields
+
+
+class OutboxPollSerializer(serializers.Serializer):
+    after = serializers.IntegerField(min_value=0, default=0)
+    limit = serializers.IntegerField(min_value=1, default=100)
+    wait = serializers.FloatField(min_value=0, default=0)
+    wallet = serializers.IntegerField(required=False)
+
+    def validate_limit(self, value):
+        return min(value, settings.FINANCE_OUTBOX_MAX_BATCH)
+
+    def validate_wait(self, value):
+        return min(value, settings.FINANCE_OUTBOX_MAX_WAIT)
+
+
+class OutboxAckSerializer(serializers.Serializer):
+    position = serializers.IntegerField(min_value=0)
@@ -0,0 +1,27 @@
+from rest_framework import serializers
+
+from app.finance.models import RecurringPattern
+
+
+class RecurringPatternSerializer(serializers.ModelSerializer):
+    interval_days = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = RecurringPattern
+        fields = (
+            "id",
+            "wallet",
+            "category",
+            "transaction_type",
+            "note",
+            "period",
+            "interval_days",
+            "day_of_month",
+            "amount",
+            "occurrences",
+            "confidence",
+            "last_occurred_on",
+            "next_expected_on",
+            "detected_at",
+        )
+        read_only_fields = fields
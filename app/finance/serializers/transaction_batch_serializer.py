@@ -0,0 +1,51 @@
+from decimal import Decimal
+
+from rest_framework import serializers
+
+from app.finance.models import BatchOperation, TransactionType
+
+
+class TransactionBatchOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=BatchOperation.choices)
+    id = serializers.IntegerField(required=False)
+    wallet = serializers.IntegerField(required=False)
+    category = serializers.IntegerField(required=False, allow_null=True)
+    transaction_type = serializers.ChoiceField(
+        choices=TransactionType.choices, required=False, allow_null=True
+    )
+    amount = serializers.DecimalField(
+        max_digits=14, decimal_places=2, min_value=Decimal("0.01"), required=False
+    )
+    note = serializers.CharField(required=False, allow_blank=True)
+    occurred_at = serializers.DateTimeField(required=False)
+    metadata = serializers.JSONField(required=False)
+
+    def validate(self, attrs):
+        op = attrs["op"]
+        if op == BatchOperation.CREATE:
+            missing = [field for field in ("wallet", "amount") if field not in attrs]
+            if missing:
+                raise serializers.ValidationError(
+                    {field: "Trường này bắt buộc khi tạo giao dịch." for field in missing}
+                )
+            if "id" in attrs:
+                raise serializers.ValidationError({"id": "Không truyền id khi tạo giao dịch."})
+            return attrs
+
+        if "id" not in attrs:
+            raise serializers.ValidationError({"id": "Trường này bắt buộc."})
+        if op == BatchOperation.UPDATE:
+            for field in ("wallet", "category"):
+                if field in attrs:
+                    raise serializers.ValidationError(
+                        {field: "Không thể đổi ví/category của giao dịch qua batch."}
+                    )
+        return attrs
+
+
+class TransactionBatchSerializer(serializers.Serializer):
+    MAX_OPERATIONS = 500
+
+    operations = TransactionBatchOperationSerializer(
+        many=True, allow_empty=False, max_length=MAX_OPERATIONS
+    )
@@ -0,0 +1,24 @@
+from rest_framework import serializers
+
+from app.finance.models import DuplicatePolicy, TransactionType, Wallet
+
+
+class TransactionImportRowSerializer(serializers.Serializer):
+    category = serializers.IntegerField(required=False, allow_null=True)
+    transaction_type = serializers.ChoiceField(
+        choices=TransactionType.choices, required=False, allow_null=True
+    )
+    amount = serializers.DecimalField(max_digits=14, decimal_places=2)
+    note = serializers.CharField(required=False, allow_blank=True)
+    occurred_at = serializers.DateTimeField()
+    metadata = serializers.JSONField(required=False)
+
+
+class TransactionImportSerializer(serializers.Serializer):
+    MAX_ROWS = 5000
+
+    wallet = serializers.PrimaryKeyRelatedField(queryset=Wallet.objects.all())
+    on_duplicate = serializers.ChoiceField(
+        choices=DuplicatePolicy.choices, default=DuplicatePolicy.SKIP
+    )
+    rows = TransactionImportRowSerializer(many=True, allow_empty=False, max_length=MAX_ROWS)
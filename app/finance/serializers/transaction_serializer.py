@@ -5,7 +5,10 @@ from app.finance.models import Category, Transaction, TransactionType, Wallet
 
 class TransactionSerializer(serializers.ModelSerializer):
     wallet = serializers.PrimaryKeyRelatedField(queryset=Wallet.objects.all())
-    category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all())
+    category = serializers.PrimaryKeyRelatedField(
+        # Tải kèm category cha để dựng bản chụp đường dẫn không tốn thêm query.
+        queryset=Category.objects.select_related("parent"), required=False, allow_null=True
+    )
     transaction_type = serializers.ChoiceField(
         choices=TransactionType.choices, required=False, allow_null=True
     )
@@ -23,6 +26,23 @@ class TransactionSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "metadata",
+            "category_name",
+            "category_path",
+            "category_root",
         )
-        read_only_fields = ("id", "created_at", "updated_at")
+        read_only_fields = (
+            "id",
+            "created_at",
+            "updated_at",
+            "category_name",
+            "category_path",
+            "category_root",
+        )
+
+
+class DeletedTransactionSerializer(TransactionSerializer):
+    """Giao dịch trong thùng rác, kèm thời điểm xoá."""
 
+    class Meta(TransactionSerializer.Meta):
+        fields = (*TransactionSerializer.Meta.fields, "deleted_at")
+        read_only_fields = fields
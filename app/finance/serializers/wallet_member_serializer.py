@@ -0,0 +1,23 @@
+from django.contrib.auth import get_user_model
+from rest_framework import serializers
+
+from app.finance.models import WalletMember, WalletRole
+
+User = get_user_model()
+
+
+class WalletMemberSerializer(serializers.ModelSerializer):
+    user = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
+    username = serializers.CharField(source="user.username", read_only=True)
+    role = serializers.ChoiceField(
+        choices=[
+            (WalletRole.EDITOR, WalletRole.EDITOR.label),
+            (WalletRole.VIEWER, WalletRole.VIEWER.label),
+        ],
+        default=WalletRole.EDITOR,
+    )
+
+    class Meta:
+        model = WalletMember
+        fields = ("id", "user", "username", "role", "created_at")
+        read_only_fields = ("id", "created_at")
@@ -5,6 +5,7 @@ from app.finance.models import Wallet
 
 class WalletSerializer(serializers.ModelSerializer):
     owner = serializers.StringRelatedField(read_only=True)
+    role = serializers.SerializerMethodField()
 
     class Meta:
         model = Wallet
@@ -18,6 +19,10 @@ class WalletSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "owner",
+            "role",
         )
         read_only_fields = ("id", "current_balance", "created_at", "updated_at", "owner")
 
+    def get_role(self, wallet: Wallet) -> str | None:
+        return self.context.get("wallet_roles", {}).get(wallet.id)
+
@@ -1,10 +1,45 @@
+from .wallet_access_service import WalletAccessService
 from .wallet_service import WalletService
+from .category_snapshot_service import CategorySnapshotService
+from .categorization_service import CategorizationService
 from .category_service import CategoryService
+from .category_totals_service import CategoryTotalsService
+from .category_tree_service import CategoryTreeService
 from .transaction_service import TransactionService
+from .transaction_archive_service import TransactionArchiveService
+from .trash_service import TrashService
+from .transaction_import_service import TransactionImportService
+from .transaction_statistics_service import TransactionStatisticsService
+from .recurring_pattern_service import RecurringPatternService
+from .cash_flow_forecast_service import CashFlowForecastService
+from .outbox_service import OutboxService
+from .realtime_service import RealtimeService
+from .job_service import JobService
+from .job_handlers import JobHandlers
+from .job_worker import JobWorker
+from .idempotency_service import IdempotencyService
+from .partition_service import TransactionPartitionService
 
 __all__ = [
+    "WalletAccessService",
     "WalletService",
+    "CategorySnapshotService",
+    "CategorizationService",
     "CategoryService",
+    "CategoryTotalsService",
+    "CategoryTreeService",
     "TransactionService",
+    "TransactionArchiveService",
+    "TrashService",
+    "TransactionImportService",
+    "TransactionStatisticsService",
+    "RecurringPatternService",
+    "CashFlowForecastService",
+    "OutboxService",
+    "RealtimeService",
+    "JobService",
+    "JobHandlers",
+    "JobWorker",
+    "IdempotencyService",
+    "TransactionPartitionService",
 ]
-
@@ -0,0 +1,105 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.utils import timezone
+
+from app.finance.models import Wallet
+from app.finance.services.recurring_pattern_service import RecurringPatternService
+from app.finance.services.transaction_service import TransactionService
+
+
+class CashFlowForecastService:
+    """
+    Dự báo số dư của ví trong N ngày tới từ `current_balance` và các mẫu giao
+    dịch định kỳ đã lưu. Mỗi request chỉ đọc mẫu và tính chuỗi ngày; việc phân
+    tích lịch sử do `RecurringPatternService` làm trong job nền (tăng dần, khi
+    ví có ghi mới); trong lúc chờ, dự báo dùng mẫu đã lưu và báo
+    `patterns_stale`.
+    """
+
+    @staticmethod
+    def resolve_days(days: int | None) -> int:
+        if days is None:
+            days = settings.FINANCE_FORECAST_DEFAULT_DAYS
+        if not 1 <= days <= settings.FINANCE_FORECAST_MAX_DAYS:
+            raise ValueError(
+                f"Số ngày dự báo phải từ 1 đến {settings.FINANCE_FORECAST_MAX_DAYS}."
+            )
+        return days
+
+    @staticmethod
+    def forecast(wallet: Wallet, days: int | None = None) -> dict:
+        days = CashFlowForecastService.resolve_days(days)
+        stale = RecurringPatternService.schedule_detect(wallet)
+
+        start = timezone.now().date()
+        end = start + timedelta(days=days - 1)
+        events = []
+        for pattern in RecurringPatternService.patterns_for(wallet).select_related("category"):
+            interval = pattern.interval_days
+            # Mẫu đã lỡ hơn hai chu kỳ coi như đã dừng (ví dụ huỷ thuê bao).
+            if pattern.last_occurred_on + timedelta(days=2 * interval) < start:
+                continue
+            grace = timedelta(days=RecurringPatternService.tolerance_days(interval))
+            occurrence = pattern.next_expected_on
+            while occurrence < start:
+                # Lần phát sinh trễ nhưng còn trong sai lệch cho phép vẫn được tính vào hôm nay.
+                if start - occurrence <= grace and pattern.advance(occurrence) >= start:
+                    events.append((start, pattern))
+                occurrence = pattern.advance(occurrence)
+            while occurrence <= end:
+                events.append((occurrence, pattern))
+                occurrence = pattern.advance(occurrence)
+        events.sort(key=lambda event: (event[0], event[1].pk))
+
+        inflow = defaultdict(lambda: Decimal("0.00"))
+        outflow = defaultdict(lambda: Decimal("0.00"))
+        for occurrence, pattern in events:
+            if TransactionService._resolve_delta(pattern.transaction_type) > 0:
+                inflow[occurrence] += pattern.amount
+            else:
+                outflow[occurrence] += pattern.amount
+
+        balance = Decimal(wallet.current_balance)
+        lowest = {"date": start.isoformat(), "balance": str(balance)}
+        balances = []
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            balance += inflow[day] - outflow[day]
+            balances.append(
+                {
+                    "date": day.isoformat(),
+                    "inflow": str(inflow[day]),
+                    "outflow": str(outflow[day]),
+                    "balance": str(balance),
+                }
+            )
+            if balance < Decimal(lowest["balance"]):
+                lowest = {"date": day.isoformat(), "balance": str(balance)}
+
+        return {
+            "wallet": wallet.id,
+            "currency": wallet.currency,
+            "current_balance": str(wallet.current_balance),
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "patterns_scanned_at": wallet.recurring_scanned_at,
+            "patterns_stale": stale,
+            "ending_balance": str(balance),
+            "lowest_balance": lowest,
+            "balances": balances,
+            "events": [
+                {
+                    "date": occurrence.isoformat(),
+                    "pattern": pattern.pk,
+                    "category": pattern.category_id,
+                    "category_name": pattern.category.name,
+                    "note": pattern.note,
+                    "transaction_type": pattern.transaction_type,
+                    "amount": str(pattern.amount),
+                }
+                for occurrence, pattern in events
+            ],
+        }
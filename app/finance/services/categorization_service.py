@@ -0,0 +1,192 @@
+import logging
+import re
+from collections import defaultdict, deque
+from functools import lru_cache
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from app.finance.models import (
+    CategorizationRule,
+    Category,
+    RuleMatchField,
+    RuleMatchType,
+    Wallet,
+)
+from app.finance.repositories import CategorizationRuleRepository, CategoryRepository
+
+logger = logging.getLogger(__name__)
+
+
+class _KeywordAutomaton:
+    """
+    Automaton Aho-Corasick cho các quy tắc "chứa chuỗi": một lần duyệt văn bản
+    tìm mọi từ khoá xuất hiện; mỗi nút giữ thứ tự ưu tiên tốt nhất của các từ
+    khoá kết thúc tại đó (kể cả qua liên kết fail).
+    """
+
+    def __init__(self, keywords):
+        self.goto = [{}]
+        self.fail = [0]
+        self.best = [None]
+        for keyword, index in keywords:
+            node = 0
+            for char in keyword:
+                next_node = self.goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self.goto)
+                    self.goto[node][char] = next_node
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.best.append(None)
+                node = next_node
+            if self.best[node] is None or index < self.best[node]:
+                self.best[node] = index
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, next_node in self.goto[node].items():
+                queue.append(next_node)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_node] = self.goto[fallback].get(char, 0)
+                inherited = self.best[self.fail[next_node]]
+                if inherited is not None and (
+                    self.best[next_node] is None or inherited < self.best[next_node]
+                ):
+                    self.best[next_node] = inherited
+
+    def search(self, text: str) -> int | None:
+        goto, fail, best_at = self.goto, self.fail, self.best
+        node = 0
+        best = None
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            found = best_at[node]
+            if found is not None and (best is None or found < best):
+                best = found
+        return best
+
+
+class CategorizationMatcher:
+    """
+    Bộ so khớp đã biên dịch cho các quy tắc của một ví, theo từng trường (ghi
+    chú, merchant): quy tắc "chứa chuỗi" gộp vào một automaton Aho-Corasick,
+    quy tắc regex gộp thành một regex với mỗi quy tắc là một nhánh có tên
+    `r<thứ tự>`. Trong các quy tắc khớp, quy tắc đứng trước (ưu tiên cao hơn)
+    thắng. Quy tắc regex không gộp được (dữ liệu cũ, trước khi `clean` kiểm
+    tra) bị bỏ qua thay vì làm hỏng việc ghi giao dịch của cả ví.
+    """
+
+    def __init__(self, rules):
+        self.category_ids = []
+        keywords = defaultdict(list)
+        branches = defaultdict(list)
+        for index, rule in enumerate(rules):
+            if rule.match_type == RuleMatchType.REGEX:
+                try:
+                    CategorizationRule.check_regex(rule.pattern)
+                except ValidationError:
+                    logger.warning("Bỏ qua quy tắc phân loại %s: regex không hợp lệ", rule.pk)
+                else:
+                    branches[rule.match_field].append(
+                        CategorizationRule.REGEX_BRANCH.format(index=index, pattern=rule.pattern)
+                    )
+            elif rule.pattern:
+                keywords[rule.match_field].append((rule.pattern.casefold(), index))
+            self.category_ids.append(rule.category_id)
+        self.automatons = {
+            field: _KeywordAutomaton(items) for field, items in keywords.items()
+        }
+        self.patterns = {}
+        for field, parts in branches.items():
+            try:
+                self.patterns[field] = CategorizationRule.compile_branches(parts)
+            except re.error:
+                logger.exception("Không thể biên dịch quy tắc regex của trường %s", field)
+
+    def match(self, note: str | None, metadata: dict | None) -> int | None:
+        texts = {
+            RuleMatchField.NOTE: note or "",
+            RuleMatchField.MERCHANT: str((metadata or {}).get("merchant") or ""),
+        }
+        candidates = [
+            automaton.search(texts[field].casefold())
+            for field, automaton in self.automatons.items()
+        ]
+        for field, pattern in self.patterns.items():
+            candidates.extend(
+                int(found.lastgroup[1:]) for found in pattern.finditer(texts[field])
+            )
+        candidates = [index for index in candidates if index is not None]
+        return self.category_ids[min(candidates)] if candidates else None
+
+
+@lru_cache(maxsize=256)
+def _build_matcher(wallet_id: int, version: str) -> CategorizationMatcher:
+    return CategorizationMatcher(
+        CategorizationRuleRepository.active_for_wallet(wallet_id).only(
+            "category_id", "pattern", "match_type", "match_field"
+        )
+    )
+
+
+class CategorizationService:
+    """
+    Tự chọn category cho giao dịch không truyền category, dựa trên quy tắc
+    (mẫu -> category) của ví. Bộ so khớp đã biên dịch được giữ trong bộ nhớ
+    tiến trình theo (ví, phiên bản); phiên bản lưu trong cache và được đổi mỗi
+    khi quy tắc thay đổi.
+    """
+
+    VERSION_KEY = "finance:categorization:{wallet_id}:version"
+
+    @staticmethod
+    def matcher_for(wallet_id: int) -> CategorizationMatcher:
+        key = CategorizationService.VERSION_KEY.format(wallet_id=wallet_id)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, uuid4().hex, None)
+            version = cache.get(key)
+        return _build_matcher(wallet_id, version)
+
+    @staticmethod
+    def categorize(wallet: Wallet, note: str | None, metadata: dict | None) -> Category | None:
+        category_id = CategorizationService.matcher_for(wallet.id).match(note, metadata)
+        if category_id is None:
+            return None
+        return CategoryRepository.for_wallet(wallet).filter(pk=category_id).first()
+
+    @staticmethod
+    def invalidate(wallet_id: int) -> None:
+        key = CategorizationService.VERSION_KEY.format(wallet_id=wallet_id)
+        transaction.on_commit(lambda: cache.set(key, uuid4().hex, None))
+
+    @staticmethod
+    @transaction.atomic
+    def create_rule(wallet: Wallet, **data) -> CategorizationRule:
+        rule = CategorizationRuleRepository.create(wallet=wallet, **data)
+        CategorizationService.invalidate(wallet.id)
+        return rule
+
+    @staticmethod
+    @transaction.atomic
+    def update_rule(rule: CategorizationRule, **data) -> CategorizationRule:
+        previous_wallet_id = rule.wallet_id
+        rule = CategorizationRuleRepository.update(rule, **data)
+        CategorizationService.invalidate(previous_wallet_id)
+        if rule.wallet_id != previous_wallet_id:
+            CategorizationService.invalidate(rule.wallet_id)
+        return rule
+
+    @staticmethod
+    @transaction.atomic
+    def delete_rule(rule: CategorizationRule) -> None:
+        CategorizationRuleRepository.delete(rule)
+        CategorizationService.invalidate(rule.wallet_id)
@@ -1,17 +1,182 @@
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 
 from app.finance.models import Category, Wallet
-from app.finance.repositories import CategoryRepository, CategoryTemplateRepository
+from app.finance.repositories import (
+    CategorizationRuleRepository,
+    CategoryRepository,
+    CategoryTemplateRepository,
+    RecurringPatternRepository,
+    TransactionArchiveRepository,
+    TransactionRepository,
+    WalletRepository,
+)
+from app.finance.services.category_snapshot_service import CategorySnapshotService
+from app.finance.services.category_tree_service import CategoryTreeService
+from app.finance.services.outbox_service import OutboxService
 
 
 class CategoryService:
     @staticmethod
-    def list_categories(wallet: Wallet):
+    def list_categories(wallet: Wallet | int):
         return CategoryRepository.for_wallet(wallet)
 
     @staticmethod
+    @transaction.atomic
     def create_category(wallet: Wallet, **data) -> Category:
-        return CategoryRepository.create(wallet=wallet, **data)
+        category = CategoryRepository.create(wallet=wallet, **data)
+        OutboxService.record(category, OutboxService.CREATED)
+        return category
+
+    @staticmethod
+    @transaction.atomic
+    def update_category(category: Category, **data) -> Category:
+        previous = (category.name, category.parent_id)
+        category = CategoryRepository.update(category, **data)
+        if (category.name, category.parent_id) != previous:
+            CategorySnapshotService.schedule_refresh([category.id])
+        OutboxService.record(category, OutboxService.UPDATED)
+        return category
+
+    @staticmethod
+    @transaction.atomic
+    def delete_category(category: Category) -> None:
+        """
+        Xoá mềm category cùng các category con (cùng một `deleted_at` để khôi
+        phục lại cả cây), ghi sự kiện cho từng category. Category còn giao dịch
+        thì không xoá được.
+        """
+        deleted = [category]
+        frontier = [category.pk]
+        while frontier:
+            children = list(
+                CategoryRepository.for_wallets([category.wallet_id]).filter(
+                    parent_id__in=frontier
+                )
+            )
+            deleted.extend(children)
+            frontier = [child.pk for child in children]
+        if TransactionRepository.for_categories([item.pk for item in deleted]).exists():
+            raise ValueError("Category hoặc category con còn giao dịch, không thể xoá.")
+
+        deleted_at = timezone.now()
+        CategoryRepository.soft_delete([item.pk for item in deleted], deleted_at)
+        # Các UPDATE theo tập không phát signal lưu model nên tự xoá cache cây.
+        CategoryTreeService.invalidate(category.wallet_id)
+        for item in deleted:
+            item.deleted_at = item.updated_at = deleted_at
+        OutboxService.record_many(
+            [OutboxService.build(item, OutboxService.DELETED) for item in reversed(deleted)]
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def restore_category(category: Category) -> Category:
+        """Khôi phục category đã xoá mềm cùng các category con bị xoá chung lần đó."""
+        if category.deleted_at is None:
+            raise ValueError("Category chưa bị xoá.")
+        if category.parent_id and category.parent.deleted_at is not None:
+            raise ValueError("Category cha đã bị xoá, hãy khôi phục category cha trước.")
+
+        restored = [category]
+        frontier = [category.pk]
+        while frontier:
+            children = list(CategoryRepository.deleted_children(frontier, category.deleted_at))
+            restored.extend(children)
+            frontier = [child.pk for child in children]
+
+        restored_at = timezone.now()
+        try:
+            with transaction.atomic():
+                CategoryRepository.restore([item.pk for item in restored], restored_at)
+        except IntegrityError:
+            raise ValueError("Ví đã có category cùng tên và loại giao dịch.")
+        CategoryTreeService.invalidate(category.wallet_id)
+        for item in restored:
+            item.deleted_at = None
+            item.updated_at = restored_at
+        OutboxService.record_many(
+            [OutboxService.build(item, OutboxService.RESTORED) for item in restored]
+        )
+        return category
+
+    @staticmethod
+    @transaction.atomic
+    def merge_category(source: Category, target: Category) -> Category:
+        """
+        Gộp `source` vào `target`: giao dịch (kể cả đã xoá mềm và đã lưu trữ) và
+        quy tắc phân loại được chuyển sang `target`, category con chuyển thành
+        con của `target`, mỗi bước một câu UPDATE; `source` bị xoá mềm.
+        """
+        if source.pk == target.pk:
+            raise ValueError("Không thể gộp category vào chính nó.")
+        CategoryService._check_compatible(source, target)
+        descendants = CategoryRepository.descendant_ids([source.pk])
+        if target.pk in descendants:
+            raise ValueError("Không thể gộp category vào category con của nó.")
+
+        now = timezone.now()
+        source_path = CategorySnapshotService.snapshot_of(source)["category_path"]
+        snapshot = CategorySnapshotService.snapshot_of(target)
+        moved = TransactionRepository.reassign_category(source.pk, target.pk, snapshot, now)
+        TransactionArchiveRepository.reassign_category(source.pk, target.pk, snapshot)
+        CategoryRepository.reparent_children(source.pk, target.pk, now)
+        CategorySnapshotService.rebase(
+            descendants, source_path, snapshot["category_path"], snapshot["category_root_id"]
+        )
+        CategorizationRuleRepository.reassign_category(source.pk, target.pk)
+        # Mẫu định kỳ của `target` được dò lại vì giao dịch vừa chuyển có `updated_at` mới.
+        RecurringPatternRepository.delete_for_categories([source.pk])
+        CategoryRepository.soft_delete([source.pk], now)
+        source.deleted_at = source.updated_at = now
+        CategoryTreeService.invalidate(source.wallet_id)
+        # Thống kê theo category cache theo write_version.
+        WalletRepository.touch([source.wallet_id])
+        OutboxService.record(
+            source,
+            OutboxService.MERGED,
+            {**OutboxService.serialize(source), "merged_into": target.pk, "transactions": moved},
+        )
+        return target
+
+    @staticmethod
+    @transaction.atomic
+    def move_category(category: Category, parent: Category | None) -> Category:
+        """
+        Chuyển category cùng cây con sang cha mới (None = thành category gốc).
+        Chỉ dòng của category được ghi; đường dẫn trong bản chụp của giao dịch
+        thuộc cả cây con được sửa bằng một câu UPDATE.
+        """
+        if parent is not None:
+            if parent.pk == category.pk:
+                raise ValueError("Category không thể là cha của chính nó.")
+            CategoryService._check_compatible(category, parent)
+        descendants = CategoryRepository.descendant_ids([category.pk])
+        if parent is not None and parent.pk in descendants:
+            raise ValueError("Không thể chuyển category vào category con của nó.")
+        if category.parent_id == (parent.pk if parent else None):
+            return category
+
+        old_path = CategorySnapshotService.snapshot_of(category)["category_path"]
+        category = CategoryRepository.update(category, parent=parent)
+        snapshot = CategorySnapshotService.snapshot_of(category)
+        CategorySnapshotService.rebase(
+            [category.pk, *descendants],
+            old_path,
+            snapshot["category_path"],
+            snapshot["category_root_id"],
+        )
+        WalletRepository.touch([category.wallet_id])
+        OutboxService.record(category, OutboxService.UPDATED)
+        return category
+
+    @staticmethod
+    def _check_compatible(category: Category, other: Category) -> None:
+        """Cùng ví và cùng loại giao dịch, như `Category.clean`."""
+        if other.wallet_id != category.wallet_id:
+            raise ValueError("Category phải thuộc cùng một ví.")
+        if other.transaction_type != category.transaction_type:
+            raise ValueError("Category phải cùng loại giao dịch.")
 
     @staticmethod
     @transaction.atomic
@@ -37,3 +202,10 @@ class CategoryService:
             )
             template_map[template.id] = category
 
+        OutboxService.record_many(
+            [
+                OutboxService.build(category, OutboxService.CREATED)
+                for category in template_map.values()
+            ]
+        )
+
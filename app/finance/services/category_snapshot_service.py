@@ -0,0 +1,170 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import CharField, F, Value
+from django.db.models.functions import Concat, Left, Substr
+
+from app.finance.models import Category, JobKind, Transaction, TransactionArchive
+from app.finance.repositories import CategoryRepository
+from app.finance.services.job_service import JobService
+
+
+class CategorySnapshotService:
+    """
+    Đồng bộ bản chụp category (`category_name`, `category_path`,
+    `category_root`) lưu trên giao dịch. Khi category đổi tên hoặc di chuyển,
+    giao dịch của category đó và toàn bộ category con được cập nhật theo lô
+    bằng job nền `refresh_category_snapshots`, được ghi cùng transaction với
+    thay đổi category nên không bị mất khi tiến trình khởi động lại.
+    """
+
+    PATH_SEPARATOR = " / "
+
+    @staticmethod
+    def snapshots(categories) -> dict[int, dict]:
+        by_id = {category.id: category for category in categories}
+        result = {}
+        for category in by_id.values():
+            lineage = [category]
+            seen = {category.id}
+            while lineage[0].parent_id in by_id and lineage[0].parent_id not in seen:
+                seen.add(lineage[0].parent_id)
+                lineage.insert(0, by_id[lineage[0].parent_id])
+            result[category.id] = {
+                "category_name": category.name,
+                "category_path": CategorySnapshotService.PATH_SEPARATOR.join(
+                    item.name for item in lineage
+                )[:255],
+                "category_root_id": lineage[0].id,
+            }
+        return result
+
+    @staticmethod
+    def snapshot_of(category: Category) -> dict:
+        return CategorySnapshotService.snapshots(category.lineage())[category.id]
+
+    @staticmethod
+    def rebase(category_ids, old_path: str, new_path: str, root_id: int) -> int:
+        """
+        Đổi tiền tố `old_path` thành `new_path` trong bản chụp của giao dịch (kể
+        cả đã xoá mềm và đã lưu trữ) thuộc các category này, một câu UPDATE mỗi
+        bảng; dùng khi cả cây con được chuyển sang cha khác. Bản chụp đã lệch
+        từ trước (không bắt đầu bằng `old_path`) để `refresh` xử lý.
+        """
+        category_ids = list(category_ids)
+        if not category_ids:
+            return 0
+        path = Left(
+            Concat(
+                Value(new_path),
+                Substr(F("category_path"), len(old_path) + 1),
+                output_field=CharField(),
+            ),
+            255,
+        )
+        updated = 0
+        for manager in (Transaction.all_objects, TransactionArchive.objects):
+            updated += manager.filter(
+                category_id__in=category_ids, category_path__startswith=old_path
+            ).update(category_path=path, category_root_id=root_id)
+        return updated
+
+    @staticmethod
+    def snapshots_for_wallets(wallet_ids) -> dict[int, dict]:
+        return CategorySnapshotService.snapshots(
+            CategoryRepository.for_wallets(wallet_ids).only("id", "name", "parent_id")
+        )
+
+    @staticmethod
+    def schedule_refresh(category_ids) -> None:
+        """
+        Xếp job đồng bộ cho từng ví (job thuộc chủ ví); với
+        `FINANCE_CATEGORY_SNAPSHOT_ASYNC=False` thì chạy ngay sau commit.
+        """
+        category_ids = list(category_ids)
+        if not settings.FINANCE_CATEGORY_SNAPSHOT_ASYNC:
+            transaction.on_commit(lambda: CategorySnapshotService.refresh(category_ids))
+            return
+        by_wallet = defaultdict(list)
+        wallets = {}
+        for category in Category.objects.filter(pk__in=category_ids).select_related(
+            "wallet__owner"
+        ):
+            by_wallet[category.wallet_id].append(category.id)
+            wallets[category.wallet_id] = category.wallet
+        for wallet_id, ids in by_wallet.items():
+            wallet = wallets[wallet_id]
+            JobService.enqueue(
+                JobKind.REFRESH_CATEGORY_SNAPSHOTS,
+                wallet.owner,
+                wallet,
+                {"category_ids": ids},
+            )
+
+    @staticmethod
+    def refresh(category_ids, batch_size: int = 1000) -> int:
+        """
+        Cập nhật lại bản chụp cho giao dịch của các category này và category con
+        của chúng. Trả về số giao dịch đã cập nhật.
+        """
+        wallet_ids = set(
+            Category.objects.filter(pk__in=category_ids).values_list("wallet_id", flat=True)
+        )
+        categories = list(
+            CategoryRepository.for_wallets(wallet_ids).only("id", "name", "parent_id")
+        )
+        children = defaultdict(list)
+        for category in categories:
+            children[category.parent_id].append(category.id)
+
+        affected = set()
+        pending = list(category_ids)
+        while pending:
+            category_id = pending.pop()
+            if category_id in affected:
+                continue
+            affected.add(category_id)
+            pending.extend(children[category_id])
+
+        snapshots = CategorySnapshotService.snapshots(categories)
+        return CategorySnapshotService._apply(
+            {
+                category_id: snapshots[category_id]
+                for category_id in affected
+                if category_id in snapshots
+            },
+            batch_size,
+        )
+
+    @staticmethod
+    def refresh_wallets(wallet_ids=None, batch_size: int = 1000) -> int:
+        """Đồng bộ lại toàn bộ bản chụp của các ví (None = mọi ví)."""
+        categories = (
+            CategoryRepository.for_wallets(wallet_ids)
+            if wallet_ids is not None
+            else Category.objects.all()
+        )
+        return CategorySnapshotService._apply(
+            CategorySnapshotService.snapshots(categories.only("id", "name", "parent_id")),
+            batch_size,
+        )
+
+    @staticmethod
+    def _apply(snapshots: dict[int, dict], batch_size: int) -> int:
+        updated = 0
+        for category_id, snapshot in snapshots.items():
+            for model in (Transaction, TransactionArchive):
+                stale = (
+                    model.objects.filter(category_id=category_id)
+                    .exclude(**snapshot)
+                    .order_by()
+                    .values_list("pk", flat=True)
+                )
+                while True:
+                    with transaction.atomic():
+                        batch = list(stale[:batch_size])
+                        if not batch:
+                            break
+                        updated += model.objects.filter(pk__in=batch).update(**snapshot)
+        return updated
@@ -0,0 +1,116 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from app.finance.models import TotalsPeriod
+from app.finance.repositories import (
+    CategoryRepository,
+    TransactionArchiveRepository,
+    TransactionRepository,
+    WalletRepository,
+)
+from app.finance.services.transaction_archive_service import TransactionArchiveService
+
+
+class CategoryTotalsService:
+    """
+    Tổng tiền và số giao dịch theo category trong một kỳ, kèm tổng của cả cây
+    con, để danh sách category hiển thị luôn số liệu. Tổng riêng từng category
+    lấy bằng một câu GROUP BY (thêm một câu cho bảng lưu trữ khi kỳ chạm tới)
+    và được cache theo `write_version` của ví; tổng cây con cộng dồn trong bộ
+    nhớ theo cây category hiện tại.
+    """
+
+    CACHE_KEY = "finance:category-totals:{wallet_id}:{version}:{since}:{until}"
+
+    @staticmethod
+    def resolve_period(
+        period: str, anchor: date | None = None
+    ) -> tuple[datetime | None, datetime | None]:
+        """
+        Khoảng [since, until) của tháng/quý/năm chứa `anchor` (mặc định hôm nay);
+        `all` không giới hạn.
+        """
+        if period not in TotalsPeriod.values:
+            raise ValueError(
+                f"Kỳ không hợp lệ, chọn một trong: {', '.join(TotalsPeriod.values)}."
+            )
+        if period == TotalsPeriod.ALL:
+            return None, None
+        anchor = anchor or timezone.localdate()
+        months = {TotalsPeriod.MONTH: 1, TotalsPeriod.QUARTER: 3, TotalsPeriod.YEAR: 12}[period]
+        first_month = (anchor.month - 1) // months * months
+        year, month = divmod(first_month + months, 12)
+        start = date(anchor.year, first_month + 1, 1)
+        end = date(anchor.year + year, month + 1, 1)
+        return (
+            timezone.make_aware(datetime.combine(start, time.min)),
+            timezone.make_aware(datetime.combine(end, time.min)),
+        )
+
+    @staticmethod
+    def totals(
+        wallet_ids, since: datetime | None, until: datetime | None
+    ) -> dict[int, dict]:
+        """`{category_id: {amount, count, subtree_amount, subtree_count}}` của các ví."""
+        wallet_ids = set(wallet_ids)
+        own = {}
+        missing = {}
+        for wallet_id, version in WalletRepository.by_ids(wallet_ids).values_list(
+            "id", "write_version"
+        ):
+            key = CategoryTotalsService.CACHE_KEY.format(
+                wallet_id=wallet_id,
+                version=version,
+                since=since.isoformat() if since else "",
+                until=until.isoformat() if until else "",
+            )
+            cached = cache.get(key)
+            if cached is None:
+                missing[wallet_id] = key
+            else:
+                own.update(cached)
+        if missing:
+            computed = CategoryTotalsService._own_totals(missing, since, until)
+            for wallet_id, key in missing.items():
+                cache.set(key, computed[wallet_id], settings.FINANCE_STATS_CACHE_TTL)
+                own.update(computed[wallet_id])
+        return CategoryTotalsService._roll_up(own, wallet_ids)
+
+    @staticmethod
+    def _own_totals(wallet_ids, since, until) -> dict[int, dict[int, tuple[Decimal, int]]]:
+        """`{wallet_id: {category_id: (tổng tiền, số giao dịch)}}`."""
+        wallet_ids = list(wallet_ids)
+        rows = list(TransactionRepository.totals_by_category(wallet_ids, since, until))
+        if TransactionArchiveService.reaches_archive(wallet_ids, since):
+            rows.extend(TransactionArchiveRepository.totals_by_category(wallet_ids, since, until))
+        totals = {wallet_id: {} for wallet_id in wallet_ids}
+        for wallet_id, category_id, amount, count in rows:
+            previous_amount, previous_count = totals[wallet_id].get(category_id, (Decimal("0"), 0))
+            totals[wallet_id][category_id] = (previous_amount + amount, previous_count + count)
+        return totals
+
+    @staticmethod
+    def _roll_up(own: dict[int, tuple[Decimal, int]], wallet_ids) -> dict[int, dict]:
+        parents = dict(CategoryRepository.for_wallets(wallet_ids).values_list("id", "parent_id"))
+        result = {}
+        for category_id in parents:
+            amount, count = own.get(category_id, (Decimal("0"), 0))
+            result[category_id] = {
+                "amount": amount,
+                "count": count,
+                "subtree_amount": Decimal("0"),
+                "subtree_count": 0,
+            }
+        for category_id, (amount, count) in own.items():
+            seen = set()
+            current = category_id
+            while current in result and current not in seen:
+                seen.add(current)
+                result[current]["subtree_amount"] += amount
+                result[current]["subtree_count"] += count
+                current = parents[current]
+        return result
@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from app.finance.repositories import CategoryRepository, CategoryTemplateRepository
+
+
+class CategoryTreeService:
+    """
+    Cây category lồng nhau của một ví (và cây master categories) cho màn hình
+    nhập giao dịch. Toàn bộ category được đọc bằng một query `values()` rồi
+    ghép cây một lượt trong bộ nhớ; kết quả được cache theo ví và bị xoá sau
+    khi transaction ghi category commit.
+    """
+
+    CACHE_KEY = "finance:category-tree:{wallet_id}"
+    TEMPLATE_CACHE_KEY = "finance:category-template-tree"
+    FIELDS = ("id", "name", "transaction_type", "parent", "template", "description", "icon", "is_active")
+    TEMPLATE_FIELDS = ("id", "name", "transaction_type", "parent", "description", "position")
+
+    @staticmethod
+    def tree(wallet_id: int, transaction_type: str | None = None) -> list[dict]:
+        key = CategoryTreeService.CACHE_KEY.format(wallet_id=wallet_id)
+        roots = cache.get(key)
+        if roots is None:
+            roots = CategoryTreeService.build(
+                CategoryRepository.for_wallets([wallet_id]).values(*CategoryTreeService.FIELDS)
+            )
+            cache.set(key, roots, settings.FINANCE_CATEGORY_TREE_CACHE_TTL)
+        return CategoryTreeService._of_type(roots, transaction_type)
+
+    @staticmethod
+    def template_tree(transaction_type: str | None = None) -> list[dict]:
+        roots = cache.get(CategoryTreeService.TEMPLATE_CACHE_KEY)
+        if roots is None:
+            roots = CategoryTreeService.build(
+                CategoryTemplateRepository.all_master()
+                .order_by("transaction_type", "position", "name")
+                .values(*CategoryTreeService.TEMPLATE_FIELDS)
+            )
+            cache.set(
+                CategoryTreeService.TEMPLATE_CACHE_KEY,
+                roots,
+                settings.FINANCE_CATEGORY_TREE_CACHE_TTL,
+            )
+        return CategoryTreeService._of_type(roots, transaction_type)
+
+    @staticmethod
+    def build(rows) -> list[dict]:
+        """Ghép các dòng (có khoá `id`, `parent`) thành cây, giữ nguyên thứ tự đọc."""
+        nodes = {row["id"]: {**row, "children": []} for row in rows}
+        roots = []
+        for node in nodes.values():
+            parent = nodes.get(node["parent"])
+            (parent["children"] if parent is not None else roots).append(node)
+        return roots
+
+    @staticmethod
+    def invalidate(wallet_id: int) -> None:
+        key = CategoryTreeService.CACHE_KEY.format(wallet_id=wallet_id)
+        transaction.on_commit(lambda: cache.delete(key))
+
+    @staticmethod
+    def invalidate_templates() -> None:
+        transaction.on_commit(lambda: cache.delete(CategoryTreeService.TEMPLATE_CACHE_KEY))
+
+    @staticmethod
+    def _of_type(roots: list[dict], transaction_type: str | None) -> list[dict]:
+        if transaction_type is None:
+            return roots
+        return [root for root in roots if root["transaction_type"] == transaction_type]
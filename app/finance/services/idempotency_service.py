@@ -0,0 +1,62 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from app.finance.models import IdempotencyKey
+from app.finance.repositories import IdempotencyKeyRepository
+
+
+class IdempotencyService:
+    HEADER = "Idempotency-Key"
+
+    @staticmethod
+    def fingerprint(method: str, path: str, payload) -> str:
+        body = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(f"{method}\n{path}\n{body}".encode()).hexdigest()
+
+    @staticmethod
+    def lookup(user_id: int, key: str) -> IdempotencyKey | None:
+        record = IdempotencyKeyRepository.get_for_user(user_id, key)
+        if record is not None and record.expires_at <= timezone.now():
+            IdempotencyKeyRepository.delete(record)
+            return None
+        return record
+
+    @staticmethod
+    def reserve(user_id: int, key: str, fingerprint: str) -> IdempotencyKey | None:
+        """
+        Giữ chỗ cho key trong transaction hiện tại; trả về None nếu một request
+        khác cùng key đã ghi trước (unique constraint trên user + key).
+        """
+        try:
+            with transaction.atomic():
+                return IdempotencyKeyRepository.create(
+                    user_id=user_id,
+                    key=key,
+                    request_fingerprint=fingerprint,
+                    expires_at=timezone.now()
+                    + timedelta(seconds=settings.FINANCE_IDEMPOTENCY_TTL),
+                )
+        except IntegrityError:
+            return None
+
+    @staticmethod
+    def complete(record: IdempotencyKey, status_code: int, body) -> IdempotencyKey:
+        return IdempotencyKeyRepository.save_response(record, status_code, body)
+
+    @staticmethod
+    def purge_expired(batch_size: int = 1000) -> int:
+        deleted_total = 0
+        now = timezone.now()
+        while True:
+            batch = list(
+                IdempotencyKeyRepository.expired(now).values_list("pk", flat=True)[:batch_size]
+            )
+            if not batch:
+                return deleted_total
+            deleted, _ = IdempotencyKey.objects.filter(pk__in=batch).delete()
+            deleted_total += deleted
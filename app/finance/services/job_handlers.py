@@ -0,0 +1,182 @@
+import csv
+import json
+import tempfile
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from app.finance.models import Job, Wallet
+from app.finance.repositories import (
+    TransactionArchiveRepository,
+    TransactionRepository,
+    WalletRepository,
+)
+from app.finance.services.category_service import CategoryService
+from app.finance.services.category_snapshot_service import CategorySnapshotService
+from app.finance.services.realtime_service import RealtimeService
+from app.finance.services.recurring_pattern_service import RecurringPatternService
+from app.finance.services.transaction_archive_service import TransactionArchiveService
+from app.finance.services.transaction_import_service import TransactionImportService
+from app.finance.services.wallet_access_service import WalletAccessService
+from app.finance.services.wallet_service import WalletService
+
+
+class JobHandlers:
+    """
+    Xử lý cho từng loại job (tên hàm trùng `JobKind`). Mỗi hàm nhận job và hàm
+    báo tiến độ `progress(done, total, message)`, trả về kết quả dạng JSON.
+    """
+
+    EXPORT_COLUMNS = (
+        "id",
+        "occurred_at",
+        "transaction_type",
+        "amount",
+        "category_id",
+        "category_path",
+        "note",
+        "metadata",
+    )
+    EXPORT_CHUNK_SIZE = 2000
+
+    @staticmethod
+    def _wallet(job: Job) -> Wallet:
+        return WalletRepository.get_by_id(job.wallet_id)
+
+    @staticmethod
+    def export_transactions(job: Job, progress) -> dict:
+        wallet = JobHandlers._wallet(job)
+        WalletAccessService.check_access(job.user, wallet.id)
+        start = parse_date(job.payload.get("start") or "")
+        end = parse_date(job.payload.get("end") or "")
+        lower = timezone.make_aware(datetime.combine(start, time.min)) if start else None
+
+        querysets = []
+        if TransactionArchiveService.reaches_archive([wallet.id], lower):
+            querysets.append(TransactionArchiveRepository.for_wallets([wallet.id]))
+        querysets.append(TransactionRepository.for_wallet(wallet))
+        for index, queryset in enumerate(querysets):
+            if lower:
+                queryset = queryset.filter(occurred_at__gte=lower)
+            if end:
+                upper = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min))
+                queryset = queryset.filter(occurred_at__lt=upper)
+            querysets[index] = queryset.order_by("occurred_at", "id")
+
+        total = sum(queryset.count() for queryset in querysets)
+        progress(0, total, "Đang xuất giao dịch")
+        written = 0
+        with tempfile.TemporaryFile("w+", encoding="utf-8-sig", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(JobHandlers.EXPORT_COLUMNS)
+            for queryset in querysets:
+                rows = queryset.values_list(*JobHandlers.EXPORT_COLUMNS).iterator(
+                    chunk_size=JobHandlers.EXPORT_CHUNK_SIZE
+                )
+                for row in rows:
+                    *values, metadata = row
+                    writer.writerow([*values, json.dumps(metadata, ensure_ascii=False)])
+                    written += 1
+                    if written % JobHandlers.EXPORT_CHUNK_SIZE == 0:
+                        progress(written, total, "Đang xuất giao dịch")
+            handle.seek(0)
+            job.result_file.save(
+                f"transactions-{wallet.id}-{job.pk}.csv", File(handle), save=False
+            )
+        return {"rows": written}
+
+    @staticmethod
+    def import_transactions(job: Job, progress) -> dict:
+        from app.finance.serializers import TransactionImportSerializer
+
+        serializer = TransactionImportSerializer(data=job.payload)
+        if not serializer.is_valid():
+            raise ValidationError(serializer.errors)
+        data = serializer.validated_data
+        progress(0, len(data["rows"]), "Đang import")
+        result = TransactionImportService.import_rows(
+            job.user, data["wallet"], data["rows"], data["on_duplicate"]
+        )
+        progress(len(data["rows"]), len(data["rows"]), "Đã import")
+        return {
+            "created": [
+                {"row": item["row"], "transaction": item["transaction"].pk}
+                for item in result["created"]
+            ],
+            "duplicates": result["duplicates"],
+        }
+
+    @staticmethod
+    def reconcile_wallet(job: Job, progress) -> dict:
+        """
+        So `current_balance` với số dư tính lại từ toàn bộ giao dịch; với
+        `fix=true` thì sửa số dư. Dòng ví được khoá trong lúc tính để giao dịch
+        ghi đồng thời cộng vào sau khi đã sửa.
+        """
+        fix = bool(job.payload.get("fix"))
+        if fix:
+            WalletAccessService.check_owner_access(job.user, job.wallet_id)
+        else:
+            WalletAccessService.check_access(job.user, job.wallet_id)
+        with transaction.atomic():
+            wallet = WalletRepository.by_ids([job.wallet_id]).select_for_update().get()
+            expected = WalletService.reconstruct_balance(wallet)
+            difference = expected - Decimal(wallet.current_balance)
+            if fix and difference:
+                WalletRepository.apply_balance_delta(wallet.id, difference)
+                RealtimeService.notify([wallet.id])
+        return {
+            "current_balance": str(wallet.current_balance),
+            "expected_balance": str(expected),
+            "difference": str(difference),
+            "fixed": fix and bool(difference),
+        }
+
+    @staticmethod
+    def rebuild_rollups(job: Job, progress) -> dict:
+        """Dựng lại dữ liệu suy ra từ giao dịch: bản chụp category và mẫu định kỳ."""
+        wallet = JobHandlers._wallet(job)
+        WalletAccessService.check_write_access(job.user, wallet.id)
+        progress(0, 2, "Đang đồng bộ bản chụp category")
+        snapshots = CategorySnapshotService.refresh_wallets([wallet.id])
+        progress(1, 2, "Đang dò giao dịch định kỳ")
+        patterns = RecurringPatternService.detect(wallet, full=True)
+        return {"category_snapshots": snapshots, "recurring_patterns": patterns}
+
+    @staticmethod
+    def detect_recurring_patterns(job: Job, progress) -> dict:
+        """Quét tăng dần khi mẫu của ví đã cũ; job do request đọc xếp."""
+        wallet = JobHandlers._wallet(job)
+        if not RecurringPatternService.is_stale(wallet):
+            return {"recurring_patterns": 0}
+        progress(0, 1, "Đang dò giao dịch định kỳ")
+        return {"recurring_patterns": RecurringPatternService.detect(wallet)}
+
+    @staticmethod
+    def refresh_category_snapshots(job: Job, progress) -> dict:
+        """Đồng bộ bản chụp sau khi category đổi tên/di chuyển; job do hệ thống xếp."""
+        category_ids = job.payload.get("category_ids", [])
+        progress(0, 1, "Đang đồng bộ bản chụp category")
+        return {"updated": CategorySnapshotService.refresh(category_ids)}
+
+    @staticmethod
+    def bootstrap_wallet(job: Job, progress) -> dict:
+        wallet = JobHandlers._wallet(job)
+        if wallet.owner_id != job.user_id:
+            raise ValidationError("Chỉ chủ ví được sao chép master categories.")
+        with transaction.atomic():
+            CategoryService.bootstrap_from_master(wallet)
+        return {"categories": CategoryService.list_categories(wallet).count()}
+
+    @staticmethod
+    def delete_wallet(job: Job, progress) -> dict:
+        """
+        Xoá dữ liệu của ví đã được đánh dấu xoá; quyền chủ ví đã kiểm tra khi tạo
+        job (thành viên của ví bị gỡ ngay lúc đó).
+        """
+        return WalletService.purge_wallet(job.wallet_id, progress)
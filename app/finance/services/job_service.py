@@ -0,0 +1,169 @@
+import traceback
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist, PermissionDenied, ValidationError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from app.finance.models import Job, JobStatus, Wallet
+from app.finance.repositories import JobRepository
+
+
+class JobLeaseLost(RuntimeError):
+    """Job đã bị worker khác lấy lại (hết lease); worker hiện tại phải dừng."""
+
+
+class JobService:
+    """
+    Hàng đợi tác vụ nền trên bảng `Job`, không cần broker. Worker lấy job bằng
+    `select_for_update(skip_locked=True)` nên nhiều tiến trình chạy song song
+    không tranh nhau cùng một dòng; việc chuyển trạng thái dùng compare-and-set
+    để vẫn đúng trên database không hỗ trợ khoá dòng (SQLite).
+    """
+
+    # Lỗi nghiệp vụ: thử lại cũng không khác nên đánh dấu thất bại ngay.
+    PERMANENT_ERRORS = (ValidationError, PermissionDenied, ObjectDoesNotExist, ValueError)
+
+    @staticmethod
+    def enqueue(kind: str, user, wallet: Wallet | None = None, payload: dict | None = None) -> Job:
+        return JobRepository.create(
+            kind=kind,
+            user_id=user.id,
+            wallet=wallet,
+            payload=payload or {},
+            max_attempts=settings.FINANCE_JOB_MAX_ATTEMPTS,
+        )
+
+    @staticmethod
+    def list_jobs(user):
+        return JobRepository.for_user(user)
+
+    @staticmethod
+    def claim(worker_id: str) -> Job | None:
+        now = timezone.now()
+        lease_expired = now - timedelta(seconds=settings.FINANCE_JOB_LEASE_SECONDS)
+        # SQLite không có khoá dòng; mở transaction ở đó chỉ khiến các worker
+        # tranh nhau nâng khoá ghi, nên chỉ dựa vào compare-and-set bên dưới.
+        locking = connection.features.has_select_for_update
+        with transaction.atomic() if locking else nullcontext():
+            job = (
+                JobRepository.claimable(now, lease_expired)
+                .select_for_update(skip_locked=True)
+                .first()
+            )
+            if job is None:
+                return None
+            claimed = JobRepository.update_if(
+                job.pk,
+                {"status": job.status, "attempts": job.attempts},
+                status=JobStatus.RUNNING,
+                locked_by=worker_id,
+                heartbeat_at=now,
+                started_at=job.started_at or now,
+                attempts=job.attempts + 1,
+            )
+        if not claimed:
+            return None
+        job.refresh_from_db()
+        return job
+
+    @staticmethod
+    def cancel_for_wallet(wallet_id: int) -> int:
+        """Huỷ các job đang chờ của ví (ví đang bị xoá)."""
+        return JobRepository.pending_for_wallet(wallet_id).update(
+            status=JobStatus.CANCELLED, finished_at=timezone.now(), message="Ví đã bị xoá."
+        )
+
+    @staticmethod
+    def fence(job: Job) -> dict:
+        """
+        Điều kiện để lần chạy hiện tại còn giữ job: vẫn RUNNING, cùng worker và
+        cùng lượt thử. Mọi lần ghi trạng thái của worker đều so khớp điều kiện
+        này, nên worker đã mất lease không ghi đè kết quả của lần chạy sau.
+        """
+        return {"status": JobStatus.RUNNING, "locked_by": job.locked_by, "attempts": job.attempts}
+
+    @staticmethod
+    def heartbeat(job: Job) -> bool:
+        """Gia hạn lease; trả về False nếu job không còn thuộc lần chạy này."""
+        job.heartbeat_at = timezone.now()
+        return JobRepository.update_if(
+            job.pk, JobService.fence(job), heartbeat_at=job.heartbeat_at
+        )
+
+    @staticmethod
+    def report_progress(job: Job, done: int, total: int | None = None, message: str = "") -> None:
+        job.progress_done = done
+        if total is not None:
+            job.progress_total = total
+        job.message = message[:255]
+        job.heartbeat_at = timezone.now()
+        if not JobRepository.update_if(
+            job.pk,
+            JobService.fence(job),
+            progress_done=job.progress_done,
+            progress_total=job.progress_total,
+            message=job.message,
+            heartbeat_at=job.heartbeat_at,
+        ):
+            raise JobLeaseLost(f"Job {job.pk} đã bị worker khác lấy lại.")
+
+    @staticmethod
+    def complete(job: Job, result: dict | None) -> bool:
+        job.status = JobStatus.SUCCEEDED
+        job.result = result
+        job.error = ""
+        job.progress_done = max(job.progress_done, job.progress_total)
+        job.finished_at = timezone.now()
+        completed = JobRepository.update_if(
+            job.pk,
+            JobService.fence(job),
+            status=job.status,
+            result=job.result,
+            result_file=job.result_file.name or "",
+            error=job.error,
+            progress_done=job.progress_done,
+            finished_at=job.finished_at,
+        )
+        if not completed and job.result_file:
+            job.result_file.delete(save=False)
+        return completed
+
+    @staticmethod
+    def fail(job: Job, exc: BaseException) -> bool:
+        """Đánh dấu thất bại, hoặc lùi lịch thử lại (backoff luỹ thừa) với lỗi tạm thời."""
+        fence = JobService.fence(job)
+        job.error = "".join(traceback.format_exception(exc))[-10000:]
+        now = timezone.now()
+        if job.attempts < job.max_attempts and not isinstance(exc, JobService.PERMANENT_ERRORS):
+            job.status = JobStatus.PENDING
+            job.run_after = now + timedelta(
+                seconds=settings.FINANCE_JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+            )
+            job.locked_by = ""
+        else:
+            job.status = JobStatus.FAILED
+            job.finished_at = now
+        return JobRepository.update_if(
+            job.pk,
+            fence,
+            status=job.status,
+            error=job.error,
+            run_after=job.run_after,
+            locked_by=job.locked_by,
+            finished_at=job.finished_at,
+        )
+
+    @staticmethod
+    def cancel(job: Job) -> Job:
+        if not JobRepository.update_if(
+            job.pk,
+            {"status": JobStatus.PENDING},
+            status=JobStatus.CANCELLED,
+            finished_at=timezone.now(),
+        ):
+            raise ValueError("Chỉ huỷ được job đang chờ.")
+        job.refresh_from_db()
+        return job
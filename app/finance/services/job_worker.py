@@ -0,0 +1,96 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection
+
+from app.finance.models import Job
+from app.finance.services.job_handlers import JobHandlers
+from app.finance.services.job_service import JobLeaseLost, JobService
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """Vòng lặp của một tiến trình worker: lấy job, chạy handler, ghi kết quả."""
+
+    @staticmethod
+    def run(job: Job) -> None:
+        if job.attempts > job.max_attempts:
+            JobService.fail(job, RuntimeError("Worker dừng giữa chừng quá số lần thử."))
+            return
+        handler = getattr(JobHandlers, job.kind)
+        stop = threading.Event()
+        beat = threading.Thread(
+            target=JobWorker._keep_alive,
+            args=(job, stop),
+            name=f"finance-job-{job.pk}-heartbeat",
+            daemon=True,
+        )
+        beat.start()
+        try:
+            result = handler(
+                job,
+                lambda done, total=None, message="": JobService.report_progress(
+                    job, done, total, message
+                ),
+            )
+        except JobLeaseLost:
+            logger.warning("Job %s đã bị worker khác lấy lại, bỏ kết quả", job.pk)
+        except Exception as exc:
+            logger.exception("Job %s thất bại", job.pk)
+            JobService.fail(job, exc)
+        else:
+            if not JobService.complete(job, result):
+                logger.warning("Job %s đã bị worker khác lấy lại, bỏ kết quả", job.pk)
+        finally:
+            stop.set()
+            beat.join()
+
+    @staticmethod
+    def _keep_alive(job: Job, stop: threading.Event) -> None:
+        """
+        Gia hạn lease định kỳ (1/3 `FINANCE_JOB_LEASE_SECONDS`) khi handler
+        đang chạy một bước dài không báo tiến độ, để job không bị chạy lại.
+        """
+        interval = settings.FINANCE_JOB_LEASE_SECONDS / 3
+        try:
+            while not stop.wait(interval):
+                try:
+                    if not JobService.heartbeat(job):
+                        break
+                except DatabaseError:
+                    logger.warning("Không gia hạn được lease job %s", job.pk, exc_info=True)
+        finally:
+            connection.close()
+
+    @staticmethod
+    def work(
+        worker_id: str,
+        *,
+        poll_interval: float = 1.0,
+        max_jobs: int | None = None,
+        burst: bool = False,
+    ) -> int:
+        """
+        Chạy job cho tới khi đủ `max_jobs`; với `burst` thì dừng khi hàng đợi
+        trống thay vì chờ `poll_interval` giây rồi hỏi lại.
+        """
+        processed = 0
+        while max_jobs is None or processed < max_jobs:
+            close_old_connections()
+            try:
+                job = JobService.claim(worker_id)
+            except DatabaseError:
+                logger.warning("Không lấy được job, thử lại sau", exc_info=True)
+                time.sleep(poll_interval)
+                continue
+            if job is None:
+                if burst:
+                    break
+                time.sleep(poll_interval)
+                continue
+            JobWorker.run(job)
+            processed += 1
+        return processed
@@ -0,0 +1,157 @@
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Model
+
+from app.finance.models import OutboxConsumer, OutboxEvent, Wallet
+from app.finance.repositories import OutboxRepository
+from app.finance.services.wallet_access_service import WalletAccessService
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxService:
+    """
+    Ghi và đọc nhật ký thay đổi (transactional outbox). Service ghi dữ liệu gọi
+    `record`/`record_many` bên trong transaction của chính thay đổi đó, nên sự
+    kiện tồn tại khi và chỉ khi thay đổi đã commit. Bên đọc tail theo offset
+    (`position`) qua long-poll hoặc consumer có lưu offset. Offset được gán
+    ngay sau khi transaction ghi sự kiện commit (dưới khoá advisory), và
+    `run_finance_worker` quét lại định kỳ (`sequence_until`) phòng khi tiến
+    trình chết giữa commit và bước gán; bên đọc chỉ đọc.
+    """
+
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    RESTORED = "restored"
+    MERGED = "merged"
+    # Khoá advisory của PostgreSQL cho bước gán offset.
+    SEQUENCE_LOCK = 7_305_478_811
+    SEQUENCE_BATCH = 1000
+
+    @staticmethod
+    def serialize(instance: Model) -> dict:
+        data = {
+            field.attname: getattr(instance, field.attname)
+            for field in instance._meta.concrete_fields
+        }
+        return json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+
+    @staticmethod
+    def build(instance: Model, action: str, payload: dict | None = None) -> OutboxEvent:
+        aggregate_type = instance._meta.model_name
+        return OutboxEvent(
+            wallet_id=instance.pk if isinstance(instance, Wallet) else instance.wallet_id,
+            aggregate_type=aggregate_type,
+            aggregate_id=instance.pk,
+            event_type=f"{aggregate_type}.{action}",
+            payload=OutboxService.serialize(instance) if payload is None else payload,
+        )
+
+    @staticmethod
+    def record(instance: Model, action: str, payload: dict | None = None) -> None:
+        OutboxService.record_many([OutboxService.build(instance, action, payload)])
+
+    @staticmethod
+    def record_many(events: list[OutboxEvent]) -> None:
+        if not events:
+            return
+        if not transaction.get_connection().in_atomic_block:
+            raise RuntimeError("Sự kiện outbox phải được ghi trong transaction của thay đổi.")
+        OutboxRepository.create_many(events)
+        transaction.on_commit(OutboxService.sequence, robust=True)
+
+    @staticmethod
+    def sequence() -> int:
+        """Gán offset cho các sự kiện đã commit nhưng chưa có offset, theo thứ tự `id`."""
+        assigned = 0
+        while True:
+            with transaction.atomic():
+                if connection.vendor == "postgresql":
+                    with connection.cursor() as cursor:
+                        cursor.execute(
+                            "SELECT pg_advisory_xact_lock(%s)", [OutboxService.SEQUENCE_LOCK]
+                        )
+                ids = OutboxRepository.pending_ids(OutboxService.SEQUENCE_BATCH)
+                if ids:
+                    OutboxRepository.assign_positions(ids, OutboxRepository.head())
+            assigned += len(ids)
+            if len(ids) < OutboxService.SEQUENCE_BATCH:
+                return assigned
+
+    @staticmethod
+    def sequence_until(stop: threading.Event, interval: float) -> None:
+        """
+        Gán offset mỗi `interval` giây cho tới khi `stop` được bật (luồng của
+        worker); chạy thêm một lượt sau khi dừng cho sự kiện của job cuối.
+        """
+        try:
+            while True:
+                stopping = stop.is_set()
+                try:
+                    OutboxService.sequence()
+                except DatabaseError:
+                    logger.warning("Không gán được offset outbox, thử lại sau", exc_info=True)
+                if stopping:
+                    return
+                stop.wait(interval)
+        finally:
+            connection.close()
+
+    @staticmethod
+    def visible_wallet_ids(user):
+        """None = mọi ví (tài khoản staff dùng cho tích hợp nội bộ)."""
+        if user.is_staff:
+            return None
+        return WalletAccessService.accessible_wallet_ids(user)
+
+    @staticmethod
+    def read(user, after: int, limit: int, wallet_id: int | None = None) -> list[OutboxEvent]:
+        wallet_ids = OutboxService.visible_wallet_ids(user)
+        if wallet_id is not None:
+            if wallet_ids is not None and wallet_id not in wallet_ids:
+                return []
+            wallet_ids = [wallet_id]
+        return list(OutboxRepository.after(after, wallet_ids)[:limit])
+
+    @staticmethod
+    def wait(
+        user, after: int, limit: int, wallet_id: int | None = None, timeout: float = 0
+    ) -> list[OutboxEvent]:
+        """Long-poll: chờ tối đa `timeout` giây cho tới khi có sự kiện mới."""
+        deadline = time.monotonic() + timeout
+        while True:
+            events = OutboxService.read(user, after, limit, wallet_id)
+            if events or time.monotonic() >= deadline:
+                return events
+            time.sleep(settings.FINANCE_OUTBOX_POLL_INTERVAL)
+
+    @staticmethod
+    def consumer(user, name: str) -> OutboxConsumer:
+        return OutboxRepository.consumer(user, name)
+
+    @staticmethod
+    def ack(consumer: OutboxConsumer, position: int) -> OutboxConsumer:
+        if position > OutboxRepository.head():
+            raise ValueError("Offset vượt quá sự kiện mới nhất.")
+        OutboxRepository.advance_consumer(consumer, position)
+        consumer.refresh_from_db()
+        return consumer
+
+    @staticmethod
+    def purge(created_before: datetime) -> int:
+        """
+        Xoá sự kiện cũ hơn `created_before` mà mọi consumer đã xử lý; khi chưa
+        có consumer nào thì chỉ xét theo thời gian.
+        """
+        lowest = OutboxRepository.lowest_consumer_position()
+        if lowest is None:
+            lowest = OutboxRepository.head()
+        return OutboxRepository.delete_before(lowest, created_before)
@@ -0,0 +1,412 @@
+import re
+from datetime import date
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from app.finance.models import Transaction
+
+
+class TransactionPartitionService:
+    """
+    Quản lý partition theo khoảng `occurred_at` (tháng hoặc năm) cho bảng giao
+    dịch trên PostgreSQL. Partition được đặt tên `<bảng>_pYYYY` hoặc
+    `<bảng>_pYYYY_MM`; dòng nằm ngoài mọi khoảng rơi vào `<bảng>_default`.
+    """
+
+    MONTH = "month"
+    YEAR = "year"
+    INTERVALS = (MONTH, YEAR)
+    NAME_PATTERN = re.compile(r"_p(?P<year>\d{4})(?:_(?P<month>\d{2}))?$")
+
+    @staticmethod
+    def table_name() -> str:
+        return Transaction._meta.db_table
+
+    @staticmethod
+    def is_supported() -> bool:
+        return connection.vendor == "postgresql"
+
+    @staticmethod
+    def is_partitioned() -> bool:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT 1 FROM pg_partitioned_table pt
+                JOIN pg_class c ON c.oid = pt.partrelid
+                WHERE c.relname = %s AND c.relnamespace = to_regnamespace(current_schema())
+                """,
+                [TransactionPartitionService.table_name()],
+            )
+            return cursor.fetchone() is not None
+
+    @staticmethod
+    def period_start(value: date, interval: str) -> date:
+        if interval == TransactionPartitionService.YEAR:
+            return date(value.year, 1, 1)
+        return date(value.year, value.month, 1)
+
+    @staticmethod
+    def next_period(start: date, interval: str) -> date:
+        if interval == TransactionPartitionService.YEAR:
+            return date(start.year + 1, 1, 1)
+        return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+
+    @staticmethod
+    def partition_name(start: date, interval: str) -> str:
+        suffix = f"{start:%Y}" if interval == TransactionPartitionService.YEAR else f"{start:%Y_%m}"
+        return f"{TransactionPartitionService.table_name()}_p{suffix}"
+
+    @staticmethod
+    def existing_partitions() -> list[tuple[str, date, date, str]]:
+        """
+        Trả về (tên, ngày bắt đầu, ngày kết thúc, interval) của các partition
+        theo quy ước đặt tên, sắp xếp theo thời gian.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT child.relname FROM pg_inherits i
+                JOIN pg_class parent ON parent.oid = i.inhparent
+                JOIN pg_class child ON child.oid = i.inhrelid
+                WHERE parent.relname = %s
+                  AND parent.relnamespace = to_regnamespace(current_schema())
+                """,
+                [TransactionPartitionService.table_name()],
+            )
+            names = [row[0] for row in cursor.fetchall()]
+
+        partitions = []
+        for name in names:
+            match = TransactionPartitionService.NAME_PATTERN.search(name)
+            if not match:
+                continue
+            interval = (
+                TransactionPartitionService.MONTH
+                if match["month"]
+                else TransactionPartitionService.YEAR
+            )
+            start = date(int(match["year"]), int(match["month"] or 1), 1)
+            end = TransactionPartitionService.next_period(start, interval)
+            partitions.append((name, start, end, interval))
+        return sorted(partitions, key=lambda partition: partition[1])
+
+    @staticmethod
+    def detect_interval(default: str) -> str:
+        partitions = TransactionPartitionService.existing_partitions()
+        return partitions[-1][3] if partitions else default
+
+    @staticmethod
+    def default_partition_name() -> str:
+        return f"{TransactionPartitionService.table_name()}_default"
+
+    @staticmethod
+    def create_partition(start: date, interval: str, parent: str | None = None) -> str:
+        """
+        Tạo partition cho kỳ bắt đầu từ `start`. Nếu partition DEFAULT đang
+        giữ dòng thuộc kỳ này (PostgreSQL sẽ từ chối `PARTITION OF`), các dòng
+        đó được chuyển sang bảng mới rồi bảng được gắn vào làm partition.
+        """
+        quote = connection.ops.quote_name
+        parent = parent or TransactionPartitionService.table_name()
+        name = TransactionPartitionService.partition_name(start, interval)
+        default = TransactionPartitionService.default_partition_name()
+        end = TransactionPartitionService.next_period(start, interval)
+        bounds = [f"{start.isoformat()} 00:00:00+00", f"{end.isoformat()} 00:00:00+00"]
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s), to_regclass(%s)", [name, default])
+            existing, has_default = cursor.fetchone()
+            if existing:
+                return name
+            if has_default:
+                cursor.execute(
+                    f"SELECT EXISTS (SELECT 1 FROM {quote(default)} "
+                    f"WHERE occurred_at >= %s AND occurred_at < %s)",
+                    bounds,
+                )
+                has_default = cursor.fetchone()[0]
+            if not has_default:
+                cursor.execute(
+                    f"CREATE TABLE {quote(name)} PARTITION OF {quote(parent)} "
+                    f"FOR VALUES FROM (%s) TO (%s)",
+                    bounds,
+                )
+                return name
+            cursor.execute(
+                f"CREATE TABLE {quote(name)} (LIKE {quote(parent)} "
+                f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE)"
+            )
+            cursor.execute(
+                f"WITH moved AS (DELETE FROM {quote(default)} "
+                f"WHERE occurred_at >= %s AND occurred_at < %s RETURNING *) "
+                f"INSERT INTO {quote(name)} SELECT * FROM moved",
+                bounds,
+            )
+            cursor.execute(
+                f"ALTER TABLE {quote(parent)} ATTACH PARTITION {quote(name)} "
+                f"FOR VALUES FROM (%s) TO (%s)",
+                bounds,
+            )
+        return name
+
+    @staticmethod
+    def create_default_partition(parent: str | None = None) -> str:
+        quote = connection.ops.quote_name
+        parent = parent or TransactionPartitionService.table_name()
+        name = TransactionPartitionService.default_partition_name()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {quote(name)} PARTITION OF {quote(parent)} DEFAULT"
+            )
+        return name
+
+    @staticmethod
+    def ensure_partitions(
+        interval: str,
+        ahead: int,
+        start_from: date | None = None,
+        parent: str | None = None,
+    ) -> list[str]:
+        """
+        Tạo partition từ kỳ chứa `start_from` (mặc định hôm nay) tới `ahead`
+        kỳ sau đó; partition đã có được giữ nguyên, dòng của kỳ mới đang nằm
+        trong partition DEFAULT được chuyển sang partition của kỳ đó.
+        """
+        start = TransactionPartitionService.period_start(
+            start_from or timezone.now().date(), interval
+        )
+        last = TransactionPartitionService.period_start(timezone.now().date(), interval)
+        for _ in range(ahead):
+            last = TransactionPartitionService.next_period(last, interval)
+
+        names = []
+        with transaction.atomic():
+            while start <= last:
+                names.append(TransactionPartitionService.create_partition(start, interval, parent))
+                start = TransactionPartitionService.next_period(start, interval)
+        return names
+
+    @staticmethod
+    def convert(interval: str, ahead: int, batch_size: int | None = None) -> list[str]:
+        """
+        Chuyển bảng giao dịch thường thành bảng partition theo `occurred_at`
+        mà không khoá bảng trong lúc chép dữ liệu.
+
+        Bảng partition được dựng song song dưới tên `<bảng>_partitioned`; một
+        trigger trên bảng cũ đồng bộ mọi INSERT/UPDATE/DELETE sang bảng mới,
+        còn dữ liệu có sẵn được chép theo lô `batch_size` dòng (theo id), mỗi
+        lô một transaction. Khoá ACCESS EXCLUSIVE chỉ được giữ ở bước cuối để
+        xoá bảng cũ và đổi tên bảng mới.
+
+        Khoá chính trở thành (id, occurred_at) vì PostgreSQL yêu cầu ràng buộc
+        unique trên bảng partition phải chứa cột partition.
+        """
+        batch_size = batch_size or settings.FINANCE_PARTITION_COPY_BATCH_SIZE
+        table = TransactionPartitionService.table_name()
+        staging = f"{table}_partitioned"
+        TransactionPartitionService._drop_staging(table, staging)
+
+        with transaction.atomic():
+            layout = TransactionPartitionService._create_staging(table, staging)
+            names = TransactionPartitionService.ensure_partitions(
+                interval, ahead, layout["oldest"], parent=staging
+            )
+            names.append(TransactionPartitionService.create_default_partition(staging))
+            TransactionPartitionService._install_sync_trigger(table, staging, layout)
+
+        TransactionPartitionService._copy_rows(table, staging, layout, batch_size)
+        TransactionPartitionService._swap(table, staging, layout)
+        return names
+
+    @staticmethod
+    def _sync_trigger_names(staging: str) -> tuple[str, str]:
+        return f"{staging}_sync", f"{staging}_sync_fn"
+
+    @staticmethod
+    def _drop_staging(table: str, staging: str) -> None:
+        """Dọn bảng tạm và trigger còn sót lại từ lần chuyển đổi bị gián đoạn."""
+        quote = connection.ops.quote_name
+        trigger, function = TransactionPartitionService._sync_trigger_names(staging)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {quote(trigger)} ON {quote(table)}")
+            cursor.execute(f"DROP FUNCTION IF EXISTS {quote(function)}()")
+            cursor.execute(f"DROP TABLE IF EXISTS {quote(staging)} CASCADE")
+
+    @staticmethod
+    def _create_staging(table: str, staging: str) -> dict:
+        """Dựng bảng partition rỗng cùng khoá chính, index và khoá ngoại."""
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT indexname, indexdef FROM pg_indexes
+                WHERE schemaname = current_schema() AND tablename = %s
+                  AND indexname <> %s
+                """,
+                [table, f"{table}_pkey"],
+            )
+            index_definitions = cursor.fetchall()
+            cursor.execute(
+                """
+                SELECT attidentity FROM pg_attribute
+                WHERE attrelid = to_regclass(%s) AND attname = 'id'
+                """,
+                [table],
+            )
+            is_identity = bool(cursor.fetchone()[0])
+            cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [table])
+            sequence = cursor.fetchone()[0]
+            cursor.execute("SELECT min(occurred_at) FROM " + quote(table))
+            oldest = cursor.fetchone()[0]
+
+            cursor.execute(
+                f"CREATE TABLE {quote(staging)} (LIKE {quote(table)} "
+                f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE "
+                f"{'INCLUDING IDENTITY' if is_identity else ''}) "
+                f"PARTITION BY RANGE (occurred_at)"
+            )
+            cursor.execute(
+                f"ALTER TABLE {quote(staging)} ADD CONSTRAINT {quote(staging + '_pkey')} "
+                f"PRIMARY KEY (id, occurred_at)"
+            )
+            indexes = []
+            for index_name, definition in index_definitions:
+                staging_index = f"{index_name[:50]}_staging"
+                cursor.execute(
+                    re.sub(
+                        r"^(CREATE (?:UNIQUE )?INDEX) \S+ ON (ONLY )?(\S+\.)?"
+                        + re.escape(table)
+                        + " ",
+                        lambda match: f"{match[1]} {quote(staging_index)} ON {quote(staging)} ",
+                        definition,
+                    )
+                )
+                indexes.append((staging_index, index_name))
+            for column, target in (
+                ("wallet_id", "finance_wallet"),
+                ("category_id", "finance_category"),
+            ):
+                cursor.execute(
+                    f"ALTER TABLE {quote(staging)} ADD CONSTRAINT "
+                    f"{quote(f'{table}_{column}_fk')} FOREIGN KEY ({column}) "
+                    f"REFERENCES {quote(target)} (id) DEFERRABLE INITIALLY DEFERRED"
+                )
+        return {
+            "indexes": indexes,
+            "is_identity": is_identity,
+            "sequence": sequence,
+            "oldest": oldest.date() if oldest else None,
+        }
+
+    @staticmethod
+    def _install_sync_trigger(table: str, staging: str, layout: dict) -> None:
+        """
+        Trigger AFTER ROW trên bảng cũ: UPDATE/DELETE xoá bản sao theo id, INSERT/
+        UPDATE ghi lại phiên bản mới, để bảng mới luôn theo kịp khi đang chép.
+        """
+        quote = connection.ops.quote_name
+        trigger, function = TransactionPartitionService._sync_trigger_names(staging)
+        overriding = "OVERRIDING SYSTEM VALUE" if layout["is_identity"] else ""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                CREATE FUNCTION {quote(function)}() RETURNS trigger LANGUAGE plpgsql AS $$
+                BEGIN
+                    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                        DELETE FROM {quote(staging)} WHERE id = OLD.id;
+                    END IF;
+                    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                        INSERT INTO {quote(staging)} {overriding} SELECT (NEW).*;
+                    END IF;
+                    RETURN NULL;
+                END
+                $$
+                """
+            )
+            cursor.execute(
+                f"CREATE TRIGGER {quote(trigger)} AFTER INSERT OR UPDATE OR DELETE "
+                f"ON {quote(table)} FOR EACH ROW EXECUTE FUNCTION {quote(function)}()"
+            )
+
+    @staticmethod
+    def _copy_rows(table: str, staging: str, layout: dict, batch_size: int) -> None:
+        """
+        Chép dữ liệu có sẵn theo khoảng id, mỗi lô một transaction. `FOR SHARE`
+        chờ các UPDATE/DELETE đang dở trên cùng dòng, nên dòng trigger đã ghi
+        không bị bản cũ hơn ghi đè (`ON CONFLICT DO NOTHING`).
+        """
+        quote = connection.ops.quote_name
+        overriding = "OVERRIDING SYSTEM VALUE" if layout["is_identity"] else ""
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT min(id), max(id) FROM {quote(table)}")
+            lowest, highest = cursor.fetchone()
+        if lowest is None:
+            return
+        after = lowest - 1
+        while after < highest:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {quote(staging)} {overriding} "
+                    f"SELECT * FROM {quote(table)} WHERE id > %s AND id <= %s FOR SHARE "
+                    f"ON CONFLICT DO NOTHING",
+                    [after, after + batch_size],
+                )
+            after += batch_size
+
+    @staticmethod
+    @transaction.atomic
+    def _swap(table: str, staging: str, layout: dict) -> None:
+        """Bước duy nhất giữ khoá ACCESS EXCLUSIVE: bỏ bảng cũ, đổi tên bảng mới."""
+        quote = connection.ops.quote_name
+        trigger, function = TransactionPartitionService._sync_trigger_names(staging)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"LOCK TABLE {quote(table)}, {quote(staging)} IN ACCESS EXCLUSIVE MODE"
+            )
+            cursor.execute(f"DROP TRIGGER {quote(trigger)} ON {quote(table)}")
+            cursor.execute(f"DROP FUNCTION {quote(function)}()")
+            if not layout["is_identity"] and layout["sequence"]:
+                cursor.execute(f"ALTER SEQUENCE {layout['sequence']} OWNED BY {quote(staging)}.id")
+            cursor.execute(f"DROP TABLE {quote(table)}")
+            cursor.execute(f"ALTER TABLE {quote(staging)} RENAME TO {quote(table)}")
+            cursor.execute(
+                f"ALTER TABLE {quote(table)} RENAME CONSTRAINT "
+                f"{quote(staging + '_pkey')} TO {quote(table + '_pkey')}"
+            )
+            for staging_index, index_name in layout["indexes"]:
+                cursor.execute(f"ALTER INDEX {quote(staging_index)} RENAME TO {quote(index_name)}")
+            if layout["is_identity"]:
+                cursor.execute(
+                    f"SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+                    f"COALESCE((SELECT max(id) FROM {quote(table)}), 0) + 1, false)",
+                    [table],
+                )
+
+    @staticmethod
+    @transaction.atomic
+    def detach_before(
+        cutoff: date, archive_schema: str | None = None, drop: bool = False
+    ) -> list[str]:
+        """
+        Tách các partition kết thúc trước `cutoff` khỏi bảng giao dịch, sau đó
+        chuyển sang schema lưu trữ hoặc xoá hẳn.
+        """
+        quote = connection.ops.quote_name
+        table = TransactionPartitionService.table_name()
+        detached = []
+        with connection.cursor() as cursor:
+            if archive_schema:
+                cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {quote(archive_schema)}")
+            for name, _, end, _ in TransactionPartitionService.existing_partitions():
+                if end > cutoff:
+                    continue
+                cursor.execute(f"ALTER TABLE {quote(table)} DETACH PARTITION {quote(name)}")
+                if drop:
+                    cursor.execute(f"DROP TABLE {quote(name)}")
+                elif archive_schema:
+                    cursor.execute(
+                        f"ALTER TABLE {quote(name)} SET SCHEMA {quote(archive_schema)}"
+                    )
+                detached.append(name)
+        return detached
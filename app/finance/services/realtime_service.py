@@ -0,0 +1,80 @@
+import json
+import logging
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from app.finance.models import Transaction
+from app.finance.realtime import get_broker
+from app.finance.repositories import WalletMemberRepository, WalletRepository
+from app.finance.services.outbox_service import OutboxService
+
+logger = logging.getLogger(__name__)
+
+
+class RealtimeService:
+    """
+    Đẩy số dư ví và giao dịch mới tới các thành viên của ví qua SSE. Sự kiện
+    chỉ được phát sau khi transaction DB commit; khi không có ai đang nghe thì
+    không tốn thêm query nào.
+    """
+
+    BALANCE = "balance"
+    TRANSACTION = "transaction"
+    SNAPSHOT = "snapshot"
+    BALANCE_FIELDS = ("id", "current_balance", "write_version")
+
+    @staticmethod
+    def notify(wallet_ids, created: list[Transaction] = ()) -> None:
+        wallet_ids = set(wallet_ids)
+        created = list(created)
+        transaction.on_commit(lambda: RealtimeService.publish(wallet_ids, created))
+
+    @staticmethod
+    def publish(wallet_ids, created: list[Transaction] = ()) -> None:
+        broker = get_broker()
+        if not wallet_ids or not broker.active():
+            return
+        try:
+            balances = {
+                row["id"]: RealtimeService._balance(row)
+                for row in WalletRepository.by_ids(wallet_ids).values(
+                    *RealtimeService.BALANCE_FIELDS
+                )
+            }
+            recipients = WalletMemberRepository.user_ids_for_wallets(wallet_ids)
+            messages = {wallet_id: [] for wallet_id in balances}
+            for tx in created:
+                if tx.wallet_id in messages:
+                    messages[tx.wallet_id].append(
+                        {"event": RealtimeService.TRANSACTION, "data": OutboxService.serialize(tx)}
+                    )
+            for wallet_id, balance in balances.items():
+                messages[wallet_id].append({"event": RealtimeService.BALANCE, "data": balance})
+            for wallet_id, user_id in recipients:
+                for message in messages.get(wallet_id, ()):
+                    broker.publish(user_id, message)
+        except Exception:
+            # Việc đẩy sự kiện không được làm hỏng request đã commit thành công.
+            logger.exception("Không thể phát sự kiện realtime cho ví %s", sorted(wallet_ids))
+
+    @staticmethod
+    def snapshot(user_id: int) -> dict:
+        """Số dư hiện tại của mọi ví người dùng truy cập, gửi khi (kết nối lại) stream."""
+        wallet_ids = [wallet_id for wallet_id, _ in WalletMemberRepository.roles_for_user(user_id)]
+        rows = WalletRepository.by_ids(wallet_ids).order_by("id").values(
+            *RealtimeService.BALANCE_FIELDS
+        )
+        return {"wallets": [RealtimeService._balance(row) for row in rows]}
+
+    @staticmethod
+    def format_event(event: str, data: dict) -> str:
+        return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+    @staticmethod
+    def _balance(row: dict) -> dict:
+        return {
+            "wallet": row["id"],
+            "current_balance": str(row["current_balance"]),
+            "write_version": row["write_version"],
+        }
@@ -0,0 +1,172 @@
+import re
+from collections import defaultdict
+from datetime import date, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from app.finance.models import JobKind, RecurrencePeriod, RecurringPattern, Wallet
+from app.finance.repositories import (
+    JobRepository,
+    RecurringPatternRepository,
+    TransactionRepository,
+    WalletRepository,
+)
+from app.finance.services.job_service import JobService
+
+
+class RecurringPatternService:
+    """
+    Phát hiện giao dịch định kỳ từ lịch sử của ví và lưu thành
+    `RecurringPattern`. Việc quét là tăng dần: ví lưu mốc quét gần nhất, lần
+    sau chỉ phân tích lại các category có giao dịch được tạo/sửa/xoá mềm từ
+    mốc đó (giao dịch xoá mềm vẫn giữ `updated_at`). Giao dịch chuyển sang
+    category khác chỉ để lại dấu vết ở category mới, nên mẫu cũ của category
+    trước đó chỉ được dọn khi quét toàn bộ (`full=True`) hoặc tự bị bỏ qua khi
+    quá hạn. Request đọc không quét: `schedule_detect` xếp job
+    `detect_recurring_patterns` cho worker.
+    """
+
+    PERIOD_DAYS = {
+        RecurrencePeriod.WEEKLY: 7,
+        RecurrencePeriod.BIWEEKLY: 14,
+        RecurrencePeriod.MONTHLY: 30.44,
+        RecurrencePeriod.QUARTERLY: 91.31,
+        RecurrencePeriod.YEARLY: 365.25,
+    }
+    MIN_OCCURRENCES = 3
+    MIN_CONFIDENCE = 0.75
+    # Sai lệch cho phép so với độ dài chu kỳ: 15% cộng thêm một ngày.
+    TOLERANCE = 0.15
+
+    @staticmethod
+    def pattern_key(note: str | None) -> str:
+        """Ghi chú bỏ số và ký tự đặc biệt, để `Netflix 03/2025` và `NETFLIX 04/2025` cùng nhóm."""
+        return " ".join(re.sub(r"[\W\d_]+", " ", (note or "").casefold()).split())[:255]
+
+    @staticmethod
+    def tolerance_days(length: float) -> float:
+        return length * RecurringPatternService.TOLERANCE + 1
+
+    @staticmethod
+    def patterns_for(wallet: Wallet):
+        return RecurringPatternRepository.for_wallet(wallet.id)
+
+    @staticmethod
+    def is_stale(wallet: Wallet) -> bool:
+        return wallet.recurring_scanned_version != wallet.write_version
+
+    @staticmethod
+    def schedule_detect(wallet: Wallet) -> bool:
+        """
+        Xếp job quét lại khi mẫu của ví đã cũ (nếu chưa có job đang chờ/chạy);
+        trả về mẫu có đang cũ hay không.
+        """
+        if not RecurringPatternService.is_stale(wallet):
+            return False
+        if not JobRepository.active_for_wallet(
+            wallet.id, JobKind.DETECT_RECURRING_PATTERNS
+        ).exists():
+            JobService.enqueue(JobKind.DETECT_RECURRING_PATTERNS, wallet.owner, wallet)
+        return True
+
+    @staticmethod
+    def detect(wallet: Wallet, *, full: bool = False) -> int:
+        """Quét lại giao dịch định kỳ của ví; trả về số mẫu được phân tích lại."""
+        started = timezone.now()
+        version = WalletRepository.by_ids([wallet.id]).values_list("write_version", flat=True)[0]
+        since = started - timedelta(days=settings.FINANCE_RECURRING_LOOKBACK_DAYS)
+        history = TransactionRepository.for_wallet(wallet).filter(occurred_at__gte=since).order_by()
+
+        category_ids = None
+        if not full and wallet.recurring_scanned_at is not None:
+            # Đọc cả giao dịch đã xoá mềm để category vừa mất giao dịch cũng được quét lại.
+            category_ids = set(
+                TransactionRepository.changed_categories(
+                    wallet.id, since, wallet.recurring_scanned_at
+                )
+            )
+            history = history.filter(category_id__in=category_ids)
+
+        groups = defaultdict(list)
+        if category_ids is None or category_ids:
+            for category_id, transaction_type, note, amount, occurred_at in history.order_by(
+                "occurred_at"
+            ).values_list("category_id", "transaction_type", "note", "amount", "occurred_at"):
+                key = RecurringPatternService.pattern_key(note)
+                groups[(category_id, key)].append((transaction_type, note, amount, occurred_at))
+
+        patterns = []
+        for (category_id, key), rows in groups.items():
+            pattern = RecurringPatternService._detect_group(wallet.id, category_id, key, rows)
+            if pattern is not None:
+                patterns.append(pattern)
+
+        with transaction.atomic():
+            RecurringPatternRepository.delete_missing(
+                wallet.id,
+                category_ids,
+                {(pattern.category_id, pattern.key) for pattern in patterns},
+            )
+            if patterns:
+                RecurringPatternRepository.upsert(patterns)
+            WalletRepository.mark_recurring_scanned(wallet.id, started, version)
+        wallet.recurring_scanned_at = started
+        wallet.recurring_scanned_version = version
+        return len(patterns)
+
+    @staticmethod
+    def _detect_group(wallet_id: int, category_id: int, key: str, rows) -> RecurringPattern | None:
+        ordinals = [
+            occurred_at.astimezone(dt_timezone.utc).date().toordinal()
+            for *_, occurred_at in rows
+        ]
+        days = np.unique(np.array(ordinals, dtype=np.int64))
+        if days.size < RecurringPatternService.MIN_OCCURRENCES:
+            return None
+
+        intervals = np.diff(days)
+        median = float(np.median(intervals))
+        period = next(
+            (
+                period
+                for period, length in RecurringPatternService.PERIOD_DAYS.items()
+                if abs(median - length) <= RecurringPatternService.tolerance_days(length)
+            ),
+            None,
+        )
+        if period is None:
+            return None
+        length = RecurringPatternService.PERIOD_DAYS[period]
+        confidence = float(
+            np.mean(np.abs(intervals - length) <= RecurringPatternService.tolerance_days(length))
+        )
+        if confidence < RecurringPatternService.MIN_CONFIDENCE:
+            return None
+
+        dates = [date.fromordinal(int(day)) for day in days]
+        amounts = np.array([amount for _, _, amount, _ in rows], dtype=np.float64)
+        transaction_type, note, _, _ = rows[-1]
+        pattern = RecurringPattern(
+            wallet_id=wallet_id,
+            category_id=category_id,
+            key=key,
+            transaction_type=transaction_type,
+            note=note,
+            period=period,
+            day_of_month=(
+                int(np.median([value.day for value in dates]))
+                if period in RecurringPattern.MONTH_STEPS
+                else None
+            ),
+            amount=Decimal(str(np.median(amounts))).quantize(Decimal("0.01")),
+            occurrences=int(days.size),
+            confidence=round(confidence, 4),
+            last_occurred_on=dates[-1],
+            next_expected_on=dates[-1],
+        )
+        pattern.next_expected_on = pattern.advance(dates[-1])
+        return pattern
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models import DateTimeField, QuerySet, Value
+from django.utils import timezone
+
+from app.finance.models import Transaction, TransactionArchive
+from app.finance.repositories import TransactionArchiveRepository, WalletRepository
+
+
+class TransactionArchiveService:
+    """
+    Chuyển giao dịch cũ sang `TransactionArchive` để bảng chính chỉ giữ dữ liệu
+    nóng. Số dư ví không đổi vì `current_balance` được lưu sẵn; chỉ các truy vấn
+    có khoảng thời gian chạm tới vùng lưu trữ mới đọc thêm bảng archive.
+    """
+
+    COLUMNS = tuple(field.attname for field in Transaction._meta.concrete_fields)
+    # Chỉ giao dịch chưa xoá mới được lưu trữ nên bảng archive không có `deleted_at`.
+    ARCHIVE_COLUMNS = tuple(column for column in COLUMNS if column != "deleted_at")
+
+    @staticmethod
+    def cutoff(now: datetime | None = None) -> datetime:
+        return (now or timezone.now()) - timedelta(days=settings.FINANCE_ARCHIVE_AFTER_DAYS)
+
+    @staticmethod
+    def archive_before(cutoff: datetime, batch_size: int = 1000) -> int:
+        archived_total = 0
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    Transaction.objects.select_for_update(skip_locked=True)
+                    .filter(occurred_at__lt=cutoff)
+                    .order_by("pk")
+                    .values(*TransactionArchiveService.ARCHIVE_COLUMNS)[:batch_size]
+                )
+                if not batch:
+                    return archived_total
+                TransactionArchiveRepository.bulk_create(batch)
+                Transaction.objects.filter(pk__in=[row["id"] for row in batch]).delete()
+                WalletRepository.touch({row["wallet_id"] for row in batch})
+            archived_total += len(batch)
+
+    @staticmethod
+    def reaches_archive(wallet_ids, since: datetime | None) -> bool:
+        """
+        Khoảng thời gian bắt đầu từ `since` (None = không giới hạn) có chứa giao
+        dịch đã lưu trữ của các ví này hay không.
+        """
+        latest = TransactionArchiveRepository.latest_occurred_at(wallet_ids)
+        return latest is not None and (since is None or since <= latest)
+
+    @staticmethod
+    def combine(
+        queryset: QuerySet[Transaction],
+        archived: QuerySet[TransactionArchive],
+        ordering,
+    ) -> QuerySet[Transaction]:
+        """
+        Gộp giao dịch nóng và đã lưu trữ bằng UNION ALL; mọi dòng trả về đều là
+        `Transaction` (chỉ đọc với các dòng từ archive).
+        """
+        columns = TransactionArchiveService.COLUMNS
+        order_by = []
+        for term in ordering:
+            name = term.lstrip("-")
+            try:
+                attname = Transaction._meta.get_field(name).attname
+            except FieldDoesNotExist:
+                continue
+            if attname in columns:
+                order_by.append(term.replace(name, attname))
+        return (
+            queryset.select_related(None)
+            .order_by()
+            .union(
+                archived.order_by()
+                .annotate(deleted_at=Value(None, output_field=DateTimeField()))
+                .values_list(*columns),
+                all=True,
+            )
+            .order_by(*order_by)
+        )
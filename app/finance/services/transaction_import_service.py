@@ -0,0 +1,127 @@
+import math
+from collections import defaultdict
+from datetime import timedelta
+from difflib import SequenceMatcher
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from app.finance.models import BatchOperation, DuplicatePolicy, Transaction, Wallet
+from app.finance.repositories import TransactionRepository
+from app.finance.services.transaction_service import TransactionService
+from app.finance.services.wallet_access_service import WalletAccessService
+
+
+class TransactionImportService:
+    """
+    Import sao kê ngân hàng và dò giao dịch trùng. Mỗi dòng chỉ được so với
+    các giao dịch có cùng fingerprint (ví, số tiền, ngày) trong các ngày lân
+    cận, lấy bằng một query trên index cho cả lô, rồi so thời điểm và độ
+    giống của ghi chú; không so từng cặp với toàn bộ bảng.
+    """
+
+    @staticmethod
+    def normalize_note(note: str | None) -> str:
+        return " ".join((note or "").casefold().split())
+
+    @staticmethod
+    def is_similar_note(note: str, other: str) -> bool:
+        if note == other:
+            return True
+        if not note or not other:
+            return False
+        ratio = SequenceMatcher(None, note, other).ratio()
+        return ratio >= settings.FINANCE_IMPORT_NOTE_SIMILARITY
+
+    @staticmethod
+    def find_duplicates(wallet: Wallet, rows: list[dict]) -> dict[int, dict]:
+        """
+        Trả về {chỉ số dòng: {"transaction": id}} cho dòng trùng giao dịch đã có,
+        hoặc {chỉ số dòng: {"row": chỉ số dòng trước}} cho dòng trùng trong lô.
+        """
+        window = timedelta(hours=settings.FINANCE_IMPORT_DUPLICATE_WINDOW_HOURS)
+        reach = math.ceil(window / timedelta(days=1))
+        offsets = [timedelta(days=day) for day in range(-reach, reach + 1)]
+
+        row_fingerprints = []
+        for row in rows:
+            row_fingerprints.append(
+                [
+                    Transaction.build_fingerprint(
+                        wallet.id, row["amount"], row["occurred_at"] + offset
+                    )
+                    for offset in offsets
+                ]
+            )
+
+        known = defaultdict(list)
+        lookup = {fingerprint for fingerprints in row_fingerprints for fingerprint in fingerprints}
+        for tx_id, fingerprint, occurred_at, note in TransactionRepository.by_fingerprints(
+            wallet.id, lookup
+        ):
+            known[fingerprint].append(
+                ("transaction", tx_id, occurred_at, TransactionImportService.normalize_note(note))
+            )
+
+        duplicates = {}
+        for index, (row, fingerprints) in enumerate(zip(rows, row_fingerprints)):
+            note = TransactionImportService.normalize_note(row.get("note"))
+            for fingerprint in fingerprints:
+                for kind, reference, occurred_at, other_note in known.get(fingerprint, ()):
+                    if abs(occurred_at - row["occurred_at"]) <= window and (
+                        TransactionImportService.is_similar_note(note, other_note)
+                    ):
+                        duplicates[index] = {kind: reference}
+                        break
+                if index in duplicates:
+                    break
+            else:
+                known[fingerprints[reach]].append(("row", index, row["occurred_at"], note))
+        return duplicates
+
+    @staticmethod
+    @transaction.atomic
+    def import_rows(user, wallet: Wallet, rows: list[dict], on_duplicate: str) -> dict:
+        WalletAccessService.check_write_access(user, wallet.id)
+        duplicates = TransactionImportService.find_duplicates(wallet, rows)
+
+        operations = []
+        row_indexes = []
+        for index, row in enumerate(rows):
+            duplicate = duplicates.get(index)
+            if duplicate is not None and on_duplicate == DuplicatePolicy.SKIP:
+                continue
+            operation = {"op": BatchOperation.CREATE, "wallet": wallet.id, **row}
+            if duplicate is not None:
+                operation["metadata"] = {
+                    **(row.get("metadata") or {}),
+                    "possible_duplicate_of": duplicate,
+                }
+            operations.append(operation)
+            row_indexes.append(index)
+
+        try:
+            results = TransactionService.apply_batch(user, operations) if operations else []
+        except ValidationError as exc:
+            raise ValidationError(
+                {
+                    str(row_indexes[int(key)]): messages
+                    for key, messages in exc.message_dict.items()
+                }
+            )
+
+        return {
+            "created": [
+                {"row": row_index, "transaction": result["transaction"]}
+                for row_index, result in zip(row_indexes, results)
+            ],
+            "duplicates": [
+                {
+                    "row": index,
+                    **duplicate,
+                    "skipped": on_duplicate == DuplicatePolicy.SKIP,
+                }
+                for index, duplicate in sorted(duplicates.items())
+            ],
+        }
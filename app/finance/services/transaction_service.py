@@ -1,10 +1,18 @@
+from collections import defaultdict
 from decimal import Decimal
 
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import transaction
-from django.db.models import F
+from django.utils import timezone
 
-from app.finance.models import Category, Transaction, TransactionType, Wallet
-from app.finance.repositories import TransactionRepository
+from app.finance.models import BatchOperation, Category, Transaction, TransactionType, Wallet
+from app.finance.repositories import TransactionRepository, WalletRepository
+from app.finance.services.categorization_service import CategorizationService
+from app.finance.services.category_snapshot_service import CategorySnapshotService
+from app.finance.services.outbox_service import OutboxService
+from app.finance.services.realtime_service import RealtimeService
+from app.finance.services.wallet_access_service import WalletAccessService
 
 
 class TransactionService:
@@ -19,21 +27,37 @@ class TransactionService:
     @transaction.atomic
     def create_transaction(
         wallet: Wallet,
-        category: Category,
+        category: Category | None,
         *,
         transaction_type: str | None = None,
         amount: Decimal,
+        validate: bool = True,
         **data,
     ) -> Transaction:
+        """
+        `validate=False` cho caller đã validate bằng serializer (xem
+        `Transaction.save`); wallet và category truyền vào cần được tải sẵn.
+        """
+        if category is None:
+            category = CategorizationService.categorize(
+                wallet, data.get("note"), data.get("metadata")
+            )
+            if category is None:
+                raise ValidationError(
+                    {"category": "Không có quy tắc phân loại phù hợp, vui lòng chọn category."}
+                )
         tx_type = transaction_type or category.transaction_type
         tx = TransactionRepository.create(
             wallet=wallet,
             category=category,
             transaction_type=tx_type,
             amount=amount,
+            validate=validate,
             **data,
         )
         TransactionService._apply_wallet_balance(wallet, tx_type, amount)
+        OutboxService.record(tx, OutboxService.CREATED)
+        RealtimeService.notify([wallet.pk], created=[tx])
         return tx
 
     @staticmethod
@@ -43,8 +67,13 @@ class TransactionService:
         *,
         transaction_type: str | None = None,
         amount: Decimal | None = None,
+        validate: bool = True,
         **data,
     ) -> Transaction:
+        """
+        `validate=False` ghi đường nhanh: chỉ UPDATE các cột đổi, không
+        `full_clean`; giao dịch cần được tải kèm wallet và category.
+        """
         original_type = transaction_obj.transaction_type
         original_amount = transaction_obj.amount
 
@@ -55,21 +84,198 @@ class TransactionService:
             transaction_obj,
             transaction_type=updated_type,
             amount=updated_amount,
+            validate=validate,
             **data,
         )
 
         TransactionService._reconcile_wallet_balance(
             updated.wallet, original_type, original_amount, updated_type, updated_amount
         )
+        OutboxService.record(updated, OutboxService.UPDATED)
+        RealtimeService.notify([updated.wallet_id])
         return updated
 
+    @staticmethod
+    @transaction.atomic
+    def apply_batch(user, operations: list[dict]) -> list[dict]:
+        """
+        Áp dụng một loạt thao tác create/update/delete trong một transaction DB.
+
+        Giao dịch, ví và category được tải trước bằng một query cho mỗi loại,
+        thay đổi số dư được gộp thành một UPDATE cho mỗi ví.
+        """
+        transaction_ids = {
+            op["id"] for op in operations if op["op"] != BatchOperation.CREATE
+        }
+        # Giao dịch thuộc ví không được truy cập được coi như không tồn tại, để
+        # batch không tiết lộ id nào có thật.
+        existing = (
+            Transaction.objects.select_for_update()
+            .filter(wallet_id__in=WalletAccessService.accessible_wallet_ids(user))
+            .in_bulk(transaction_ids)
+        )
+        # Trạng thái trước batch, dùng cho sự kiện xoá.
+        originals = {pk: OutboxService.serialize(tx) for pk, tx in existing.items()}
+
+        wallet_ids = {tx.wallet_id for tx in existing.values()}
+        category_ids = {tx.category_id for tx in existing.values()}
+        # Category tự phân loại cho các thao tác tạo không truyền category.
+        matched_categories = {}
+        for index, op in enumerate(operations):
+            if op["op"] != BatchOperation.CREATE:
+                continue
+            wallet_ids.add(op["wallet"])
+            if op.get("category") is None:
+                matched_categories[index] = CategorizationService.matcher_for(
+                    op["wallet"]
+                ).match(op.get("note"), op.get("metadata"))
+                category_ids.add(matched_categories[index])
+            else:
+                category_ids.add(op["category"])
+        wallets = Wallet.objects.in_bulk(wallet_ids)
+        categories = Category.objects.in_bulk(category_ids)
+
+        errors = {}
+        deltas = defaultdict(Decimal)
+        results = []
+        to_create = []
+        to_update = {}
+        to_delete = set()
+        update_fields = {"updated_at"}
+
+        for index, op in enumerate(operations):
+            kind = op["op"]
+            if kind == BatchOperation.CREATE:
+                wallet = wallets.get(op["wallet"])
+                category_id = op.get("category")
+                if category_id is None:
+                    category_id = matched_categories[index]
+                category = categories.get(category_id)
+                if wallet is None:
+                    errors[str(index)] = "Ví không tồn tại."
+                    continue
+                WalletAccessService.check_write_access(user, wallet.id)
+                if op.get("category") is None and category is None:
+                    errors[str(index)] = "Không có quy tắc phân loại phù hợp."
+                    continue
+                if category is None or category.wallet_id != wallet.id:
+                    errors[str(index)] = "Category không thuộc ví đã chọn."
+                    continue
+                tx = Transaction(
+                    wallet=wallet,
+                    category=category,
+                    transaction_type=op.get("transaction_type") or category.transaction_type,
+                    amount=op["amount"],
+                    **{
+                        key: op[key]
+                        for key in ("note", "occurred_at", "metadata")
+                        if key in op
+                    },
+                )
+                if tx.transaction_type != category.transaction_type:
+                    errors[str(index)] = "Loại giao dịch không khớp với category."
+                    continue
+                tx.fingerprint = Transaction.build_fingerprint(
+                    wallet.id, tx.amount, tx.occurred_at
+                )
+                deltas[wallet.id] += TransactionService._signed_amount(tx)
+                to_create.append(tx)
+                results.append({"op": kind, "id": None, "transaction": tx})
+                continue
+
+            tx = existing.get(op["id"])
+            if tx is None or tx.pk in to_delete:
+                errors[str(index)] = "Giao dịch không tồn tại."
+                continue
+            WalletAccessService.check_write_access(user, tx.wallet_id)
+            deltas[tx.wallet_id] -= TransactionService._signed_amount(tx)
+
+            if kind == BatchOperation.DELETE:
+                to_delete.add(tx.pk)
+                to_update.pop(tx.pk, None)
+                results.append({"op": kind, "id": tx.pk, "transaction": None})
+                continue
+
+            for field in ("amount", "note", "occurred_at", "metadata"):
+                if field in op:
+                    setattr(tx, field, op[field])
+                    update_fields.add(field)
+            if op.get("transaction_type"):
+                tx.transaction_type = op["transaction_type"]
+                update_fields.add("transaction_type")
+            if "amount" in op or "occurred_at" in op:
+                tx.fingerprint = Transaction.build_fingerprint(
+                    tx.wallet_id, tx.amount, tx.occurred_at
+                )
+                update_fields.add("fingerprint")
+            deltas[tx.wallet_id] += TransactionService._signed_amount(tx)
+            if tx.transaction_type != categories[tx.category_id].transaction_type:
+                errors[str(index)] = "Loại giao dịch không khớp với category."
+                continue
+            to_update[tx.pk] = tx
+            results.append({"op": kind, "id": tx.pk, "transaction": tx})
+
+        if errors:
+            raise ValidationError(errors)
+
+        if to_create:
+            snapshots = CategorySnapshotService.snapshots_for_wallets(
+                {tx.wallet_id for tx in to_create}
+            )
+            for tx in to_create:
+                for field, value in snapshots[tx.category_id].items():
+                    setattr(tx, field, value)
+            Transaction.objects.bulk_create(to_create)
+        if to_update:
+            now = timezone.now()
+            for tx in to_update.values():
+                tx.updated_at = now
+            Transaction.objects.bulk_update(to_update.values(), sorted(update_fields))
+        if to_delete:
+            deleted_at = timezone.now()
+            TransactionRepository.soft_delete(to_delete, deleted_at)
+            stamp = DjangoJSONEncoder().default(deleted_at)
+            for pk in to_delete:
+                originals[pk].update(deleted_at=stamp, updated_at=stamp)
+        unchanged = [wallet_id for wallet_id, delta in deltas.items() if not delta]
+        for wallet_id, delta in deltas.items():
+            if delta:
+                WalletRepository.apply_balance_delta(wallet_id, delta)
+        if unchanged:
+            WalletRepository.touch(unchanged)
+
+        events = []
+        for result in results:
+            if result["op"] == BatchOperation.CREATE:
+                result["id"] = result["transaction"].pk
+                events.append(OutboxService.build(result["transaction"], OutboxService.CREATED))
+            elif result["op"] == BatchOperation.UPDATE and result["id"] in to_delete:
+                result["transaction"] = None
+            elif result["op"] == BatchOperation.UPDATE:
+                events.append(OutboxService.build(result["transaction"], OutboxService.UPDATED))
+            else:
+                events.append(
+                    OutboxService.build(
+                        existing[result["id"]],
+                        OutboxService.DELETED,
+                        originals[result["id"]],
+                    )
+                )
+        OutboxService.record_many(events)
+        RealtimeService.notify(deltas, created=to_create)
+        return results
+
+    @staticmethod
+    def _signed_amount(transaction_obj: Transaction) -> Decimal:
+        return TransactionService._resolve_delta(transaction_obj.transaction_type) * Decimal(
+            transaction_obj.amount
+        )
+
     @staticmethod
     def _apply_wallet_balance(wallet: Wallet, transaction_type: str, amount: Decimal):
         sign = TransactionService._resolve_delta(transaction_type)
-        Wallet.objects.filter(pk=wallet.pk).update(
-            current_balance=F("current_balance") + (sign * Decimal(amount))
-        )
-        wallet.refresh_from_db(fields=["current_balance"])
+        WalletRepository.apply_balance_delta(wallet.pk, sign * Decimal(amount))
+        TransactionService._expire_balance(wallet)
 
     @staticmethod
     def _reconcile_wallet_balance(
@@ -79,12 +285,19 @@ class TransactionService:
         updated_type: str,
         updated_amount: Decimal,
     ):
-        Wallet.objects.filter(pk=wallet.pk).update(
-            current_balance=F("current_balance")
-            - TransactionService._resolve_delta(original_type) * Decimal(original_amount)
-            + TransactionService._resolve_delta(updated_type) * Decimal(updated_amount)
+        WalletRepository.apply_balance_delta(
+            wallet.pk,
+            TransactionService._resolve_delta(updated_type) * Decimal(updated_amount)
+            - TransactionService._resolve_delta(original_type) * Decimal(original_amount),
         )
-        wallet.refresh_from_db(fields=["current_balance"])
+        TransactionService._expire_balance(wallet)
+
+    @staticmethod
+    def _expire_balance(wallet: Wallet) -> None:
+        # Số dư vừa được cộng dồn trong DB: bỏ giá trị cũ trên instance để Django
+        # coi là trường deferred và chỉ tải lại khi thật sự được đọc.
+        for field in ("current_balance", "write_version"):
+            vars(wallet).pop(field, None)
 
     @staticmethod
     def _resolve_delta(transaction_type: str) -> Decimal:
@@ -97,11 +310,38 @@ class TransactionService:
     @staticmethod
     @transaction.atomic
     def delete_transaction(transaction_obj: Transaction) -> None:
+        """Xoá mềm giao dịch (chuyển vào thùng rác) và trừ khỏi số dư ví."""
         wallet = transaction_obj.wallet
         delta = TransactionService._resolve_delta(transaction_obj.transaction_type)
-        Wallet.objects.filter(pk=wallet.pk).update(
-            current_balance=F("current_balance") - delta * Decimal(transaction_obj.amount)
+        WalletRepository.apply_balance_delta(
+            wallet.pk, -delta * Decimal(transaction_obj.amount)
+        )
+        deleted_at = timezone.now()
+        TransactionRepository.soft_delete([transaction_obj.pk], deleted_at)
+        transaction_obj.deleted_at = transaction_obj.updated_at = deleted_at
+        OutboxService.record(transaction_obj, OutboxService.DELETED)
+        RealtimeService.notify([wallet.pk])
+        TransactionService._expire_balance(wallet)
+
+    @staticmethod
+    @transaction.atomic
+    def restore_transaction(transaction_obj: Transaction) -> Transaction:
+        """Khôi phục giao dịch từ thùng rác và cộng lại số tiền vào số dư ví."""
+        transaction_obj = (
+            TransactionRepository.deleted_for_wallets([transaction_obj.wallet_id])
+            .select_for_update()
+            .filter(pk=transaction_obj.pk)
+            .first()
         )
-        TransactionRepository.delete(transaction_obj)
-        wallet.refresh_from_db(fields=["current_balance"])
+        if transaction_obj is None:
+            raise ValueError("Giao dịch không nằm trong thùng rác.")
+        if transaction_obj.category.deleted_at is not None:
+            raise ValueError("Category của giao dịch đã bị xoá, hãy khôi phục category trước.")
 
+        TransactionRepository.restore(transaction_obj, timezone.now())
+        TransactionService._apply_wallet_balance(
+            transaction_obj.wallet, transaction_obj.transaction_type, transaction_obj.amount
+        )
+        OutboxService.record(transaction_obj, OutboxService.RESTORED)
+        RealtimeService.notify([transaction_obj.wallet_id], created=[transaction_obj])
+        return transaction_obj
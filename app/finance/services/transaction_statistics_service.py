@@ -0,0 +1,222 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from app.finance.models import TransactionType, Wallet
+from app.finance.repositories import (
+    CategoryRepository,
+    TransactionArchiveRepository,
+    TransactionRepository,
+)
+from app.finance.services.transaction_archive_service import TransactionArchiveService
+
+
+class TransactionStatisticsService:
+    """
+    Thống kê giao dịch của một ví: trung bình/trung vị theo category, chênh
+    lệch thu chi theo tháng, chi tiêu cộng dồn 30 ngày và giao dịch bất
+    thường. Dữ liệu được đọc theo cột bằng `values_list` rồi tính bằng NumPy;
+    kết quả được cache theo `write_version` của ví nên tự hết hạn khi ví có
+    giao dịch mới.
+    """
+
+    CACHE_KEY = "finance:stats:{wallet_id}:{version}:{start}:{end}"
+    ROLLING_DAYS = 30
+    OUTLIER_THRESHOLD = 3.5
+    OUTLIER_LIMIT = 100
+    COLUMNS = ("id", "day", "amount", "transaction_type", "category_id")
+
+    @staticmethod
+    def resolve_range(start: date | None, end: date | None) -> tuple[date, date]:
+        max_days = settings.FINANCE_STATS_MAX_DAYS
+        end = end or timezone.now().date()
+        start = start or end - timedelta(days=min(365, max_days) - 1)
+        if start > end:
+            raise ValueError("Ngày bắt đầu phải trước hoặc bằng ngày kết thúc.")
+        if (end - start).days + 1 > max_days:
+            raise ValueError(f"Khoảng thống kê tối đa {max_days} ngày.")
+        return start, end
+
+    @staticmethod
+    def compute(wallet: Wallet, start: date | None = None, end: date | None = None) -> dict:
+        start, end = TransactionStatisticsService.resolve_range(start, end)
+        key = TransactionStatisticsService.CACHE_KEY.format(
+            wallet_id=wallet.id, version=wallet.write_version, start=start, end=end
+        )
+        result = cache.get(key)
+        if result is None:
+            result = TransactionStatisticsService._compute(wallet, start, end)
+            cache.set(key, result, settings.FINANCE_STATS_CACHE_TTL)
+        return result
+
+    @staticmethod
+    def load_columns(wallet: Wallet, since: date, until: date) -> dict[str, np.ndarray]:
+        """
+        Đọc giao dịch trong [since, until] (kể cả bảng lưu trữ khi khoảng chạm
+        tới) thành các mảng: id, ngày, số tiền (đơn vị xu), loại, category.
+        """
+        lower = timezone.make_aware(datetime.combine(since, time.min))
+        upper = timezone.make_aware(datetime.combine(until + timedelta(days=1), time.min))
+        querysets = [TransactionRepository.for_wallet(wallet)]
+        if TransactionArchiveService.reaches_archive([wallet.id], lower):
+            querysets.append(TransactionArchiveRepository.for_wallets([wallet.id]))
+
+        rows = []
+        for queryset in querysets:
+            rows.extend(
+                queryset.filter(occurred_at__gte=lower, occurred_at__lt=upper)
+                .order_by()
+                .annotate(day=TruncDate("occurred_at"))
+                .values_list(*TransactionStatisticsService.COLUMNS)
+            )
+        ids, days, amounts, types, category_ids = zip(*rows) if rows else ((),) * 5
+        return {
+            "id": np.array(ids, dtype=np.int64),
+            "day": np.array(days, dtype="datetime64[D]"),
+            "amount": np.rint(np.array(amounts, dtype=np.float64) * 100).astype(np.int64),
+            "type": np.array(types, dtype=str),
+            "category": np.array(category_ids, dtype=np.int64),
+        }
+
+    @staticmethod
+    def _compute(wallet: Wallet, start: date, end: date) -> dict:
+        window = TransactionStatisticsService.ROLLING_DAYS
+        columns = TransactionStatisticsService.load_columns(
+            wallet, start - timedelta(days=window - 1), end
+        )
+        in_range = columns["day"] >= np.datetime64(start, "D")
+        scoped = {name: values[in_range] for name, values in columns.items()}
+        return {
+            "wallet": wallet.id,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "transaction_count": int(in_range.sum()),
+            "categories": TransactionStatisticsService._by_category(wallet, scoped),
+            "months": TransactionStatisticsService._by_month(scoped, start, end),
+            "rolling_spend": TransactionStatisticsService._rolling_spend(columns, start, end),
+            "outliers": TransactionStatisticsService._outliers(scoped),
+        }
+
+    @staticmethod
+    def _money(cents) -> str:
+        return str(Decimal(int(round(float(cents)))).scaleb(-2))
+
+    @staticmethod
+    def _group_medians(groups: np.ndarray, values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Trung vị của `values` theo nhóm `groups` (0..n-1), không lặp theo nhóm."""
+        ordered = values[np.lexsort((values, groups))]
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        lower = ordered[offsets + (counts - 1) // 2]
+        upper = ordered[offsets + counts // 2]
+        return (lower + upper) / 2
+
+    @staticmethod
+    def _by_category(wallet: Wallet, columns: dict) -> list[dict]:
+        if not columns["id"].size:
+            return []
+        category_ids, groups = np.unique(columns["category"], return_inverse=True)
+        counts = np.bincount(groups)
+        totals = np.bincount(groups, weights=columns["amount"])
+        medians = TransactionStatisticsService._group_medians(groups, columns["amount"], counts)
+        names = dict(
+            CategoryRepository.for_wallet(wallet)
+            .filter(pk__in=category_ids.tolist())
+            .values_list("id", "name")
+        )
+        money = TransactionStatisticsService._money
+        return [
+            {
+                "category": int(category_id),
+                "category_name": names.get(int(category_id), ""),
+                "count": int(count),
+                "total": money(total),
+                "average": money(total / count),
+                "median": money(median),
+            }
+            for category_id, count, total, median in zip(category_ids, counts, totals, medians)
+        ]
+
+    @staticmethod
+    def _by_month(columns: dict, start: date, end: date) -> list[dict]:
+        first = np.datetime64(start, "M")
+        months = np.arange(first, np.datetime64(end, "M") + 1)
+        month_index = (columns["day"].astype("datetime64[M]") - first).astype(np.int64)
+
+        def totals(transaction_type):
+            mask = columns["type"] == transaction_type
+            return np.bincount(
+                month_index[mask], weights=columns["amount"][mask], minlength=months.size
+            )
+
+        income = totals(TransactionType.INCOME)
+        expense = totals(TransactionType.EXPENSE)
+        income_delta = np.diff(income, prepend=np.nan)
+        expense_delta = np.diff(expense, prepend=np.nan)
+        money = TransactionStatisticsService._money
+        return [
+            {
+                "month": str(month),
+                "income": money(income[index]),
+                "expense": money(expense[index]),
+                "income_change": None if index == 0 else money(income_delta[index]),
+                "expense_change": None if index == 0 else money(expense_delta[index]),
+            }
+            for index, month in enumerate(months)
+        ]
+
+    @staticmethod
+    def _rolling_spend(columns: dict, start: date, end: date) -> list[dict]:
+        """
+        Tổng chi tiêu 30 ngày tính tới từng ngày trong khoảng; dữ liệu được đọc
+        thêm 29 ngày trước `start` nên các ngày đầu khoảng cũng đủ cửa sổ.
+        """
+        window = TransactionStatisticsService.ROLLING_DAYS
+        first = np.datetime64(start, "D") - (window - 1)
+        size = (end - start).days + window
+        mask = columns["type"] == TransactionType.EXPENSE
+        day_index = (columns["day"][mask] - first).astype(np.int64)
+        daily = np.bincount(day_index, weights=columns["amount"][mask], minlength=size)
+        running = np.concatenate(([0], np.cumsum(daily)))
+        rolling = running[window:] - running[:-window]
+        days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+        money = TransactionStatisticsService._money
+        return [
+            {"date": str(day), "amount": money(amount)} for day, amount in zip(days, rolling)
+        ]
+
+    @staticmethod
+    def _outliers(columns: dict) -> list[dict]:
+        """
+        Giao dịch có robust z-score (theo trung vị và MAD trong cùng category)
+        vượt ngưỡng, xếp theo mức lệch giảm dần.
+        """
+        if not columns["id"].size:
+            return []
+        amounts = columns["amount"].astype(np.float64)
+        _, groups = np.unique(columns["category"], return_inverse=True)
+        counts = np.bincount(groups)
+        medians = TransactionStatisticsService._group_medians(groups, amounts, counts)
+        deviations = np.abs(amounts - medians[groups])
+        mads = TransactionStatisticsService._group_medians(groups, deviations, counts)
+        spread = mads[groups]
+        scores = np.zeros_like(amounts)
+        np.divide(0.6745 * deviations, spread, out=scores, where=spread > 0)
+        flagged = np.flatnonzero(scores > TransactionStatisticsService.OUTLIER_THRESHOLD)
+        flagged = flagged[np.argsort(-scores[flagged], kind="stable")]
+        flagged = flagged[: TransactionStatisticsService.OUTLIER_LIMIT]
+        money = TransactionStatisticsService._money
+        return [
+            {
+                "transaction": int(columns["id"][index]),
+                "category": int(columns["category"][index]),
+                "amount": money(columns["amount"][index]),
+                "median": money(medians[groups[index]]),
+                "score": round(float(scores[index]), 2),
+            }
+            for index in flagged
+        ]
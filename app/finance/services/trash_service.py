@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from app.finance.repositories import CategoryRepository, TransactionRepository
+
+
+class TrashService:
+    """
+    Dọn thùng rác: xoá hẳn giao dịch và category đã xoá mềm quá
+    `FINANCE_TRASH_RETENTION_DAYS` ngày. Mỗi lô là một transaction ngắn nên
+    lệnh có thể dừng giữa chừng và chạy lại mà không khoá bảng lâu.
+    """
+
+    @staticmethod
+    def cutoff(now: datetime | None = None) -> datetime:
+        return (now or timezone.now()) - timedelta(days=settings.FINANCE_TRASH_RETENTION_DAYS)
+
+    @staticmethod
+    def purge(deleted_before: datetime, batch_size: int = 1000) -> dict[str, int]:
+        # Giao dịch trước để category của chúng không còn bị PROTECT giữ lại.
+        purged = {"transactions": 0, "categories": 0}
+        while True:
+            ids = list(
+                TransactionRepository.deleted_before(deleted_before)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                purged["transactions"] += TransactionRepository.purge(ids)
+
+        # Mỗi vòng xoá các category lá, category cha đủ điều kiện ở vòng sau.
+        while True:
+            ids = list(
+                CategoryRepository.purgeable(deleted_before)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                CategoryRepository.purge(ids)
+            purged["categories"] += len(ids)
+        return purged
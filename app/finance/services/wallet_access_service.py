@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+
+from app.finance.models import WalletRole
+from app.finance.repositories import WalletMemberRepository
+
+
+class WalletAccessService:
+    """
+    Xác định các ví (kèm vai trò) mà người dùng được truy cập, tính một lần cho
+    mỗi request (ghi nhớ trên `request.user`) và cache theo người dùng giữa các
+    request. Dữ liệu lấy từ một query trên index (user, wallet, role) của
+    `WalletMember`.
+    """
+
+    CACHE_KEY = "finance:wallet-access:{user_id}"
+    REQUEST_ATTR = "_finance_wallet_roles"
+    BYPASS_CACHE_ATTR = "_finance_wallet_roles_bypass_cache"
+    WRITE_ROLES = frozenset({WalletRole.OWNER, WalletRole.EDITOR})
+    OWNER_ROLES = frozenset({WalletRole.OWNER})
+
+    @staticmethod
+    def wallet_roles(user) -> dict[int, str]:
+        roles = getattr(user, WalletAccessService.REQUEST_ATTR, None)
+        if roles is not None:
+            return roles
+
+        if getattr(user, WalletAccessService.BYPASS_CACHE_ATTR, False):
+            # Cache vừa bị invalidate trong request này và chỉ được xoá khi commit.
+            roles = dict(WalletMemberRepository.roles_for_user(user.id))
+        else:
+            cache_key = WalletAccessService.CACHE_KEY.format(user_id=user.id)
+            roles = cache.get(cache_key)
+            if roles is None:
+                roles = dict(WalletMemberRepository.roles_for_user(user.id))
+                cache.set(cache_key, roles, settings.FINANCE_WALLET_ACCESS_CACHE_TTL)
+
+        setattr(user, WalletAccessService.REQUEST_ATTR, roles)
+        return roles
+
+    @staticmethod
+    def accessible_wallet_ids(user) -> frozenset[int]:
+        return frozenset(WalletAccessService.wallet_roles(user))
+
+    @staticmethod
+    def role_for(user, wallet_id) -> str | None:
+        try:
+            wallet_id = int(wallet_id)
+        except (TypeError, ValueError):
+            return None
+        return WalletAccessService.wallet_roles(user).get(wallet_id)
+
+    @staticmethod
+    def has_access(user, wallet_id, roles=None) -> bool:
+        role = WalletAccessService.role_for(user, wallet_id)
+        if role is None:
+            return False
+        return roles is None or role in roles
+
+    @staticmethod
+    def check_access(user, wallet_id) -> None:
+        if not WalletAccessService.has_access(user, wallet_id):
+            raise PermissionDenied("Bạn không có quyền truy cập ví này.")
+
+    @staticmethod
+    def check_write_access(user, wallet_id) -> None:
+        WalletAccessService.check_access(user, wallet_id)
+        if not WalletAccessService.has_access(user, wallet_id, WalletAccessService.WRITE_ROLES):
+            raise PermissionDenied("Bạn không có quyền chỉnh sửa ví này.")
+
+    @staticmethod
+    def check_owner_access(user, wallet_id) -> None:
+        WalletAccessService.check_access(user, wallet_id)
+        if not WalletAccessService.has_access(user, wallet_id, WalletAccessService.OWNER_ROLES):
+            raise PermissionDenied("Chỉ chủ ví mới được thực hiện thao tác này.")
+
+    @staticmethod
+    def invalidate(user) -> None:
+        vars(user).pop(WalletAccessService.REQUEST_ATTR, None)
+        setattr(user, WalletAccessService.BYPASS_CACHE_ATTR, True)
+        WalletAccessService.invalidate_user_ids([user.id])
+
+    @staticmethod
+    def invalidate_user_ids(user_ids) -> None:
+        cache_keys = [
+            WalletAccessService.CACHE_KEY.format(user_id=user_id) for user_id in user_ids
+        ]
+        transaction.on_commit(lambda: cache.delete_many(cache_keys))
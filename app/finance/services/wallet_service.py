@@ -1,24 +1,171 @@
+from decimal import Decimal
+
+from django.conf import settings
 from django.db import transaction
+from django.utils import timezone
 
-from app.finance.models import Wallet
-from app.finance.repositories import WalletRepository
+from app.finance.models import Job, JobKind, Wallet, WalletMember, WalletRole
+from app.finance.repositories import (
+    CategorizationRuleRepository,
+    CategoryRepository,
+    CategoryTemplateRepository,
+    RecurringPatternRepository,
+    TransactionArchiveRepository,
+    TransactionRepository,
+    WalletMemberRepository,
+    WalletRepository,
+)
 from app.finance.services.category_service import CategoryService
+from app.finance.services.job_service import JobService
+from app.finance.services.outbox_service import OutboxService
+from app.finance.services.transaction_service import TransactionService
+from app.finance.services.wallet_access_service import WalletAccessService
 
 
 class WalletService:
     @staticmethod
     @transaction.atomic
     def create_wallet(owner, *, copy_master_categories: bool = True, **data) -> Wallet:
-        wallet = WalletRepository.create(owner=owner, **data)
+        wallet = WalletRepository.create(owner_id=owner.id, **data)
+        owner_member = WalletMemberRepository.upsert(wallet.id, owner.id, WalletRole.OWNER)
+        OutboxService.record_many(
+            [
+                OutboxService.build(wallet, OutboxService.CREATED),
+                OutboxService.build(owner_member, OutboxService.CREATED),
+            ]
+        )
+        wallet.bootstrap_job = None
         if copy_master_categories:
-            CategoryService.bootstrap_from_master(wallet)
+            # Bộ master lớn được sao chép bằng job nền để request không bị timeout.
+            template_count = CategoryTemplateRepository.all_master().count()
+            if template_count > settings.FINANCE_BOOTSTRAP_SYNC_MAX_TEMPLATES:
+                wallet.bootstrap_job = JobService.enqueue(
+                    JobKind.BOOTSTRAP_WALLET, owner, wallet
+                )
+            else:
+                CategoryService.bootstrap_from_master(wallet)
+        WalletAccessService.invalidate(owner)
         return wallet
 
     @staticmethod
-    def list_wallets(owner):
-        return WalletRepository.for_user(owner)
+    def list_wallets(user):
+        return WalletRepository.by_ids(WalletAccessService.accessible_wallet_ids(user))
 
     @staticmethod
+    @transaction.atomic
     def update_wallet(wallet: Wallet, **data) -> Wallet:
-        return WalletRepository.update(wallet, **data)
+        wallet = WalletRepository.update(wallet, **data)
+        OutboxService.record(wallet, OutboxService.UPDATED)
+        return wallet
+
+    @staticmethod
+    def delete_wallet(wallet: Wallet, user) -> Job | None:
+        """
+        Ẩn ví ngay (đánh dấu `deleted_at`, thu hồi quyền của mọi thành viên, huỷ
+        job đang chờ của ví) rồi xoá dữ liệu theo lô: ngay trong request với ví
+        nhỏ, bằng job nền khi ví có hơn `FINANCE_WALLET_DELETE_SYNC_MAX_ROWS`
+        giao dịch.
+        """
+        with transaction.atomic():
+            WalletAccessService.invalidate_user_ids(
+                list(WalletMemberRepository.user_ids_for_wallet(wallet.id))
+            )
+            deleted_at = timezone.now()
+            WalletRepository.mark_deleted(wallet.id, deleted_at)
+            wallet.deleted_at = wallet.updated_at = deleted_at
+            # Category, giao dịch và thành viên bị xoá theo ví không có sự kiện riêng.
+            OutboxService.record(wallet, OutboxService.DELETED)
+            WalletMemberRepository.delete_for_wallet(wallet.id)
+            JobService.cancel_for_wallet(wallet.id)
+            limit = settings.FINANCE_WALLET_DELETE_SYNC_MAX_ROWS
+            if any(
+                queryset.order_by()[limit:limit + 1].exists()
+                for queryset in (
+                    TransactionRepository.all_for_wallet(wallet.id),
+                    TransactionArchiveRepository.for_wallets([wallet.id]),
+                )
+            ):
+                return JobService.enqueue(JobKind.DELETE_WALLET, user, wallet)
+        WalletService.purge_wallet(wallet.id)
+        return None
+
+    @staticmethod
+    def purge_wallet(wallet_id: int, progress=None) -> dict[str, int]:
+        """
+        Xoá hẳn ví đã đánh dấu xoá: dữ liệu con được xoá theo lô
+        `FINANCE_WALLET_DELETE_BATCH_SIZE` dòng, mỗi lô một transaction ngắn,
+        giao dịch trước category (PROTECT); dòng ví được xoá sau cùng. Dừng giữa
+        chừng thì chạy lại sẽ làm tiếp phần còn lại.
+        """
+        wallet = WalletRepository.deleted_by_id(wallet_id)
+        if wallet is None:
+            return {}
+        steps = (
+            ("transactions", TransactionRepository.all_for_wallet(wallet_id)),
+            ("archived_transactions", TransactionArchiveRepository.for_wallets([wallet_id])),
+            ("categorization_rules", CategorizationRuleRepository.for_wallets([wallet_id])),
+            ("recurring_patterns", RecurringPatternRepository.for_wallet(wallet_id)),
+            ("categories", CategoryRepository.all_for_wallet(wallet_id)),
+        )
+        batch_size = settings.FINANCE_WALLET_DELETE_BATCH_SIZE
+        total = sum(queryset.count() for _, queryset in steps[:2]) if progress else 0
+        deleted = {}
+        for name, queryset in steps:
+            deleted[name] = 0
+            while True:
+                ids = list(queryset.order_by().values_list("pk", flat=True)[:batch_size])
+                if not ids:
+                    break
+                with transaction.atomic():
+                    queryset.filter(pk__in=ids).delete()
+                deleted[name] += len(ids)
+                if progress and name in {"transactions", "archived_transactions"}:
+                    done = deleted["transactions"] + deleted.get("archived_transactions", 0)
+                    progress(done, max(total, done), "Đang xoá giao dịch")
+        with transaction.atomic():
+            WalletRepository.delete(wallet)
+        return deleted
+
+    @staticmethod
+    def reconstruct_balance(wallet: Wallet) -> Decimal:
+        """
+        Tính lại số dư từ số dư ban đầu và toàn bộ giao dịch, kể cả giao dịch đã
+        lưu trữ; dùng để đối soát với `current_balance`.
+        """
+        balance = Decimal(wallet.initial_balance)
+        for totals in (
+            TransactionRepository.totals_by_type(wallet.id),
+            TransactionArchiveRepository.totals_by_type(wallet.id),
+        ):
+            for transaction_type, total in totals.items():
+                balance += TransactionService._resolve_delta(transaction_type) * total
+        return balance
+
+    @staticmethod
+    def list_members(wallet: Wallet):
+        return WalletMemberRepository.for_wallet(wallet.id)
+
+    @staticmethod
+    @transaction.atomic
+    def add_member(wallet: Wallet, user_id: int, role: str) -> WalletMember:
+        if user_id == wallet.owner_id:
+            raise ValueError("Không thể đổi vai trò của chủ ví.")
+        exists = WalletMemberRepository.for_wallet(wallet.id).filter(user_id=user_id).exists()
+        member = WalletMemberRepository.upsert(wallet.id, user_id, role)
+        OutboxService.record(
+            member, OutboxService.UPDATED if exists else OutboxService.CREATED
+        )
+        WalletAccessService.invalidate_user_ids([user_id])
+        return member
 
+    @staticmethod
+    @transaction.atomic
+    def remove_member(wallet: Wallet, user_id: int) -> bool:
+        if user_id == wallet.owner_id:
+            raise ValueError("Không thể xoá chủ ví khỏi danh sách thành viên.")
+        member = WalletMemberRepository.for_wallet(wallet.id).filter(user_id=user_id).first()
+        if member is not None:
+            OutboxService.record(member, OutboxService.DELETED)
+        removed = WalletMemberRepository.delete(wallet.id, user_id) > 0
+        WalletAccessService.invalidate_user_ids([user_id])
+        return removed
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from app.finance.models import Category, CategoryTemplate, Wallet, WalletRole
+from app.finance.repositories import WalletMemberRepository
+from app.finance.services import CategoryTreeService, WalletAccessService
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_category_tree(sender, instance, **kwargs):
+    CategoryTreeService.invalidate(instance.wallet_id)
+
+
+@receiver([post_save, post_delete], sender=CategoryTemplate)
+def invalidate_category_template_tree(sender, instance, **kwargs):
+    CategoryTreeService.invalidate_templates()
+
+
+@receiver(post_save, sender=Wallet)
+def create_owner_membership(sender, instance, created, raw=False, **kwargs):
+    # Quyền truy cập chỉ đọc từ WalletMember, nên ví tạo ngoài WalletService
+    # (admin, shell) cũng phải có dòng OWNER cho chủ ví.
+    if not created or raw:
+        return
+    WalletMemberRepository.upsert(instance.id, instance.owner_id, WalletRole.OWNER)
+    WalletAccessService.invalidate_user_ids([instance.owner_id])
@@ -1,3 +1,922 @@
-from django.test import TestCase
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from app.finance.models import (
+    CategorizationRule,
+    Category,
+    Job,
+    JobKind,
+    JobStatus,
+    OutboxEvent,
+    RuleMatchType,
+    Transaction,
+    Wallet,
+    WalletMember,
+    WalletRole,
+)
+from app.finance.repositories import WalletRepository
+from app.finance.services import (
+    CategorizationService,
+    CategoryTotalsService,
+    CategoryTreeService,
+    JobService,
+    JobWorker,
+    TransactionPartitionService,
+    WalletService,
+)
+from app.finance.services.job_service import JobLeaseLost
+from app.finance.throttles import TokenBucketThrottle
+
+
+class FinanceTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        # Bucket throttle và cây category nằm trong cache, không rollback cùng
+        # DB; SQLite lại dùng lại id giữa các test nên phải xoá trước mỗi test.
+        cache.clear()
+        caches[settings.FINANCE_THROTTLE_CACHE].clear()
+
+
+def run_queued_jobs():
+    # Không dùng `JobWorker.work`: nó đóng kết nối cũ giữa các job, điều mà
+    # transaction bao quanh mỗi TestCase không chịu được.
+    while (job := JobService.claim("test")) is not None:
+        JobWorker.run(job)
+
+
+class CategorizationRegexRuleTests(FinanceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("owner", password="secret")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.wallet = WalletService.create_wallet(
+                self.user, name="Ví chính", copy_master_categories=False
+            )
+        self.cafe = Category.objects.create(
+            wallet=self.wallet, name="Cafe", transaction_type="EXPENSE"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _create_rule(self, pattern):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                "/api/finance/categorization-rules/",
+                {
+                    "wallet": self.wallet.id,
+                    "category": self.cafe.id,
+                    "pattern": pattern,
+                    "match_type": RuleMatchType.REGEX,
+                },
+                format="json",
+            )
+
+    def test_rejects_patterns_that_break_the_combined_regex(self):
+        for pattern in ("(?i)coffee", r"(a)\1", "(?P<name>a)", r"(a)?(?(1)b|c)"):
+            with self.subTest(pattern=pattern):
+                response = self._create_rule(pattern)
+                self.assertEqual(response.status_code, 400, response.content)
+        self.assertFalse(CategorizationRule.objects.exists())
+
+    def test_accepts_patterns_that_look_like_references_inside_classes(self):
+        for pattern in (r"coffee\s+\d+", r"[\1]", r"[]\1]x", r"\\1"):
+            with self.subTest(pattern=pattern):
+                response = self._create_rule(pattern)
+                self.assertEqual(response.status_code, 201, response.content)
+
+    def test_bad_stored_rule_does_not_break_transaction_writes(self):
+        response = self._create_rule("^highlands")
+        self.assertEqual(response.status_code, 201, response.content)
+        bad = CategorizationRule.objects.create(
+            wallet=self.wallet,
+            category=self.cafe,
+            pattern="placeholder",
+            match_type=RuleMatchType.REGEX,
+            priority=100,
+        )
+        CategorizationRule.objects.filter(pk=bad.pk).update(pattern="(?i)coffee")
+        with self.captureOnCommitCallbacks(execute=True):
+            CategorizationService.invalidate(self.wallet.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/finance/transactions/",
+                {"wallet": self.wallet.id, "amount": "5", "note": "Highlands latte"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()["category"], self.cafe.id)
+
+
+class TransactionSearchTests(FinanceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("owner", password="secret")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.wallet = WalletService.create_wallet(
+                self.user, name="Ví du lịch", copy_master_categories=False
+            )
+        self.category = Category.objects.create(
+            wallet=self.wallet, name="Ăn uống", transaction_type="EXPENSE"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/finance/transactions/",
+                {"wallet": self.wallet.id, "amount": "5", "category": self.category.id},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+
+    def test_search_matches_wallet_name_and_owner(self):
+        for term in ("du lịch", "owner", "Ăn uống"):
+            with self.subTest(term=term):
+                response = self.client.get("/api/finance/transactions/", {"search": term})
+                self.assertEqual(response.status_code, 200, response.content)
+                self.assertEqual(len(response.json()), 1)
+
+    def test_rename_queues_durable_snapshot_refresh(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f"/api/finance/categories/{self.category.id}/",
+                {"name": "Ẩm thực"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+        job = Job.objects.get(kind=JobKind.REFRESH_CATEGORY_SNAPSHOTS)
+        self.assertEqual(job.payload, {"category_ids": [self.category.id]})
+        run_queued_jobs()
+        self.assertEqual(
+            Transaction.objects.get(wallet=self.wallet).category_name, "Ẩm thực"
+        )
+
+
+class JobFencingTests(FinanceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("owner", password="secret")
+        JobService.enqueue(JobKind.REBUILD_ROLLUPS, self.user)
+        self.job = JobService.claim("worker-a")
+
+    def _reclaim(self):
+        Job.objects.filter(pk=self.job.pk).update(
+            locked_by="worker-b", attempts=self.job.attempts + 1
+        )
+
+    def test_stale_worker_cannot_report_or_finish(self):
+        self._reclaim()
+        with self.assertRaises(JobLeaseLost):
+            JobService.report_progress(self.job, 1, 2, "Đang chạy")
+        self.assertFalse(JobService.heartbeat(self.job))
+        self.assertFalse(JobService.complete(self.job, {"done": True}))
+        self.assertFalse(JobService.fail(self.job, RuntimeError("boom")))
+        job = Job.objects.get(pk=self.job.pk)
+        self.assertEqual(job.status, JobStatus.RUNNING)
+        self.assertEqual(job.locked_by, "worker-b")
+        self.assertIsNone(job.result)
+
+    def test_current_worker_completes(self):
+        JobService.report_progress(self.job, 1, 2, "Đang chạy")
+        self.assertTrue(JobService.complete(self.job, {"done": True}))
+        job = Job.objects.get(pk=self.job.pk)
+        self.assertEqual(job.status, JobStatus.SUCCEEDED)
+        self.assertEqual(job.result, {"done": True})
+
+
+@override_settings(
+    FINANCE_THROTTLE_BUCKETS={"finance_write": {"capacity": 20, "refill_rate": 0.001}}
+)
+class TokenBucketThrottleTests(SimpleTestCase):
+    def setUp(self):
+        caches[settings.FINANCE_THROTTLE_CACHE].clear()
+
+    def test_concurrent_requests_do_not_overshoot_capacity(self):
+        request = SimpleNamespace(
+            method="POST", user=SimpleNamespace(id=1, is_authenticated=True)
+        )
+        view = SimpleNamespace(action="create")
+        start = threading.Barrier(40)
+
+        def hit():
+            start.wait()
+            return TokenBucketThrottle().allow_request(request, view)
+
+        # `caches[...]` trả về instance riêng cho mỗi luồng nên patch ở mức class.
+        backend = type(caches[settings.FINANCE_THROTTLE_CACHE])
+        original_get = backend.get
+
+        def slow_get(store, *args, **kwargs):
+            value = original_get(store, *args, **kwargs)
+            time.sleep(0.001)
+            return value
+
+        with mock.patch.object(backend, "get", slow_get), ThreadPoolExecutor(
+            max_workers=40
+        ) as pool:
+            allowed = sum(pool.map(lambda _: hit(), range(40)))
+        self.assertLessEqual(allowed, 20)
+
+    def test_expired_lock_does_not_release_the_next_holder(self):
+        store = caches[settings.FINANCE_THROTTLE_CACHE]
+        throttle = TokenBucketThrottle()
+        owner = throttle.acquire(store, "bucket:lock")
+        # Khoá hết hạn giữa chừng và request khác giành được.
+        store.delete("bucket:lock")
+        other = throttle.acquire(store, "bucket:lock")
+        throttle.release(store, "bucket:lock", owner)
+        self.assertEqual(store.get("bucket:lock"), other)
+        throttle.release(store, "bucket:lock", other)
+        self.assertIsNone(store.get("bucket:lock"))
+
+
+class ForecastDetectionTests(FinanceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("owner", password="secret")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.wallet = WalletService.create_wallet(
+                self.user, name="Ví chính", copy_master_categories=False
+            )
+        category = Category.objects.create(
+            wallet=self.wallet, name="Nhà", transaction_type="EXPENSE"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/finance/transactions/",
+                {"wallet": self.wallet.id, "amount": "5", "category": category.id},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+
+    def test_forecast_serves_stored_patterns_and_queues_one_scan(self):
+        url = f"/api/finance/wallets/{self.wallet.id}/forecast/"
+        for _ in range(2):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertTrue(response.json()["patterns_stale"])
+            self.assertIsNone(response.json()["patterns_scanned_at"])
+        self.assertEqual(
+            Job.objects.filter(kind=JobKind.DETECT_RECURRING_PATTERNS).count(), 1
+        )
+
+        run_queued_jobs()
+        body = self.client.get(url).json()
+        self.assertFalse(body["patterns_stale"])
+        self.assertIsNotNone(body["patterns_scanned_at"])
+
+
+class OutboxPayloadTests(FinanceTestCase):
+    def test_wallet_created_payload_uses_integer_owner_id(self):
+        user = User.objects.create_user("owner", password="secret")
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(
+                "/api/finance/wallets/",
+                {"name": "Ví chính", "copy_master_categories": False},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+        event = OutboxEvent.objects.get(event_type="wallet.created")
+        self.assertEqual(event.payload["owner_id"], user.id)
+        member = OutboxEvent.objects.get(event_type="walletmember.created")
+        self.assertEqual(member.payload["user_id"], user.id)
+
+    def test_consumer_endpoints_work_with_token_user(self):
+        user = User.objects.create_user("owner", password="secret")
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}"
+        )
+        response = client.get("/api/finance/events/consumers/rollup/")
+        self.assertEqual(response.status_code, 200, response.content)
+        response = client.post(
+            "/api/finance/events/consumers/rollup/ack/", {"position": 0}, format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+
+class JwtJobCreationTests(FinanceTestCase):
+    """Tạo job qua API với access token thật (`request.user` là `LazyTokenUser`)."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("owner", password="secret")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.wallet = WalletService.create_wallet(
+                self.user, name="Ví chính", copy_master_categories=False
+            )
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(self.user).access_token}"
+        )
+
+    def test_wallet_job_actions_enqueue_jobs_for_the_token_user(self):
+        for path, kind in (
+            ("export", JobKind.EXPORT_TRANSACTIONS),
+            ("reconcile", JobKind.RECONCILE_WALLET),
+            ("rebuild-rollups", JobKind.REBUILD_ROLLUPS),
+        ):
+            with self.subTest(path=path):
+                response = self.client.post(
+                    f"/api/finance/wallets/{self.wallet.id}/{path}/", {}, format="json"
+                )
+                self.assertEqual(response.status_code, 202, response.content)
+                job = Job.objects.get(pk=response.json()["id"])
+                self.assertEqual((job.kind, job.user_id), (kind, self.user.id))
+
+
+class OutboxSequencingTests(FinanceTestCase):
+    def test_events_get_positions_on_commit_without_a_worker(self):
+        user = User.objects.create_user("owner", password="secret")
+        with self.captureOnCommitCallbacks(execute=True):
+            WalletService.create_wallet(user, name="Ví chính", copy_master_categories=False)
+        self.assertFalse(OutboxEvent.objects.filter(position__isnull=True).exists())
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get("/api/finance/events/")
+        self.assertEqual(
+            [event["event_type"] for event in response.json()["events"]],
+            ["wallet.created", "walletmember.created"],
+        )
+
+
+@skipUnless(connection.vendor == "postgresql", "Partition chỉ hỗ trợ PostgreSQL")
+class TransactionPartitionTests(FinanceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("owner", password="secret")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.wallet = WalletService.create_wallet(
+                self.user, name="Ví chính", copy_master_categories=False
+            )
+        self.category = Category.objects.create(
+            wallet=self.wallet, name="Nhà", transaction_type="EXPENSE"
+        )
+        self.rows = [
+            self._create(amount, datetime(2025, month, 15, tzinfo=dt_timezone.utc))
+            for amount, month in ((10, 1), (20, 1), (30, 3), (40, 6))
+        ]
+        # Khoá ngoại DEFERRED để lại trigger event chờ tới cuối transaction của
+        # test, khiến PostgreSQL từ chối DROP bảng cũ ở bước đổi bảng.
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+    def _create(self, amount, occurred_at):
+        return Transaction.objects.create(
+            wallet=self.wallet,
+            category=self.category,
+            transaction_type="EXPENSE",
+            amount=Decimal(amount),
+            occurred_at=occurred_at,
+        )
+
+    def _partition_of(self, transaction_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT tableoid::regclass::text FROM "
+                f"{TransactionPartitionService.table_name()} WHERE id = %s",
+                [transaction_id],
+            )
+            return cursor.fetchone()[0]
+
+    def test_convert_keeps_writes_made_during_copy(self):
+        moved = datetime(2025, 3, 20, tzinfo=dt_timezone.utc)
+        copy_rows = TransactionPartitionService._copy_rows
+        during_copy = {}
+
+        def copy_with_concurrent_writes(*args, **kwargs):
+            during_copy["inserted"] = self._create(50, datetime(2025, 2, 1, tzinfo=dt_timezone.utc))
+            Transaction.objects.filter(pk=self.rows[0].pk).update(
+                amount=Decimal("11"), occurred_at=moved
+            )
+            Transaction.objects.filter(pk=self.rows[1].pk).delete()
+            return copy_rows(*args, **kwargs)
+
+        with mock.patch.object(
+            TransactionPartitionService,
+            "_copy_rows",
+            side_effect=copy_with_concurrent_writes,
+        ):
+            TransactionPartitionService.convert(
+                TransactionPartitionService.MONTH, 1, batch_size=1
+            )
+
+        self.assertTrue(TransactionPartitionService.is_partitioned())
+        self.assertEqual(
+            dict(Transaction.objects.values_list("id", "amount")),
+            {
+                self.rows[0].pk: Decimal("11"),
+                self.rows[2].pk: Decimal("30"),
+                self.rows[3].pk: Decimal("40"),
+                during_copy["inserted"].pk: Decimal("50"),
+            },
+        )
+        self.assertEqual(Transaction.objects.get(pk=self.rows[0].pk).occurred_at, moved)
+        self.assertEqual(
+            self._partition_of(self.rows[0].pk),
+            TransactionPartitionService.partition_name(moved.date(), "month"),
+        )
+
+        created = self._create(60, timezone.now())
+        self.assertGreater(created.pk, during_copy["inserted"].pk)
+        self.assertEqual(Transaction.objects.count(), 5)
+
+    def test_new_partition_takes_rows_from_default(self):
+        TransactionPartitionService.convert(TransactionPartitionService.MONTH, 1)
+        future = timezone.now() + timedelta(days=200)
+        row = self._create(70, future)
+        self.assertEqual(
+            self._partition_of(row.pk), TransactionPartitionService.default_partition_name()
+        )
+
+        TransactionPartitionService.ensure_partitions(TransactionPartitionService.MONTH, 8)
+
+        start = TransactionPartitionService.period_start(future.date(), "month")
+        self.assertEqual(
+            self._partition_of(row.pk),
+            TransactionPartitionService.partition_name(start, "month"),
+        )
+
+
+class TransactionBatchTests(FinanceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("owner", password="secret")
+        self.other = User.objects.create_user("other", password="secret")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.wallet = WalletService.create_wallet(
+                self.user, name="Ví chính", copy_master_categories=False
+            )
+            other_wallet = WalletService.create_wallet(
+                self.other, name="Ví khác", copy_master_categories=False
+            )
+        self.category = Category.objects.create(
+            wallet=self.wallet, name="Nhà", transaction_type="EXPENSE"
+        )
+        self.foreign = Transaction.objects.create(
+            wallet=other_wallet,
+            category=Category.objects.create(
+                wallet=other_wallet, name="Nhà", transaction_type="EXPENSE"
+            ),
+            transaction_type="EXPENSE",
+            amount=Decimal("5"),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _batch(self, *operations):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                "/api/finance/transactions/batch/",
+                {"operations": list(operations)},
+                format="json",
+            )
+
+    def test_rejects_non_positive_amounts(self):
+        for amount in ("0", "-5"):
+            with self.subTest(amount=amount):
+                response = self._batch(
+                    {
+                        "op": "create",
+                        "wallet": self.wallet.id,
+                        "category": self.category.id,
+                        "amount": amount,
+                    }
+                )
+                self.assertEqual(response.status_code, 400, response.content)
+        self.assertFalse(Transaction.objects.filter(wallet=self.wallet).exists())
+
+    def test_foreign_ids_look_like_missing_ids(self):
+        missing = self._batch({"op": "delete", "id": self.foreign.pk + 1000})
+        foreign = self._batch({"op": "delete", "id": self.foreign.pk})
+        self.assertEqual(foreign.status_code, 400, foreign.content)
+        self.assertEqual(foreign.json(), missing.json())
+        self.assertTrue(Transaction.objects.filter(pk=self.foreign.pk).exists())
+
+    def test_zero_net_delta_skips_the_balance_update(self):
+        tx = Transaction.objects.create(
+            wallet=self.wallet,
+            category=self.category,
+            transaction_type="EXPENSE",
+            amount=Decimal("5"),
+        )
+        self.wallet.refresh_from_db()
+        with mock.patch.object(
+            WalletRepository,
+            "apply_balance_delta",
+            wraps=WalletRepository.apply_balance_delta,
+        ) as apply_balance_delta:
+            response = self._batch(
+                {"op": "update", "id": tx.pk, "occurred_at": "2025-01-01T00:00:00Z"}
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+        apply_balance_delta.assert_not_called()
+        balance, version = self.wallet.current_balance, self.wallet.write_version
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.current_balance, balance)
+        # Thống kê cache theo write_version vẫn phải hết hạn khi ngày giao dịch đổi.
+        self.assertEqual(self.wallet.write_version, version + 1)
+
+
+class WalletOwnerMembershipTests(FinanceTestCase):
+    def test_wallet_created_outside_the_service_is_visible_to_its_owner(self):
+        user = User.objects.create_user("owner", password="secret")
+        with self.captureOnCommitCallbacks(execute=True):
+            wallet = Wallet.objects.create(owner=user, name="Ví tạo từ admin")
+        self.assertEqual(
+            WalletMember.objects.get(wallet=wallet, user=user).role, WalletRole.OWNER
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get(f"/api/finance/wallets/{wallet.id}/")
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_service_created_wallet_has_a_single_owner_row(self):
+        user = User.objects.create_user("owner", password="secret")
+        with self.captureOnCommitCallbacks(execute=True):
+            wallet = WalletService.create_wallet(
+                user, name="Ví chính", copy_master_categories=False
+            )
+        self.assertEqual(
+            list(WalletMember.objects.filter(wallet=wallet).values_list("user_id", "role")),
+            [(user.id, WalletRole.OWNER)],
+        )
+
+
+class SoftDeleteTests(FinanceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("owner", password="secret")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.wallet = WalletService.create_wallet(
+                self.user, name="Ví chính", copy_master_categories=False
+            )
+        self.root = self._category("Nhà")
+        self.child = self._category("Điện nước", self.root)
+        self.leaf = self._category("Điện", self.child)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _category(self, name, parent=None):
+        return Category.objects.create(
+            wallet=self.wallet, name=name, transaction_type="EXPENSE", parent=parent
+        )
+
+    def _post(self, url):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(url, {}, format="json")
+
+    def _delete(self, category):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.delete(f"/api/finance/categories/{category.id}/")
+
+    def _listed(self, url):
+        response = self.client.get(url, {"wallet": self.wallet.id})
+        self.assertEqual(response.status_code, 200, response.content)
+        return {item["id"] for item in response.json()}
+
+    def test_delete_hides_subtree_and_restore_brings_it_back(self):
+        response = self._delete(self.root)
+        self.assertEqual(response.status_code, 204, response.content)
+        subtree = {self.root.id, self.child.id, self.leaf.id}
+        self.assertFalse(self._listed("/api/finance/categories/") & subtree)
+        self.assertEqual(self._listed("/api/finance/categories/trash/"), subtree)
+        self.assertEqual(
+            len(set(Category.all_objects.filter(pk__in=subtree).values_list("deleted_at"))), 1
+        )
+
+        response = self._post(f"/api/finance/categories/{self.child.id}/restore/")
+        self.assertEqual(response.status_code, 400, response.content)
+
+        response = self._post(f"/api/finance/categories/{self.root.id}/restore/")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self._listed("/api/finance/categories/"), subtree)
+        self.assertFalse(self._listed("/api/finance/categories/trash/"))
+
+    def test_restore_skips_children_deleted_separately(self):
+        self.assertEqual(self._delete(self.leaf).status_code, 204)
+        self.assertEqual(self._delete(self.root).status_code, 204)
+        response = self._post(f"/api/finance/categories/{self.root.id}/restore/")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            self._listed("/api/finance/categories/"), {self.root.id, self.child.id}
+        )
+        self.assertEqual(self._listed("/api/finance/categories/trash/"), {self.leaf.id})
+
+    def test_category_with_transactions_is_not_deleted(self):
+        Transaction.objects.create(
+            wallet=self.wallet,
+            category=self.leaf,
+            transaction_type="EXPENSE",
+            amount=Decimal("5"),
+        )
+        self.assertEqual(self._delete(self.root).status_code, 400)
+        self.assertFalse(Category.all_objects.filter(deleted_at__isnull=False).exists())
+
+    def test_transaction_delete_and_restore_reapply_the_balance(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/finance/transactions/",
+                {"wallet": self.wallet.id, "category": self.leaf.id, "amount": "30"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+        tx_id = response.json()["id"]
+        self.wallet.refresh_from_db()
+        balance = self.wallet.current_balance
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f"/api/finance/transactions/{tx_id}/")
+        self.assertEqual(response.status_code, 204, response.content)
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.current_balance, balance + 30)
+        self.assertFalse(Transaction.objects.filter(pk=tx_id).exists())
+
+        response = self._post(f"/api/finance/transactions/{tx_id}/restore/")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.current_balance, balance)
+        self.assertTrue(Transaction.objects.filter(pk=tx_id).exists())
+
+
+class CategoryMergeTests(FinanceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("owner", password="secret")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.wallet = WalletService.create_wallet(
+                self.user, name="Ví chính", copy_master_categories=False
+            )
+        self.food = self._category("Ăn uống")
+        self.cafe = self._category("Cafe", self.food)
+        self.latte = self._category("Latte", self.cafe)
+        self.dining = self._category("Nhà hàng")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.cafe_tx = self._transaction(self.cafe)
+        self.latte_tx = self._transaction(self.latte)
+
+    def _category(self, name, parent=None, transaction_type="EXPENSE", wallet=None):
+        return Category.objects.create(
+            wallet=wallet or self.wallet,
+            name=name,
+            transaction_type=transaction_type,
+            parent=parent,
+        )
+
+    def _transaction(self, category):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/finance/transactions/",
+                {"wallet": self.wallet.id, "category": category.id, "amount": "5"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()["id"]
+
+    def _post(self, category, action, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                f"/api/finance/categories/{category.id}/{action}/", data, format="json"
+            )
+
+    def _snapshot(self, tx_id):
+        return Transaction.objects.values_list(
+            "category_id", "category_name", "category_path", "category_root_id"
+        ).get(pk=tx_id)
+
+    def test_merge_moves_transactions_and_children_to_target(self):
+        response = self._post(self.cafe, "merge", {"target": self.dining.id})
+        self.assertEqual(response.status_code, 200, response.content)
+
+        self.assertEqual(
+            self._snapshot(self.cafe_tx),
+            (self.dining.id, "Nhà hàng", "Nhà hàng", self.dining.id),
+        )
+        self.assertEqual(
+            self._snapshot(self.latte_tx),
+            (self.latte.id, "Latte", "Nhà hàng / Latte", self.dining.id),
+        )
+        self.latte.refresh_from_db()
+        self.assertEqual(self.latte.parent_id, self.dining.id)
+        self.assertFalse(Category.objects.filter(pk=self.cafe.id).exists())
+
+    def test_move_rebases_subtree_snapshots(self):
+        response = self._post(self.cafe, "move", {"parent": None})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            self._snapshot(self.cafe_tx), (self.cafe.id, "Cafe", "Cafe", self.cafe.id)
+        )
+        self.assertEqual(
+            self._snapshot(self.latte_tx),
+            (self.latte.id, "Latte", "Cafe / Latte", self.cafe.id),
+        )
+
+    def test_refuses_incompatible_targets(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            other_wallet = WalletService.create_wallet(
+                self.user, name="Ví phụ", copy_master_categories=False
+            )
+        salary = self._category("Lương", transaction_type="INCOME")
+        elsewhere = self._category("Cafe", wallet=other_wallet)
+        for action, data in (
+            ("merge", {"target": salary.id}),
+            ("merge", {"target": elsewhere.id}),
+            ("merge", {"target": self.latte.id}),
+            ("move", {"parent": salary.id}),
+            ("move", {"parent": elsewhere.id}),
+            ("move", {"parent": self.latte.id}),
+        ):
+            with self.subTest(action=action, data=data):
+                response = self._post(self.cafe, action, data)
+                self.assertEqual(response.status_code, 400, response.content)
+        self.assertEqual(
+            self._snapshot(self.cafe_tx),
+            (self.cafe.id, "Cafe", "Ăn uống / Cafe", self.food.id),
+        )
+        self.cafe.refresh_from_db()
+        self.assertEqual((self.cafe.parent_id, self.cafe.deleted_at), (self.food.id, None))
+
+
+class CategoryTotalsTests(FinanceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("owner", password="secret")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.wallet = WalletService.create_wallet(
+                self.user, name="Ví chính", copy_master_categories=False
+            )
+        self.root = self._category("Ăn uống")
+        self.child = self._category("Cafe", self.root)
+        self.leaf = self._category("Latte", self.child)
+        for category, amount, occurred_at in (
+            (self.leaf, 10, datetime(2025, 3, 31, 23, 59, 59, tzinfo=dt_timezone.utc)),
+            (self.child, 20, datetime(2025, 3, 1, tzinfo=dt_timezone.utc)),
+            (self.root, 5, datetime(2025, 4, 1, tzinfo=dt_timezone.utc)),
+            (self.leaf, 7, datetime(2025, 2, 28, 23, 59, 59, tzinfo=dt_timezone.utc)),
+        ):
+            Transaction.objects.create(
+                wallet=self.wallet,
+                category=category,
+                transaction_type="EXPENSE",
+                amount=Decimal(amount),
+                occurred_at=occurred_at,
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _category(self, name, parent=None):
+        return Category.objects.create(
+            wallet=self.wallet, name=name, transaction_type="EXPENSE", parent=parent
+        )
+
+    def _totals(self, period, anchor):
+        response = self.client.get(
+            "/api/finance/categories/",
+            {"wallet": self.wallet.id, "with_totals": period, "date": anchor},
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return {
+            item["id"]: (
+                Decimal(item["totals"]["amount"]),
+                item["totals"]["count"],
+                Decimal(item["totals"]["subtree_amount"]),
+                item["totals"]["subtree_count"],
+            )
+            for item in response.json()
+        }
+
+    def test_resolve_period_boundaries(self):
+        utc = dt_timezone.utc
+        for period, anchor, expected in (
+            ("month", date(2025, 2, 14), (datetime(2025, 2, 1), datetime(2025, 3, 1))),
+            ("month", date(2025, 12, 31), (datetime(2025, 12, 1), datetime(2026, 1, 1))),
+            ("quarter", date(2025, 11, 30), (datetime(2025, 10, 1), datetime(2026, 1, 1))),
+            ("quarter", date(2025, 4, 1), (datetime(2025, 4, 1), datetime(2025, 7, 1))),
+            ("year", date(2025, 6, 15), (datetime(2025, 1, 1), datetime(2026, 1, 1))),
+        ):
+            with self.subTest(period=period, anchor=anchor):
+                self.assertEqual(
+                    CategoryTotalsService.resolve_period(period, anchor),
+                    tuple(value.replace(tzinfo=utc) for value in expected),
+                )
+        self.assertEqual(CategoryTotalsService.resolve_period("all"), (None, None))
+        with self.assertRaises(ValueError):
+            CategoryTotalsService.resolve_period("week")
+
+    def test_month_totals_roll_up_the_subtree(self):
+        self.assertEqual(
+            self._totals("month", "2025-03-15"),
+            {
+                self.root.id: (Decimal("0"), 0, Decimal("30"), 2),
+                self.child.id: (Decimal("20"), 1, Decimal("30"), 2),
+                self.leaf.id: (Decimal("10"), 1, Decimal("10"), 1),
+            },
+        )
+
+    def test_quarter_and_all_time_totals(self):
+        self.assertEqual(
+            self._totals("quarter", "2025-02-01"),
+            {
+                self.root.id: (Decimal("0"), 0, Decimal("37"), 3),
+                self.child.id: (Decimal("20"), 1, Decimal("37"), 3),
+                self.leaf.id: (Decimal("17"), 2, Decimal("17"), 2),
+            },
+        )
+        self.assertEqual(
+            self._totals("all", "2025-02-01")[self.root.id],
+            (Decimal("5"), 1, Decimal("42"), 4),
+        )
+
+    def test_rejects_unknown_period_and_bad_date(self):
+        for params in ({"with_totals": "week"}, {"with_totals": "month", "date": "03/2025"}):
+            with self.subTest(params=params):
+                response = self.client.get(
+                    "/api/finance/categories/", {"wallet": self.wallet.id, **params}
+                )
+                self.assertEqual(response.status_code, 400, response.content)
+
+
+class CategoryTreeCacheTests(FinanceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("owner", password="secret")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.wallet = WalletService.create_wallet(
+                self.user, name="Ví chính", copy_master_categories=False
+            )
+        self.food = self._category("Ăn uống")
+        self.cafe = self._category("Cafe", self.food)
+        self.latte = self._category("Latte", self.cafe)
+        self.dining = self._category("Nhà hàng")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        # Cây đầu tiên được cache; mỗi test kiểm tra thao tác ghi làm nó hết hạn.
+        self._tree()
+
+    def _category(self, name, parent=None):
+        return Category.objects.create(
+            wallet=self.wallet, name=name, transaction_type="EXPENSE", parent=parent
+        )
+
+    def _tree(self):
+        response = self.client.get("/api/finance/categories/tree/", {"wallet": self.wallet.id})
+        self.assertEqual(response.status_code, 200, response.content)
+
+        def shape(nodes):
+            return {node["name"]: shape(node["children"]) for node in nodes}
+
+        return shape(response.json())
+
+    def _post(self, category, action, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"/api/finance/categories/{category.id}/{action}/", data, format="json"
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_tree_is_served_from_cache(self):
+        with self.assertNumQueries(0):
+            CategoryTreeService.tree(self.wallet.id)
+
+    def test_merge_invalidates_tree(self):
+        self._post(self.cafe, "merge", {"target": self.dining.id})
+        self.assertEqual(
+            self._tree(), {"Ăn uống": {}, "Nhà hàng": {"Latte": {}}}
+        )
+
+    def test_move_invalidates_tree(self):
+        self._post(self.latte, "move", {"parent": self.dining.id})
+        self.assertEqual(
+            self._tree(), {"Ăn uống": {"Cafe": {}}, "Nhà hàng": {"Latte": {}}}
+        )
+
+    def test_delete_and_restore_invalidate_tree(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f"/api/finance/categories/{self.cafe.id}/")
+        self.assertEqual(response.status_code, 204, response.content)
+        self.assertEqual(self._tree(), {"Ăn uống": {}, "Nhà hàng": {}})
+        self._post(self.cafe, "restore", {})
+        self.assertEqual(
+            self._tree(), {"Ăn uống": {"Cafe": {"Latte": {}}}, "Nhà hàng": {}}
+        )
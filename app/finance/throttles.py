@@ -0,0 +1,100 @@
+import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Giới hạn tần suất theo thuật toán token bucket, trạng thái bucket lưu trong
+    cache của Django (`FINANCE_THROTTLE_CACHE`) nên không phát sinh query DB.
+
+    Mỗi request thuộc một scope: view có thể khai báo `throttle_scope_map`
+    (action -> scope), mặc định request đọc dùng `finance_read` và request ghi
+    dùng `finance_write`. Cấu hình bucket nằm trong `FINANCE_THROTTLE_BUCKETS`.
+
+    Đọc-sửa-ghi bucket được tuần tự hoá bằng khoá theo từng bucket (`cache.add`
+    là thao tác nguyên tử trên mọi cache backend dùng chung), để các request
+    đồng thời của cùng một người dùng không cùng lấy một token. Không giành
+    được khoá trong `LOCK_WAIT` giây thì request bị từ chối như hết token.
+    Khoá mang token riêng của request giữ nó và chỉ bị xoá khi còn đúng token
+    đó, nên request chạy quá `LOCK_TIMEOUT` không xoá nhầm khoá của request
+    khác đã giành được sau khi khoá cũ hết hạn.
+    """
+
+    READ_SCOPE = "finance_read"
+    WRITE_SCOPE = "finance_write"
+    CACHE_KEY = "throttle:{scope}:{ident}"
+    LOCK_KEY = "{key}:lock"
+    # Khoá tự hết hạn nếu tiến trình giữ khoá chết giữa chừng.
+    LOCK_TIMEOUT = 1
+    LOCK_WAIT = 0.05
+    LOCK_RETRY_INTERVAL = 0.002
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_scope(self, request, view) -> str:
+        scope_map = getattr(view, "throttle_scope_map", {})
+        action = getattr(view, "action", None)
+        if action in scope_map:
+            return scope_map[action]
+        return self.READ_SCOPE if request.method in SAFE_METHODS else self.WRITE_SCOPE
+
+    def get_cache_key(self, request, scope: str) -> str:
+        if request.user and request.user.is_authenticated:
+            ident = f"user:{request.user.id}"
+        else:
+            ident = f"ip:{self.get_ident(request)}"
+        return self.CACHE_KEY.format(scope=scope, ident=ident)
+
+    def allow_request(self, request, view) -> bool:
+        scope = self.get_scope(request, view)
+        bucket = settings.FINANCE_THROTTLE_BUCKETS.get(scope)
+        if not bucket:
+            return True
+
+        capacity = bucket["capacity"]
+        refill_rate = bucket["refill_rate"]
+        store = caches[settings.FINANCE_THROTTLE_CACHE]
+        key = self.get_cache_key(request, scope)
+        lock = self.LOCK_KEY.format(key=key)
+        owner = self.acquire(store, lock)
+        if owner is None:
+            self.wait_seconds = 1 / refill_rate
+            return False
+
+        try:
+            now = time.time()
+            tokens, updated_at = store.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+            timeout = int(capacity / refill_rate) + 1
+
+            if tokens < 1:
+                store.set(key, (tokens, now), timeout)
+                self.wait_seconds = (1 - tokens) / refill_rate
+                return False
+
+            store.set(key, (tokens - 1, now), timeout)
+            return True
+        finally:
+            self.release(store, lock, owner)
+
+    def acquire(self, store, lock: str) -> str | None:
+        owner = uuid4().hex
+        deadline = time.monotonic() + self.LOCK_WAIT
+        while not store.add(lock, owner, self.LOCK_TIMEOUT):
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(self.LOCK_RETRY_INTERVAL)
+        return owner
+
+    def release(self, store, lock: str, owner: str) -> None:
+        if store.get(lock) == owner:
+            store.delete(lock)
+
+    def wait(self):
+        return self.wait_seconds
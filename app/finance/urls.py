@@ -1,10 +1,15 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
 from app.finance.views import (
+    CategorizationRuleViewSet,
     CategoryTemplateViewSet,
     CategoryViewSet,
+    JobViewSet,
+    OutboxEventViewSet,
     TransactionViewSet,
     WalletViewSet,
+    wallet_event_stream,
 )
 
 router = DefaultRouter()
@@ -14,6 +19,14 @@ router.register(r"transactions", TransactionViewSet, basename="transaction")
 router.register(
     r"category-templates", CategoryTemplateViewSet, basename="category-template"
 )
+router.register(
+    r"categorization-rules", CategorizationRuleViewSet, basename="categorization-rule"
+)
+router.register(r"jobs", JobViewSet, basename="job")
+router.register(r"events", OutboxEventViewSet, basename="event")
 
-urlpatterns = router.urls
+urlpatterns = [
+    path("stream/", wallet_event_stream, name="finance-stream"),
+    *router.urls,
+]
 
@@ -2,11 +2,19 @@ from .wallet_views import WalletViewSet
 from .category_views import CategoryViewSet
 from .transaction_views import TransactionViewSet
 from .category_template_views import CategoryTemplateViewSet
+from .categorization_rule_views import CategorizationRuleViewSet
+from .job_views import JobViewSet
+from .outbox_views import OutboxEventViewSet
+from .realtime_views import wallet_event_stream
 
 __all__ = [
     "WalletViewSet",
     "CategoryViewSet",
     "TransactionViewSet",
     "CategoryTemplateViewSet",
+    "CategorizationRuleViewSet",
+    "JobViewSet",
+    "OutboxEventViewSet",
+    "wallet_event_stream",
 ]
 
@@ -0,0 +1,83 @@
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from rest_framework import status, viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from app.finance.repositories import CategorizationRuleRepository
+from app.finance.serializers import CategorizationRuleSerializer
+from app.finance.services import CategorizationService, WalletAccessService
+from app.finance.throttles import TokenBucketThrottle
+from app.finance.views.decorators import idempotent
+from app.finance.views.mixins import ReplicaReadMixin
+
+
+@extend_schema_view(
+    list=extend_schema(
+        tags=["Finance - Categorization Rules"], summary="Danh sách quy tắc phân loại"
+    ),
+    create=extend_schema(
+        tags=["Finance - Categorization Rules"], summary="Tạo quy tắc phân loại"
+    ),
+    retrieve=extend_schema(
+        tags=["Finance - Categorization Rules"], summary="Chi tiết quy tắc phân loại"
+    ),
+    update=extend_schema(
+        tags=["Finance - Categorization Rules"], summary="Cập nhật quy tắc phân loại"
+    ),
+    partial_update=extend_schema(
+        tags=["Finance - Categorization Rules"],
+        summary="Cập nhật một phần quy tắc phân loại",
+    ),
+    destroy=extend_schema(
+        tags=["Finance - Categorization Rules"], summary="Xoá quy tắc phân loại"
+    ),
+)
+class CategorizationRuleViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [TokenBucketThrottle]
+    serializer_class = CategorizationRuleSerializer
+    filterset_fields = ["wallet", "category", "match_type", "match_field", "is_active"]
+    ordering_fields = ["priority", "created_at", "pattern"]
+    search_fields = ["pattern"]
+
+    def get_queryset(self):
+        return CategorizationRuleRepository.for_wallets(
+            WalletAccessService.accessible_wallet_ids(self.request.user)
+        )
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        data = serializer.validated_data.copy()
+        wallet = data.pop("wallet")
+        WalletAccessService.check_write_access(request.user, wallet.id)
+
+        rule = CategorizationService.create_rule(wallet, **data)
+        output_serializer = self.get_serializer(rule)
+        headers = self.get_success_headers(output_serializer.data)
+        return Response(
+            output_serializer.data, status=status.HTTP_201_CREATED, headers=headers
+        )
+
+    @idempotent
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
+    def perform_update(self, serializer):
+        WalletAccessService.check_write_access(self.request.user, serializer.instance.wallet_id)
+        if "wallet" in serializer.validated_data:
+            WalletAccessService.check_write_access(
+                self.request.user, serializer.validated_data["wallet"].id
+            )
+        serializer.instance = CategorizationService.update_rule(
+            serializer.instance, **serializer.validated_data
+        )
+
+    @idempotent
+    def destroy(self, request, *args, **kwargs):
+        rule = self.get_object()
+        WalletAccessService.check_write_access(request.user, rule.wallet_id)
+        CategorizationService.delete_rule(rule)
+        return Response(status=status.HTTP_204_NO_CONTENT)
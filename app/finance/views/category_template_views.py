@@ -1,10 +1,16 @@
 from django.db import models as django_models
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-from app.finance.models import CategoryTemplate
+from app.finance.models import CategoryTemplate, TransactionType
 from app.finance.serializers import CategoryTemplateSerializer
+from app.finance.services import CategoryTreeService
+from app.finance.throttles import TokenBucketThrottle
+from app.finance.views.mixins import ReplicaReadMixin
 
 
 CATEGORY_TEMPLATE_SEARCH_FIELDS = [
@@ -22,11 +28,29 @@ CATEGORY_TEMPLATE_SEARCH_FIELDS += ["parent__name"]
         tags=["Finance - Master Categories"], summary="Danh sách master category"
     )
 )
-class CategoryTemplateViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+class CategoryTemplateViewSet(
+    ReplicaReadMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+):
     permission_classes = [IsAuthenticated]
+    throttle_classes = [TokenBucketThrottle]
     serializer_class = CategoryTemplateSerializer
     queryset = CategoryTemplate.objects.select_related("parent").all()
     filterset_fields = "__all__"
     ordering_fields = "__all__"
     search_fields = CATEGORY_TEMPLATE_SEARCH_FIELDS
 
+    @extend_schema(
+        tags=["Finance - Master Categories"],
+        summary="Cây master category lồng nhau",
+        parameters=[
+            OpenApiParameter(
+                "transaction_type", str, enum=TransactionType.values, description="Chỉ lấy một loại"
+            ),
+        ],
+        responses=OpenApiTypes.OBJECT,
+    )
+    @action(detail=False, methods=["get"])
+    def tree(self, request):
+        return Response(
+            CategoryTreeService.template_tree(request.query_params.get("transaction_type") or None)
+        )
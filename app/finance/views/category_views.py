@@ -1,14 +1,32 @@
 from django.db import models as django_models
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from django.utils.dateparse import parse_date
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from rest_framework import status, viewsets
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from app.finance.models import Category
-from app.finance.repositories import WalletRepository
-from app.finance.serializers import CategorySerializer
-from app.finance.services import CategoryService
+from app.finance.models import Category, TotalsPeriod, TransactionType
+from app.finance.repositories import CategoryRepository
+from app.finance.serializers import (
+    CategoryMergeSerializer,
+    CategoryMoveSerializer,
+    CategorySerializer,
+    CategoryWithTotalsSerializer,
+    DeletedCategorySerializer,
+)
+from app.finance.services import (
+    CategorizationService,
+    CategoryService,
+    CategoryTotalsService,
+    CategoryTreeService,
+    WalletAccessService,
+)
+from app.finance.throttles import TokenBucketThrottle
+from app.finance.views.decorators import idempotent
+from app.finance.views.mixins import ReplicaReadMixin
 
 
 CATEGORY_SEARCH_FIELDS = [
@@ -27,7 +45,24 @@ CATEGORY_SEARCH_FIELDS += [
 
 
 @extend_schema_view(
-    list=extend_schema(tags=["Finance - Categories"], summary="Danh sách category"),
+    list=extend_schema(
+        tags=["Finance - Categories"],
+        summary="Danh sách category",
+        parameters=[
+            OpenApiParameter(
+                "with_totals",
+                str,
+                enum=TotalsPeriod.values,
+                description="Kèm tổng tiền/số giao dịch trong kỳ của category và cây con",
+            ),
+            OpenApiParameter(
+                "date",
+                OpenApiTypes.DATE,
+                description="Ngày thuộc kỳ cần tính với `with_totals` (mặc định hôm nay)",
+            ),
+        ],
+        responses=CategoryWithTotalsSerializer(many=True),
+    ),
     create=extend_schema(tags=["Finance - Categories"], summary="Tạo category mới"),
     retrieve=extend_schema(tags=["Finance - Categories"], summary="Chi tiết category"),
     update=extend_schema(tags=["Finance - Categories"], summary="Cập nhật category"),
@@ -36,30 +71,76 @@ CATEGORY_SEARCH_FIELDS += [
     ),
     destroy=extend_schema(tags=["Finance - Categories"], summary="Xoá category"),
 )
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
+    throttle_classes = [TokenBucketThrottle]
     serializer_class = CategorySerializer
     filterset_fields = "__all__"
     ordering_fields = "__all__"
     search_fields = CATEGORY_SEARCH_FIELDS
+    # Các action làm việc trên category đã xoá mềm.
+    trash_actions = frozenset({"trash", "restore"})
+
+    def get_serializer_class(self):
+        if self.action == "trash":
+            return DeletedCategorySerializer
+        if self.action == "merge":
+            return CategoryMergeSerializer
+        if self.action == "move":
+            return CategoryMoveSerializer
+        return super().get_serializer_class()
 
     def get_queryset(self):
         wallet_id = self.request.query_params.get("wallet")
+        if self.action in self.trash_actions:
+            wallet_ids = WalletAccessService.accessible_wallet_ids(self.request.user)
+            queryset = CategoryRepository.deleted_for_wallets(wallet_ids)
+            return queryset.filter(wallet_id=wallet_id) if wallet_id else queryset
         if wallet_id:
-            wallet = WalletRepository.get_by_id(wallet_id)
-            self._check_wallet_permission(wallet.owner_id)
-            return CategoryService.list_categories(wallet)
-        return Category.objects.filter(wallet__owner=self.request.user).select_related(
-            "wallet", "parent", "template"
+            WalletAccessService.check_access(self.request.user, wallet_id)
+            return CategoryService.list_categories(int(wallet_id))
+        return CategoryRepository.for_wallets(
+            WalletAccessService.accessible_wallet_ids(self.request.user)
         )
 
+    def list(self, request, *args, **kwargs):
+        period = request.query_params.get("with_totals")
+        if not period:
+            return super().list(request, *args, **kwargs)
+        anchor = None
+        if request.query_params.get("date"):
+            try:
+                anchor = parse_date(request.query_params["date"])
+            except ValueError:
+                anchor = None
+            if anchor is None:
+                raise ValidationError({"date": "Ngày không hợp lệ (định dạng YYYY-MM-DD)."})
+        try:
+            since, until = CategoryTotalsService.resolve_period(period, anchor)
+        except ValueError as exc:
+            raise ValidationError({"with_totals": str(exc)})
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        categories = list(page if page is not None else queryset)
+        totals = CategoryTotalsService.totals(
+            {category.wallet_id for category in categories}, since, until
+        )
+        serializer = CategoryWithTotalsSerializer(
+            categories, many=True, context={**self.get_serializer_context(), "totals": totals}
+        )
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         data = serializer.validated_data.copy()
-        wallet = WalletRepository.get_by_id(data.pop("wallet").id)
-        self._check_wallet_permission(wallet.owner_id)
+        wallet = data.pop("wallet")
+        WalletAccessService.check_write_access(request.user, wallet.id)
 
         category = CategoryService.create_category(wallet, **data)
         output_serializer = self.get_serializer(category)
@@ -68,17 +149,120 @@ class CategoryViewSet(viewsets.ModelViewSet):
             output_serializer.data, status=status.HTTP_201_CREATED, headers=headers
         )
 
+    @idempotent
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
     def perform_update(self, serializer):
-        wallet = serializer.instance.wallet
-        self._check_wallet_permission(wallet.owner_id)
-        serializer.save()
+        WalletAccessService.check_write_access(self.request.user, serializer.instance.wallet_id)
+        if "wallet" in serializer.validated_data:
+            WalletAccessService.check_write_access(
+                self.request.user, serializer.validated_data["wallet"].id
+            )
+        serializer.instance = CategoryService.update_category(
+            serializer.instance, **serializer.validated_data
+        )
 
+    @idempotent
     def destroy(self, request, *args, **kwargs):
         category = self.get_object()
-        self._check_wallet_permission(category.wallet.owner_id)
-        return super().destroy(request, *args, **kwargs)
+        WalletAccessService.check_write_access(request.user, category.wallet_id)
+        try:
+            CategoryService.delete_category(category)
+        except ValueError as exc:
+            raise ValidationError({"detail": str(exc)})
+        response = Response(status=status.HTTP_204_NO_CONTENT)
+        # Quy tắc phân loại trỏ tới category đã xoá không còn được áp dụng.
+        CategorizationService.invalidate(category.wallet_id)
+        return response
 
-    def _check_wallet_permission(self, owner_id: int):
-        if owner_id != self.request.user.id:
-            raise PermissionDenied("Bạn không có quyền truy cập ví này.")
+    @extend_schema(
+        tags=["Finance - Categories"],
+        summary="Cây category lồng nhau của ví",
+        parameters=[
+            OpenApiParameter("wallet", int, required=True, description="Ví cần lấy cây category"),
+            OpenApiParameter(
+                "transaction_type", str, enum=TransactionType.values, description="Chỉ lấy một loại"
+            ),
+        ],
+        responses=OpenApiTypes.OBJECT,
+    )
+    @action(detail=False, methods=["get"])
+    def tree(self, request):
+        wallet_id = request.query_params.get("wallet")
+        if not wallet_id or not wallet_id.isdigit():
+            raise ValidationError({"wallet": "Cần truyền id ví."})
+        WalletAccessService.check_access(request.user, int(wallet_id))
+        return Response(
+            CategoryTreeService.tree(
+                int(wallet_id), request.query_params.get("transaction_type") or None
+            )
+        )
+
+    @extend_schema(
+        tags=["Finance - Categories"],
+        summary="Category đã xoá (thùng rác), khôi phục được tới khi bị dọn",
+    )
+    @action(detail=False, methods=["get"], url_path="trash")
+    def trash(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        return Response(self.get_serializer(queryset, many=True).data)
+
+    @extend_schema(
+        tags=["Finance - Categories"],
+        summary="Khôi phục category đã xoá cùng các category con bị xoá chung",
+        request=None,
+        responses=CategorySerializer,
+    )
+    @action(detail=True, methods=["post"])
+    @idempotent
+    def restore(self, request, pk=None):
+        category = self.get_object()
+        WalletAccessService.check_write_access(request.user, category.wallet_id)
+        try:
+            restored = CategoryService.restore_category(category)
+        except ValueError as exc:
+            raise ValidationError({"detail": str(exc)})
+        CategorizationService.invalidate(category.wallet_id)
+        return Response(CategorySerializer(restored).data)
+
+    @extend_schema(
+        tags=["Finance - Categories"],
+        summary="Gộp category vào category khác, chuyển toàn bộ giao dịch và category con",
+        responses=CategorySerializer,
+    )
+    @action(detail=True, methods=["post"])
+    @idempotent
+    def merge(self, request, pk=None):
+        source = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        WalletAccessService.check_write_access(request.user, source.wallet_id)
+        try:
+            target = CategoryService.merge_category(source, serializer.validated_data["target"])
+        except ValueError as exc:
+            raise ValidationError({"detail": str(exc)})
+        CategorizationService.invalidate(source.wallet_id)
+        return Response(CategorySerializer(target).data)
 
+    @extend_schema(
+        tags=["Finance - Categories"],
+        summary="Chuyển category cùng category con sang category cha khác",
+        responses=CategorySerializer,
+    )
+    @action(detail=True, methods=["post"])
+    @idempotent
+    def move(self, request, pk=None):
+        category = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        WalletAccessService.check_write_access(request.user, category.wallet_id)
+        try:
+            moved = CategoryService.move_category(category, serializer.validated_data["parent"])
+        except ValueError as exc:
+            raise ValidationError({"detail": str(exc)})
+        return Response(CategorySerializer(moved).data)
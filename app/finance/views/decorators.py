@@ -0,0 +1,67 @@
+from functools import wraps
+
+from django.db import transaction
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from app.finance.services import IdempotencyService
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+def idempotent(view_method):
+    """
+    Cho phép client gửi lại cùng một request ghi với header `Idempotency-Key`
+    mà không áp dụng thay đổi hai lần; response thành công đầu tiên được lưu
+    lại và trả về cho các lần gửi lại.
+    """
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IdempotencyService.HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise ValidationError(
+                {IdempotencyService.HEADER: "Idempotency-Key tối đa 255 ký tự."}
+            )
+
+        fingerprint = IdempotencyService.fingerprint(
+            request.method, request.path, request.data
+        )
+        record = IdempotencyService.lookup(request.user.id, key)
+        if record is not None:
+            return _replay(record, fingerprint)
+
+        with transaction.atomic():
+            record = IdempotencyService.reserve(request.user.id, key, fingerprint)
+            if record is None:
+                return _replay(IdempotencyService.lookup(request.user.id, key), fingerprint)
+
+            response = view_method(self, request, *args, **kwargs)
+            if status.is_success(response.status_code):
+                IdempotencyService.complete(record, response.status_code, response.data)
+            else:
+                transaction.set_rollback(True)
+        return response
+
+    return wrapper
+
+
+def _replay(record, fingerprint: str) -> Response:
+    if record is None or record.response_status is None:
+        return Response(
+            {"detail": "Request với Idempotency-Key này đang được xử lý."},
+            status=status.HTTP_409_CONFLICT,
+        )
+    if record.request_fingerprint != fingerprint:
+        return Response(
+            {"detail": "Idempotency-Key đã được dùng cho một request khác."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    return Response(
+        record.response_body,
+        status=record.response_status,
+        headers={"Idempotent-Replayed": "true"},
+    )
@@ -0,0 +1,66 @@
+from django.http import FileResponse, Http404
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from django.urls import reverse
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from app.finance.models import JobStatus
+from app.finance.serializers import JobSerializer
+from app.finance.services import JobService
+from app.finance.throttles import TokenBucketThrottle
+from app.finance.views.decorators import idempotent
+from app.finance.views.mixins import ReplicaReadMixin
+
+
+def job_accepted(job, request) -> Response:
+    """Response `202` cho request đã được chuyển thành job nền."""
+    return Response(
+        JobSerializer(job, context={"request": request}).data,
+        status=status.HTTP_202_ACCEPTED,
+        headers={"Location": request.build_absolute_uri(reverse("job-detail", args=[job.pk]))},
+    )
+
+
+@extend_schema_view(
+    list=extend_schema(tags=["Finance - Jobs"], summary="Danh sách job nền của người dùng"),
+    retrieve=extend_schema(tags=["Finance - Jobs"], summary="Trạng thái và tiến độ job"),
+)
+class JobViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [TokenBucketThrottle]
+    serializer_class = JobSerializer
+    filterset_fields = ["kind", "status", "wallet"]
+    ordering_fields = ["created_at", "finished_at"]
+    # Tiến độ job thay đổi liên tục, đọc từ replica sẽ bị trễ.
+    replica_actions = frozenset()
+
+    def get_queryset(self):
+        return JobService.list_jobs(self.request.user)
+
+    @extend_schema(
+        tags=["Finance - Jobs"], summary="Tải file kết quả của job", responses=OpenApiTypes.BINARY
+    )
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        job = self.get_object()
+        if job.status != JobStatus.SUCCEEDED or not job.result_file:
+            raise Http404("Job chưa có file kết quả.")
+        return FileResponse(
+            job.result_file.open("rb"),
+            as_attachment=True,
+            filename=job.result_file.name.rsplit("/", 1)[-1],
+        )
+
+    @extend_schema(tags=["Finance - Jobs"], summary="Huỷ job đang chờ", request=None)
+    @action(detail=True, methods=["post"])
+    @idempotent
+    def cancel(self, request, pk=None):
+        try:
+            job = JobService.cancel(self.get_object())
+        except ValueError as exc:
+            raise ValidationError({"status": str(exc)})
+        return Response(self.get_serializer(job).data)
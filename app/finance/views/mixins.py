@@ -0,0 +1,42 @@
+from rest_framework import status
+from rest_framework.permissions import SAFE_METHODS
+
+from TusWhole.db_router import (
+    enable_replica,
+    is_pinned_to_primary,
+    pin_to_primary,
+    replica_configured,
+    reset_replica,
+)
+
+
+class ReplicaReadMixin:
+    """
+    Cho các action chỉ đọc (`replica_actions`) truy vấn từ database replica, trừ
+    khi người dùng vừa ghi dữ liệu; request ghi thành công sẽ giữ người dùng
+    trên primary trong `FINANCE_REPLICA_STICKY_SECONDS`.
+    """
+
+    replica_actions = frozenset({"list", "retrieve"})
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            replica_configured()
+            and self.action in self.replica_actions
+            and not is_pinned_to_primary(request.user.id)
+        ):
+            self._replica_token = enable_replica()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_replica_token", None)
+        if token is not None:
+            reset_replica(token)
+            self._replica_token = None
+        if (
+            request.method not in SAFE_METHODS
+            and status.is_success(response.status_code)
+            and request.user.is_authenticated
+        ):
+            pin_to_primary(request.user.id)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,103 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from app.finance.serializers import (
+    OutboxAckSerializer,
+    OutboxConsumerSerializer,
+    OutboxEventSerializer,
+    OutboxPollSerializer,
+)
+from app.finance.services import OutboxService
+from app.finance.throttles import TokenBucketThrottle
+from app.finance.views.decorators import idempotent
+from app.finance.views.mixins import ReplicaReadMixin
+
+CONSUMER_NAME = r"(?P<name>[\w.-]{1,100})"
+
+
+class OutboxEventViewSet(ReplicaReadMixin, viewsets.GenericViewSet):
+    """
+    Đọc nhật ký thay đổi theo offset. Người dùng thường chỉ thấy sự kiện của ví
+    mình được truy cập; tài khoản staff thấy toàn bộ (dùng cho tích hợp).
+    """
+
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [TokenBucketThrottle]
+    serializer_class = OutboxEventSerializer
+    # Consumer cần thấy sự kiện ngay sau khi ghi, không đọc từ replica.
+    replica_actions = frozenset()
+
+    def _poll_params(self, request) -> dict:
+        serializer = OutboxPollSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def _events_response(self, events, after: int, **extra) -> Response:
+        return Response(
+            {
+                **extra,
+                "events": OutboxEventSerializer(events, many=True).data,
+                "next": events[-1].position if events else after,
+            }
+        )
+
+    @extend_schema(
+        tags=["Finance - Events"],
+        summary="Đọc sự kiện thay đổi sau offset (long-poll với `wait`)",
+        parameters=[OutboxPollSerializer],
+        responses=OpenApiTypes.OBJECT,
+    )
+    def list(self, request):
+        params = self._poll_params(request)
+        events = OutboxService.wait(
+            request.user,
+            params["after"],
+            params["limit"],
+            params.get("wallet"),
+            timeout=params["wait"],
+        )
+        return self._events_response(events, params["after"])
+
+    @extend_schema(
+        tags=["Finance - Events"],
+        summary="Lô sự kiện tiếp theo của consumer (theo offset đã ack)",
+        parameters=[OutboxPollSerializer],
+        responses=OpenApiTypes.OBJECT,
+    )
+    @action(detail=False, methods=["get"], url_path=f"consumers/{CONSUMER_NAME}")
+    def consumer(self, request, name=None):
+        params = self._poll_params(request)
+        consumer = OutboxService.consumer(request.user, name)
+        events = OutboxService.wait(
+            request.user,
+            consumer.position,
+            params["limit"],
+            params.get("wallet"),
+            timeout=params["wait"],
+        )
+        return self._events_response(
+            events, consumer.position, consumer=OutboxConsumerSerializer(consumer).data
+        )
+
+    @extend_schema(
+        tags=["Finance - Events"],
+        summary="Ghi nhận offset đã xử lý của consumer",
+        request=OutboxAckSerializer,
+        responses=OutboxConsumerSerializer,
+    )
+    @action(detail=False, methods=["post"], url_path=f"consumers/{CONSUMER_NAME}/ack")
+    @idempotent
+    def ack(self, request, name=None):
+        serializer = OutboxAckSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        consumer = OutboxService.consumer(request.user, name)
+        try:
+            consumer = OutboxService.ack(consumer, serializer.validated_data["position"])
+        except ValueError as exc:
+            raise ValidationError({"position": str(exc)})
+        return Response(OutboxConsumerSerializer(consumer).data)
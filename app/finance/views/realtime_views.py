@@ -0,0 +1,77 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed
+
+from app.api.authentication import StatelessJWTAuthentication
+from app.finance.realtime import RESYNC, get_broker
+from app.finance.services import RealtimeService
+
+HEARTBEAT = ": ping\n\n"
+
+
+def _authenticate(request):
+    """
+    Xác thực như API thường (header `Authorization: Bearer ...`); `EventSource`
+    của trình duyệt không gửi được header nên chấp nhận thêm `?access_token=`.
+    """
+    authentication = StatelessJWTAuthentication()
+    result = authentication.authenticate(request)
+    if result is not None:
+        return result[0]
+    raw_token = request.GET.get("access_token")
+    if raw_token:
+        return authentication.get_user(authentication.get_validated_token(raw_token))
+    return None
+
+
+async def _event_stream(user_id: int):
+    subscription = await get_broker().subscribe(user_id)
+    try:
+        # Đăng ký trước rồi mới gửi snapshot để không lỡ thay đổi xen giữa hai bước.
+        snapshot = await sync_to_async(RealtimeService.snapshot)(user_id)
+        yield RealtimeService.format_event(RealtimeService.SNAPSHOT, snapshot)
+        while True:
+            try:
+                message = await subscription.get(settings.FINANCE_REALTIME_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield HEARTBEAT
+                continue
+            if message is RESYNC:
+                snapshot = await sync_to_async(RealtimeService.snapshot)(user_id)
+                yield RealtimeService.format_event(RealtimeService.SNAPSHOT, snapshot)
+            else:
+                yield RealtimeService.format_event(message["event"], message["data"])
+    finally:
+        await subscription.close()
+
+
+@require_GET
+async def wallet_event_stream(request):
+    """
+    Luồng Server-Sent Events của người dùng: `snapshot` (số dư mọi ví khi kết
+    nối), sau đó `balance` và `transaction` mỗi khi giao dịch của ví được
+    commit. Cần chạy qua ASGI (`TusWhole.asgi:application`).
+    """
+    if not isinstance(request, ASGIRequest):
+        # Dưới WSGI, Django đọc hết iterator bất đồng bộ trước khi trả response.
+        return JsonResponse({"detail": "Luồng sự kiện chỉ hỗ trợ khi chạy qua ASGI."}, status=501)
+    try:
+        user = await sync_to_async(_authenticate)(request)
+    except AuthenticationFailed as exc:
+        detail = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+        return JsonResponse(detail, status=401)
+    if user is None:
+        return JsonResponse({"detail": "Thông tin xác thực không được cung cấp."}, status=401)
+
+    response = StreamingHttpResponse(
+        _event_stream(user.id), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # Tắt buffer của nginx để sự kiện tới client ngay.
+    response["X-Accel-Buffering"] = "no"
+    return response
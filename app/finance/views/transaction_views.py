@@ -1,33 +1,58 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import models as django_models
-from drf_spectacular.utils import extend_schema, extend_schema_view
-from rest_framework import status, viewsets
-from rest_framework.exceptions import PermissionDenied, ValidationError
-from rest_framework.permissions import IsAuthenticated
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from rest_framework import filters, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
 from rest_framework.response import Response
 
-from app.finance.filtersets import TransactionFilterSet
-from app.finance.models import Transaction
-from app.finance.serializers import TransactionSerializer
-from app.finance.services import TransactionService
+from app.finance.filtersets import TransactionArchiveFilterSet, TransactionFilterSet
+from app.finance.models import JobKind, Transaction
+from app.finance.repositories import TransactionArchiveRepository, TransactionRepository
+from app.finance.serializers import (
+    DeletedTransactionSerializer,
+    TransactionBatchSerializer,
+    TransactionImportSerializer,
+    TransactionSerializer,
+)
+from app.finance.services import (
+    JobService,
+    TransactionArchiveService,
+    TransactionImportService,
+    TransactionService,
+    WalletAccessService,
+)
+from app.finance.throttles import TokenBucketThrottle
+from app.finance.views.decorators import idempotent
+from app.finance.views.job_views import job_accepted
+from app.finance.views.mixins import ReplicaReadMixin
 
 
+# Tên/đường dẫn category đã được lưu sẵn trên giao dịch nên tìm theo category không
+# cần join; tên ví và chủ ví vẫn tìm qua join như trước.
 TRANSACTION_SEARCH_FIELDS = [
     field.name
     for field in Transaction._meta.get_fields()
     if getattr(field, "attname", None)
     and field.concrete
     and isinstance(field, (django_models.CharField, django_models.TextField))
-]
-TRANSACTION_SEARCH_FIELDS += [
-    "wallet__name",
-    "wallet__owner__username",
-    "category__name",
-    "category__parent__name",
-]
+] + ["wallet__name", "wallet__owner__username"]
 
 
 @extend_schema_view(
-    list=extend_schema(tags=["Finance - Transactions"], summary="Danh sách giao dịch"),
+    list=extend_schema(
+        tags=["Finance - Transactions"],
+        summary="Danh sách giao dịch",
+        parameters=[
+            OpenApiParameter(
+                "include_archived",
+                bool,
+                description="Đọc cả giao dịch đã lưu trữ dù khoảng thời gian không chạm tới",
+            )
+        ],
+    ),
     create=extend_schema(tags=["Finance - Transactions"], summary="Tạo giao dịch"),
     retrieve=extend_schema(tags=["Finance - Transactions"], summary="Chi tiết giao dịch"),
     update=extend_schema(tags=["Finance - Transactions"], summary="Cập nhật giao dịch"),
@@ -36,31 +61,93 @@ TRANSACTION_SEARCH_FIELDS += [
     ),
     destroy=extend_schema(tags=["Finance - Transactions"], summary="Xoá giao dịch"),
 )
-class TransactionViewSet(viewsets.ModelViewSet):
+class TransactionViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope_map = {"batch": "finance_bulk", "import_transactions": "finance_bulk"}
     serializer_class = TransactionSerializer
     filterset_class = TransactionFilterSet
     ordering_fields = "__all__"
     search_fields = TRANSACTION_SEARCH_FIELDS
+    # Các action làm việc trên giao dịch đã xoá mềm.
+    trash_actions = frozenset({"trash", "restore"})
+
+    def get_serializer_class(self):
+        if self.action == "trash":
+            return DeletedTransactionSerializer
+        if self.action == "batch":
+            return TransactionBatchSerializer
+        if self.action == "import_transactions":
+            return TransactionImportSerializer
+        return super().get_serializer_class()
 
     def get_queryset(self):
         wallet_id = self.request.query_params.get("wallet")
-        queryset = Transaction.objects.filter(wallet__owner=self.request.user).select_related(
-            "wallet", "category"
-        )
+        wallet_ids = WalletAccessService.accessible_wallet_ids(self.request.user)
+        if self.action in self.trash_actions:
+            queryset = TransactionRepository.deleted_for_wallets(wallet_ids)
+        else:
+            queryset = TransactionRepository.for_wallets(wallet_ids)
+        if self.request.method not in SAFE_METHODS:
+            queryset = queryset.select_related("wallet", "category")
         if wallet_id:
             queryset = queryset.filter(wallet_id=wallet_id)
         return queryset
 
+    def get_archived_queryset(self):
+        wallet_id = self.request.query_params.get("wallet")
+        queryset = TransactionArchiveRepository.for_wallets(
+            WalletAccessService.accessible_wallet_ids(self.request.user)
+        )
+        if wallet_id:
+            queryset = queryset.filter(wallet_id=wallet_id)
+        queryset = TransactionArchiveFilterSet(
+            self.request.query_params, queryset=queryset, request=self.request
+        ).qs
+        return filters.SearchFilter().filter_queryset(self.request, queryset, self)
+
+    def reads_archive(self) -> bool:
+        params = self.request.query_params
+        if params.get("include_archived", "").lower() in {"1", "true", "yes"}:
+            return True
+        filterset = self.filterset_class(params, queryset=self.get_queryset(), request=self.request)
+        if not filterset.is_valid():
+            return False
+        since = filterset.occurred_lower_bound()
+        if since is None:
+            return False
+        wallet_ids = WalletAccessService.accessible_wallet_ids(self.request.user)
+        if params.get("wallet"):
+            wallet_ids = [int(params["wallet"])] if int(params["wallet"]) in wallet_ids else []
+        return TransactionArchiveService.reaches_archive(wallet_ids, since)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.reads_archive():
+            ordering = filters.OrderingFilter().get_ordering(request, queryset, self)
+            queryset = TransactionArchiveService.combine(
+                queryset,
+                self.get_archived_queryset(),
+                ordering or Transaction._meta.ordering,
+            )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         wallet = serializer.validated_data["wallet"]
-        category = serializer.validated_data["category"]
-        self._check_wallet_permission(wallet.owner_id)
+        category = serializer.validated_data.get("category")
+        WalletAccessService.check_write_access(request.user, wallet.id)
 
-        if category.wallet_id != wallet.id:
+        if category is not None and category.wallet_id != wallet.id:
             raise ValidationError({"category": "Category không thuộc ví đã chọn."})
 
         extra_data = {}
@@ -68,41 +155,154 @@ class TransactionViewSet(viewsets.ModelViewSet):
             if key in serializer.validated_data:
                 extra_data[key] = serializer.validated_data[key]
 
-        transaction = TransactionService.create_transaction(
-            wallet,
-            category,
-            transaction_type=serializer.validated_data.get("transaction_type"),
-            amount=serializer.validated_data["amount"],
-            **extra_data,
-        )
+        try:
+            transaction = TransactionService.create_transaction(
+                wallet,
+                category,
+                transaction_type=serializer.validated_data.get("transaction_type"),
+                amount=serializer.validated_data["amount"],
+                validate=False,
+                **extra_data,
+            )
+        except DjangoValidationError as exc:
+            raise ValidationError(exc.message_dict)
         output_serializer = self.get_serializer(transaction)
         headers = self.get_success_headers(output_serializer.data)
         return Response(
             output_serializer.data, status=status.HTTP_201_CREATED, headers=headers
         )
 
+    @idempotent
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
     def perform_update(self, serializer):
         transaction_obj = serializer.instance
-        self._check_wallet_permission(transaction_obj.wallet.owner_id)
+        WalletAccessService.check_write_access(self.request.user, transaction_obj.wallet_id)
 
         update_kwargs = {}
         for field in ("transaction_type", "amount", "note", "occurred_at", "metadata"):
             if field in serializer.validated_data:
                 update_kwargs[field] = serializer.validated_data[field]
 
-        updated = TransactionService.update_transaction(
-            transaction_obj,
-            **update_kwargs,
-        )
+        try:
+            updated = TransactionService.update_transaction(
+                transaction_obj,
+                validate=False,
+                **update_kwargs,
+            )
+        except DjangoValidationError as exc:
+            raise ValidationError(exc.message_dict)
         serializer.instance = updated
 
+    @idempotent
     def destroy(self, request, *args, **kwargs):
         transaction_obj = self.get_object()
-        self._check_wallet_permission(transaction_obj.wallet.owner_id)
+        WalletAccessService.check_write_access(request.user, transaction_obj.wallet_id)
         TransactionService.delete_transaction(transaction_obj)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
-    def _check_wallet_permission(self, owner_id: int):
-        if owner_id != self.request.user.id:
-            raise PermissionDenied("Bạn không có quyền truy cập ví này.")
+    @extend_schema(
+        tags=["Finance - Transactions"],
+        summary="Giao dịch đã xoá (thùng rác), khôi phục được tới khi bị dọn",
+    )
+    @action(detail=False, methods=["get"], url_path="trash")
+    def trash(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        return Response(self.get_serializer(queryset, many=True).data)
 
+    @extend_schema(
+        tags=["Finance - Transactions"],
+        summary="Khôi phục giao dịch đã xoá và cộng lại vào số dư ví",
+        request=None,
+        responses=TransactionSerializer,
+    )
+    @action(detail=True, methods=["post"])
+    @idempotent
+    def restore(self, request, pk=None):
+        transaction_obj = self.get_object()
+        WalletAccessService.check_write_access(request.user, transaction_obj.wallet_id)
+        try:
+            restored = TransactionService.restore_transaction(transaction_obj)
+        except ValueError as exc:
+            raise ValidationError({"detail": str(exc)})
+        return Response(TransactionSerializer(restored).data)
+
+    @extend_schema(
+        tags=["Finance - Transactions"],
+        summary="Áp dụng nhiều thao tác tạo/cập nhật/xoá giao dịch",
+    )
+    @action(detail=False, methods=["post"], url_path="batch")
+    @idempotent
+    def batch(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            results = TransactionService.apply_batch(
+                request.user, serializer.validated_data["operations"]
+            )
+        except DjangoValidationError as exc:
+            raise ValidationError({"operations": exc.message_dict})
+
+        return Response(
+            {
+                "results": [
+                    {
+                        "op": result["op"],
+                        "id": result["id"],
+                        "transaction": (
+                            TransactionSerializer(result["transaction"]).data
+                            if result["transaction"] is not None
+                            else None
+                        ),
+                    }
+                    for result in results
+                ]
+            }
+        )
+
+    @extend_schema(
+        tags=["Finance - Transactions"],
+        summary="Import sao kê, bỏ qua hoặc đánh dấu giao dịch trùng",
+    )
+    @action(detail=False, methods=["post"], url_path="import")
+    @idempotent
+    def import_transactions(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        wallet = serializer.validated_data["wallet"]
+        if len(serializer.validated_data["rows"]) > settings.FINANCE_IMPORT_SYNC_MAX_ROWS:
+            WalletAccessService.check_write_access(request.user, wallet.id)
+            job = JobService.enqueue(
+                JobKind.IMPORT_TRANSACTIONS, request.user, wallet, request.data
+            )
+            return job_accepted(job, request)
+
+        try:
+            result = TransactionImportService.import_rows(
+                request.user,
+                serializer.validated_data["wallet"],
+                serializer.validated_data["rows"],
+                serializer.validated_data["on_duplicate"],
+            )
+        except DjangoValidationError as exc:
+            raise ValidationError({"rows": exc.message_dict})
+
+        return Response(
+            {
+                "created": [
+                    {
+                        "row": item["row"],
+                        "transaction": TransactionSerializer(item["transaction"]).data,
+                    }
+                    for item in result["created"]
+                ],
+                "duplicates": result["duplicates"],
+            }
+        )
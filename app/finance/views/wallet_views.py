@@ -1,12 +1,34 @@
 from django.db import models as django_models
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from django.utils.dateparse import parse_date
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from app.finance.models import Wallet
-from app.finance.serializers import WalletSerializer
-from app.finance.services import WalletService
+from app.finance.models import JobKind, Wallet
+from app.finance.serializers import (
+    JobSerializer,
+    RecurringPatternSerializer,
+    TransactionExportSerializer,
+    WalletMemberSerializer,
+    WalletReconcileSerializer,
+    WalletSerializer,
+)
+from app.finance.services import (
+    CashFlowForecastService,
+    JobService,
+    RecurringPatternService,
+    TransactionStatisticsService,
+    WalletAccessService,
+    WalletService,
+)
+from app.finance.throttles import TokenBucketThrottle
+from app.finance.views.decorators import idempotent
+from app.finance.views.job_views import job_accepted
+from app.finance.views.mixins import ReplicaReadMixin
 
 
 WALLET_SEARCH_FIELDS = [
@@ -29,16 +51,37 @@ WALLET_SEARCH_FIELDS += ["owner__username", "owner__email"]
     ),
     destroy=extend_schema(tags=["Finance - Wallets"], summary="Xoá ví"),
 )
-class WalletViewSet(viewsets.ModelViewSet):
+class WalletViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
+    throttle_classes = [TokenBucketThrottle]
     serializer_class = WalletSerializer
     filterset_fields = "__all__"
     ordering_fields = "__all__"
     search_fields = WALLET_SEARCH_FIELDS
+    # Thống kê chỉ đọc (kết quả cache theo `write_version`) nên cũng đọc từ replica.
+    replica_actions = frozenset({"list", "retrieve", "statistics"})
 
     def get_queryset(self):
         return WalletService.list_wallets(self.request.user)
 
+    def get_serializer_class(self):
+        if self.action in {"members", "add_member", "remove_member"}:
+            return WalletMemberSerializer
+        if self.action == "recurring_patterns":
+            return RecurringPatternSerializer
+        if self.action == "export":
+            return TransactionExportSerializer
+        if self.action == "reconcile":
+            return WalletReconcileSerializer
+        return super().get_serializer_class()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.user.is_authenticated:
+            context["wallet_roles"] = WalletAccessService.wallet_roles(self.request.user)
+        return context
+
+    @idempotent
     def create(self, request, *args, **kwargs):
         data = request.data.copy()
         copy_master_raw = data.pop("copy_master", ["true"])
@@ -53,14 +96,186 @@ class WalletViewSet(viewsets.ModelViewSet):
             **serializer.validated_data,
         )
         output_serializer = self.get_serializer(wallet)
-        headers = self.get_success_headers(output_serializer.data)
-        return Response(
-            output_serializer.data, status=status.HTTP_201_CREATED, headers=headers
-        )
+        data = output_serializer.data
+        if wallet.bootstrap_job is not None:
+            data["bootstrap_job"] = JobSerializer(
+                wallet.bootstrap_job, context={"request": request}
+            ).data
+        headers = self.get_success_headers(data)
+        return Response(data, status=status.HTTP_201_CREATED, headers=headers)
+
+    @idempotent
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
 
     def perform_update(self, serializer):
+        WalletAccessService.check_owner_access(self.request.user, serializer.instance.id)
         WalletService.update_wallet(serializer.instance, **serializer.validated_data)
 
+    @idempotent
+    def destroy(self, request, *args, **kwargs):
+        wallet = self.get_object()
+        WalletAccessService.check_owner_access(request.user, wallet.id)
+        job = WalletService.delete_wallet(wallet, request.user)
+        if job is not None:
+            return job_accepted(job, request)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @extend_schema(tags=["Finance - Wallets"], summary="Danh sách thành viên của ví")
+    @action(detail=True, methods=["get"])
+    def members(self, request, pk=None):
+        wallet = self.get_object()
+        serializer = self.get_serializer(WalletService.list_members(wallet), many=True)
+        return Response(serializer.data)
+
+    @extend_schema(tags=["Finance - Wallets"], summary="Thêm/cập nhật thành viên của ví")
+    @members.mapping.post
+    @idempotent
+    def add_member(self, request, pk=None):
+        wallet = self.get_object()
+        WalletAccessService.check_owner_access(request.user, wallet.id)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            member = WalletService.add_member(
+                wallet,
+                serializer.validated_data["user"].id,
+                serializer.validated_data["role"],
+            )
+        except ValueError as exc:
+            raise ValidationError({"user": str(exc)})
+        return Response(self.get_serializer(member).data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(tags=["Finance - Wallets"], summary="Xoá thành viên khỏi ví")
+    @action(detail=True, methods=["delete"], url_path=r"members/(?P<user_id>\d+)")
+    @idempotent
+    def remove_member(self, request, pk=None, user_id=None):
+        wallet = self.get_object()
+        WalletAccessService.check_owner_access(request.user, wallet.id)
+        try:
+            WalletService.remove_member(wallet, int(user_id))
+        except ValueError as exc:
+            raise ValidationError({"user": str(exc)})
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @extend_schema(
+        tags=["Finance - Wallets"],
+        summary="Thống kê giao dịch của ví",
+        parameters=[
+            OpenApiParameter(
+                "start", OpenApiTypes.DATE, description="Ngày bắt đầu (mặc định 365 ngày trước `end`)"
+            ),
+            OpenApiParameter(
+                "end", OpenApiTypes.DATE, description="Ngày kết thúc (mặc định hôm nay)"
+            ),
+        ],
+        responses=OpenApiTypes.OBJECT,
+    )
+    @action(detail=True, methods=["get"])
+    def statistics(self, request, pk=None):
+        wallet = self.get_object()
+        bounds = {}
+        for name in ("start", "end"):
+            raw = request.query_params.get(name)
+            if not raw:
+                continue
+            try:
+                bounds[name] = parse_date(raw)
+            except ValueError:
+                bounds[name] = None
+            if bounds[name] is None:
+                raise ValidationError({name: "Ngày không hợp lệ (định dạng YYYY-MM-DD)."})
+        try:
+            result = TransactionStatisticsService.compute(wallet, **bounds)
+        except ValueError as exc:
+            raise ValidationError({"detail": str(exc)})
+        return Response(result)
+
+    @extend_schema(tags=["Finance - Wallets"], summary="Giao dịch định kỳ đã phát hiện của ví")
+    @action(detail=True, methods=["get"], url_path="recurring-patterns")
+    def recurring_patterns(self, request, pk=None):
+        wallet = self.get_object()
+        RecurringPatternService.schedule_detect(wallet)
+        serializer = self.get_serializer(
+            RecurringPatternService.patterns_for(wallet), many=True
+        )
+        return Response(serializer.data)
+
+    @extend_schema(
+        tags=["Finance - Wallets"],
+        summary="Dự báo số dư của ví",
+        parameters=[
+            OpenApiParameter(
+                "days", OpenApiTypes.INT, description="Số ngày dự báo (mặc định 30)"
+            ),
+        ],
+        responses=OpenApiTypes.OBJECT,
+    )
+    @action(detail=True, methods=["get"])
+    def forecast(self, request, pk=None):
+        wallet = self.get_object()
+        raw_days = request.query_params.get("days")
+        try:
+            days = int(raw_days) if raw_days else None
+        except ValueError:
+            raise ValidationError({"days": "Số ngày phải là số nguyên."})
+        try:
+            result = CashFlowForecastService.forecast(wallet, days)
+        except ValueError as exc:
+            raise ValidationError({"days": str(exc)})
+        return Response(result)
+
+    @extend_schema(
+        tags=["Finance - Wallets"],
+        summary="Xuất giao dịch của ví ra CSV (job nền)",
+        responses={202: JobSerializer},
+    )
+    @action(detail=True, methods=["post"])
+    @idempotent
+    def export(self, request, pk=None):
+        wallet = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        payload = {
+            name: value.isoformat() if value else None
+            for name, value in serializer.validated_data.items()
+        }
+        job = JobService.enqueue(JobKind.EXPORT_TRANSACTIONS, request.user, wallet, payload)
+        return job_accepted(job, request)
+
+    @extend_schema(
+        tags=["Finance - Wallets"],
+        summary="Đối soát số dư ví với giao dịch (job nền)",
+        responses={202: JobSerializer},
+    )
+    @action(detail=True, methods=["post"])
+    @idempotent
+    def reconcile(self, request, pk=None):
+        wallet = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if serializer.validated_data["fix"]:
+            WalletAccessService.check_owner_access(request.user, wallet.id)
+        job = JobService.enqueue(
+            JobKind.RECONCILE_WALLET, request.user, wallet, serializer.validated_data
+        )
+        return job_accepted(job, request)
+
+    @extend_schema(
+        tags=["Finance - Wallets"],
+        summary="Dựng lại bản chụp category và mẫu định kỳ của ví (job nền)",
+        request=None,
+        responses={202: JobSerializer},
+    )
+    @action(detail=True, methods=["post"], url_path="rebuild-rollups")
+    @idempotent
+    def rebuild_rollups(self, request, pk=None):
+        wallet = self.get_object()
+        WalletAccessService.check_write_access(request.user, wallet.id)
+        job = JobService.enqueue(JobKind.REBUILD_ROLLUPS, request.user, wallet)
+        return job_accepted(job, request)
+
     @staticmethod
     def _parse_bool(value):
         if isinstance(value, (list, tuple)):
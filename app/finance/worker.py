@@ -0,0 +1,16 @@
+"""
+Điểm vào của tiến trình worker con do `run_finance_worker` tạo (multiprocessing
+spawn): module không import model ở mức module để có thể gọi `django.setup()`
+trước.
+"""
+
+
+def run(worker_id: str, poll_interval: float, max_jobs: int | None, burst: bool) -> int:
+    import django
+
+    django.setup()
+    from app.finance.services import JobWorker
+
+    return JobWorker.work(
+        worker_id, poll_interval=poll_interval, max_jobs=max_jobs, burst=burst
+    )